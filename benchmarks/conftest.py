@@ -0,0 +1,33 @@
+import sys
+from typing import Callable, Iterator
+
+import pytest
+
+from scopt.instances.aws import AwsInstanceMap
+
+
+@pytest.fixture
+def catalog() -> AwsInstanceMap:
+    return AwsInstanceMap()
+
+
+@pytest.fixture
+def purge_scopt() -> Iterator[Callable[[], None]]:
+    """Return a function removing scopt modules to measure cold import
+
+    Removed modules are restored after a benchmark.
+    """
+
+    saved = {k: v for k, v in sys.modules.items() if _is_scopt(k)}
+
+    def purge() -> None:
+        for name in [k for k in sys.modules if _is_scopt(k)]:
+            del sys.modules[name]
+
+    yield purge
+    purge()
+    sys.modules.update(saved)
+
+
+def _is_scopt(name: str) -> bool:
+    return name == 'scopt' or name.startswith('scopt.')
@@ -0,0 +1,9 @@
+from typing import Dict, Tuple
+
+from scopt.instances import Instance
+
+# typical shapes of executor nodes in each deploy mode
+SHAPES: Dict[str, Tuple[Instance, int, str]] = {
+    'client': (Instance(32, 248), 10, 'client'),
+    'cluster': (Instance(16, 120), 50, 'cluster'),
+}
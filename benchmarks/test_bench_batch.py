@@ -0,0 +1,26 @@
+from typing import Any
+
+import pytest
+
+from scopt.instances.aws import AwsInstanceMap
+
+np = pytest.importorskip('numpy')
+batch = pytest.importorskip('scopt.batch')
+
+
+def test_sweep(benchmark: Any, catalog: AwsInstanceMap) -> None:
+    """Same sweep as test_bench_catalog.test_sweep in one call"""
+
+    instances = list(catalog.values())
+    cores = [i.num_cores for i in instances]
+    memory = [i.memory_size for i in instances]
+    num_nodes = np.arange(2, 52)[:, np.newaxis, np.newaxis]
+    deploy_mode = np.array(['client', 'cluster'])[:, np.newaxis]
+    benchmark(
+        batch.optimize,
+        cores,
+        memory,
+        num_nodes,
+        deploy_mode,
+        errors='mask',
+    )
@@ -0,0 +1,59 @@
+from pathlib import Path
+from typing import Any, Callable, Dict, Union
+
+from scopt import SparkConfOptimizer
+from scopt.instances.aws import AwsInstanceMap
+from scopt.table import RecommendationTable, build_table
+
+NUM_NODES = range(2, 52)
+
+
+def test_getitem(benchmark: Any, catalog: AwsInstanceMap) -> None:
+    benchmark(catalog.__getitem__, 'r5.4xlarge')
+
+
+def test_getitem_all(benchmark: Any, catalog: AwsInstanceMap) -> None:
+    names = list(catalog)
+    benchmark(lambda: [catalog[name] for name in names])
+
+
+def test_sweep(benchmark: Any, catalog: AwsInstanceMap) -> None:
+    """Every catalog instance, 2 to 51 nodes and both deploy modes"""
+
+    def sweep() -> int:
+        count = 0
+        for instance in catalog.values():
+            for num_nodes in NUM_NODES:
+                for deploy_mode in ('client', 'cluster'):
+                    conf: Dict[str, Union[int, str]]
+                    conf = SparkConfOptimizer(
+                        instance, num_nodes, deploy_mode
+                    ).as_dict()
+                    count += len(conf)
+        return count
+
+    benchmark.pedantic(sweep, rounds=5)
+
+
+def test_cold_import(benchmark: Any, purge_scopt: Callable[[], None]) -> None:
+    benchmark.pedantic(
+        __import__, args=('scopt',), setup=purge_scopt, rounds=50
+    )
+
+
+def test_cold_import_aws(
+    benchmark: Any, purge_scopt: Callable[[], None]
+) -> None:
+    benchmark.pedantic(
+        __import__,
+        args=('scopt.instances.aws',),
+        setup=purge_scopt,
+        rounds=50,
+    )
+
+
+def test_table_get(benchmark: Any, tmp_path: Path) -> None:
+    path = tmp_path / 'recommendations.bin'
+    build_table(path, max_nodes=60)
+    with RecommendationTable(path) as table:
+        benchmark(table.get, 'r5.4xlarge', 50, 'cluster')
@@ -0,0 +1,36 @@
+from typing import Any
+
+import pytest
+
+from benchmarks.shapes import SHAPES
+from scopt import SparkConfOptimizer
+
+
+@pytest.mark.parametrize('deploy_mode', SHAPES)
+def test_init(benchmark: Any, deploy_mode: str) -> None:
+    benchmark(SparkConfOptimizer, *SHAPES[deploy_mode])
+
+
+@pytest.mark.parametrize('deploy_mode', SHAPES)
+def test_as_dict(benchmark: Any, deploy_mode: str) -> None:
+    sco = SparkConfOptimizer(*SHAPES[deploy_mode])
+    benchmark(sco.as_dict)
+
+
+def test_as_list(benchmark: Any) -> None:
+    sco = SparkConfOptimizer(*SHAPES['client'])
+    benchmark(sco.as_list)
+
+
+def test_str(benchmark: Any) -> None:
+    sco = SparkConfOptimizer(*SHAPES['client'])
+    benchmark(str, sco)
+
+
+def test_repr_html(benchmark: Any) -> None:
+    sco = SparkConfOptimizer(*SHAPES['client'])
+    benchmark(sco._repr_html_)
+
+
+def test_init_and_as_dict(benchmark: Any) -> None:
+    benchmark(lambda: SparkConfOptimizer(*SHAPES['client']).as_dict())
@@ -1,4 +1,17 @@
+from typing import TYPE_CHECKING
+
 from scopt.__version__ import __version__
-from scopt.optimizer import SparkConfOptimizer
+
+if TYPE_CHECKING:
+    from scopt.optimizer import SparkConfOptimizer
 
 __all__ = ['SparkConfOptimizer', '__version__']
+
+
+def __getattr__(name: str) -> object:
+    # import optimizer on first access to keep `import scopt` fast
+    if name == 'SparkConfOptimizer':
+        from scopt.optimizer import SparkConfOptimizer
+
+        return SparkConfOptimizer
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,5 @@
+import sys
+
+from scopt.cli import main
+
+sys.exit(main())
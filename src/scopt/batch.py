@@ -0,0 +1,248 @@
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from scopt.optimizer import DeployMode
+
+IntArray = npt.NDArray[np.int64]
+BoolArray = npt.NDArray[np.bool_]
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """Columnar result of `optimize`
+
+    Every field is a one dimensional array with one element per evaluated
+    cluster shape. Memory values are GB integers, that is the same numbers
+    `SparkConfOptimizer` formats with a `g` suffix.
+    Rows which can not reserve cpu cores for executors have `valid` False.
+    """
+
+    executor_cores: IntArray
+    executor_per_node: IntArray
+    total_executor_memory: IntArray
+    executor_memory: IntArray
+    executor_memory_overhead: IntArray
+    driver_cores: IntArray
+    driver_memory: IntArray
+    driver_memory_overhead: IntArray
+    executor_instances: IntArray
+    default_parallelism: IntArray
+    sql_shuffle_partitions: IntArray
+    valid: BoolArray
+    dynamic_allocation: bool = False
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    def as_dict(self) -> Dict[str, IntArray]:
+        """Return columns keyed by the same Spark properties as
+        `SparkConfOptimizer.as_dict`
+
+        Returns:
+            Dict[str, IntArray]: Spark property name to column
+        """
+
+        conf = {
+            'spark.driver.cores': self.driver_cores,
+            'spark.driver.memory': self.driver_memory,
+            'spark.driver.memoryOverhead': self.driver_memory_overhead,
+            'spark.executor.cores': self.executor_cores,
+            'spark.executor.memory': self.executor_memory,
+            'spark.executor.memoryOverhead': self.executor_memory_overhead,
+        }
+        if not self.dynamic_allocation:
+            conf['spark.executor.instances'] = self.executor_instances
+        conf['spark.default.parallelism'] = self.default_parallelism
+        conf['spark.sql.shuffle.partitions'] = self.sql_shuffle_partitions
+        return conf
+
+
+def optimize(
+    cores: npt.ArrayLike,
+    memory: npt.ArrayLike,
+    num_nodes: npt.ArrayLike,
+    deploy_mode: npt.ArrayLike = 'client',
+    driver_cores: Optional[npt.ArrayLike] = None,
+    driver_memory: Optional[npt.ArrayLike] = None,
+    dynamic_allocation: bool = False,
+    errors: str = 'raise',
+) -> BatchResult:
+    """Evaluate SparkConfOptimizer for many cluster shapes at once
+
+    All array arguments are broadcast against each other, so scalars can be
+    mixed with arrays. Each row gives exactly the same values as
+    `SparkConfOptimizer(Instance(cores, memory), num_nodes, deploy_mode,
+    Instance(driver_cores, driver_memory))`.
+
+    Args:
+        cores (ArrayLike): Number of CPU cores of executor instances.
+        memory (ArrayLike): Memory size GB of executor instances.
+        num_nodes (ArrayLike): Number of Spark cluster nodes.
+        deploy_mode (ArrayLike, optional): 'client' or 'cluster' for each
+            row. Defaults to 'client'.
+        driver_cores (Optional[ArrayLike], optional): Number of CPU cores of
+            driver instances. This can be enabled only 'client' mode.
+            If not be specified, cores is used. Defaults to None.
+        driver_memory (Optional[ArrayLike], optional): Memory size GB of
+            driver instances. This can be enabled only 'client' mode.
+            If not be specified, memory is used. Defaults to None.
+        dynamic_allocation (bool, optional): Dynamic allocation is enabled
+            or not. Only affects keys of `BatchResult.as_dict`.
+            Defaults to False.
+        errors (str, optional): 'raise' raises ValueError when any row can
+            not reserve cpu cores for executor. 'mask' marks such rows
+            invalid and sets their executor_instances and parallelism to 0.
+            Defaults to 'raise'.
+
+    Returns:
+        BatchResult: Columnar Spark properties
+
+    ```python
+    import numpy as np
+    from scopt import batch
+    from scopt.instances.aws import AwsInstanceMap
+
+
+    >>> mapping = AwsInstanceMap()
+    >>> instances = [mapping[name] for name in ('r5.4xlarge', 'c5.9xlarge')]
+    >>> nodes = np.arange(1, 501)
+    >>> result = batch.optimize(
+            cores=[i.num_cores for i in instances],
+            memory=[i.memory_size for i in instances],
+            num_nodes=nodes[:, np.newaxis],
+            deploy_mode='cluster',
+            errors='mask',
+        )
+    >>> result.executor_instances[:6]
+    array([ 2,  6,  5, 13,  8, 20])
+    ```
+    """
+
+    if errors not in ('raise', 'mask'):
+        raise ValueError(f'errors must be \'raise\' or \'mask\', not {errors}')
+
+    is_cluster = _cluster_mask(deploy_mode)
+    specified_driver = driver_cores is not None or driver_memory is not None
+    if specified_driver and is_cluster.any():
+        raise ValueError('driver_instance can be specified only client_mode')
+
+    (
+        core_per_node,
+        memory_per_node,
+        driver_core_per_node,
+        driver_memory_per_node,
+        nodes,
+        is_cluster,
+    ) = (
+        np.ravel(a)
+        for a in np.broadcast_arrays(
+            np.asarray(cores, dtype=np.int64),
+            np.asarray(memory, dtype=np.float64),
+            np.asarray(
+                cores if driver_cores is None else driver_cores,
+                dtype=np.int64,
+            ),
+            np.asarray(
+                memory if driver_memory is None else driver_memory,
+                dtype=np.float64,
+            ),
+            np.asarray(num_nodes, dtype=np.int64),
+            is_cluster,
+        )
+    )
+    _validate_instance(core_per_node, memory_per_node)
+    _validate_instance(driver_core_per_node, driver_memory_per_node)
+
+    # keep one core for hadoop daemon when core of instance less than 5
+    executor_cores = np.where(
+        core_per_node > 5, 5, np.maximum(core_per_node - 1, 1)
+    )
+    # one core for hadoop daemon
+    executor_per_node = (core_per_node - 1) // executor_cores
+    executor_per_node = np.where(executor_per_node > 0, executor_per_node, 1)
+    # 1GB for hadoop daemon
+    total_executor_memory = _floor((memory_per_node - 1) / executor_per_node)
+    executor_memory = _floor(total_executor_memory * 0.9)
+    executor_memory_overhead = _ceil(total_executor_memory * 0.1)
+
+    # one core and 1GB for system resource
+    total_driver_memory = _floor(driver_memory_per_node - 1)
+    client_driver_cores = np.minimum(
+        np.maximum(driver_core_per_node - 1, 1), executor_cores
+    )
+    client_driver_memory = np.minimum(
+        _floor(total_driver_memory * 0.9), executor_memory
+    )
+    client_driver_memory_overhead = np.minimum(
+        _ceil(total_driver_memory * 0.1), executor_memory_overhead
+    )
+
+    # one instance for driver in cluster mode
+    executor_instances = executor_per_node * nodes - is_cluster
+    valid = ~is_cluster | (executor_instances >= 1)
+    if not valid.all():
+        if errors == 'raise':
+            row = int(np.flatnonzero(~valid)[0])
+            raise ValueError(
+                f'Can not reserve cpu cores for executor at row {row}. '
+                'You shuld scale up instance size or increase number of nodes.'
+            )
+        executor_instances = np.where(valid, executor_instances, 0)
+    default_parallelism = executor_instances * executor_cores * 2
+
+    return BatchResult(
+        executor_cores=executor_cores,
+        executor_per_node=executor_per_node,
+        total_executor_memory=total_executor_memory,
+        executor_memory=executor_memory,
+        executor_memory_overhead=executor_memory_overhead,
+        driver_cores=np.where(is_cluster, executor_cores, client_driver_cores),
+        driver_memory=np.where(
+            is_cluster, executor_memory, client_driver_memory
+        ),
+        driver_memory_overhead=np.where(
+            is_cluster,
+            executor_memory_overhead,
+            client_driver_memory_overhead,
+        ),
+        executor_instances=executor_instances,
+        default_parallelism=default_parallelism,
+        sql_shuffle_partitions=default_parallelism,
+        valid=valid,
+        dynamic_allocation=dynamic_allocation,
+    )
+
+
+def _cluster_mask(deploy_mode: npt.ArrayLike) -> BoolArray:
+    modes = np.char.lower(np.asarray(deploy_mode, dtype=np.str_))
+    supported = [DeployMode.CLIENT.value, DeployMode.CLUSTER.value]
+    unknown = ~np.isin(modes, supported)
+    if unknown.any():
+        raise ValueError(
+            f'\'{modes[unknown].flat[0]}\' is not a valid DeployMode'
+        )
+    return np.asarray(modes == DeployMode.CLUSTER.value)
+
+
+def _validate_instance(
+    cores: IntArray, memory: npt.NDArray[np.float64]
+) -> None:
+    if (cores < 1).any():
+        raise ValueError(
+            f'num_cores must be more than 1, but actually {cores.min()}'
+        )
+    if not (memory > 0.0).all():
+        raise ValueError(
+            f'memory_size must be more than 0, but actually {memory.min()}'
+        )
+
+
+def _floor(values: npt.ArrayLike) -> IntArray:
+    return np.floor(values).astype(np.int64)
+
+
+def _ceil(values: npt.ArrayLike) -> IntArray:
+    return np.ceil(values).astype(np.int64)
@@ -0,0 +1,149 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, NamedTuple, Optional, Tuple, Type, Union
+
+from scopt.instances import Instance
+from scopt.optimizer import Fleet, SparkConfOptimizer
+
+_Key = Tuple[
+    Union[Instance, Tuple[Tuple[Instance, int], ...]],
+    Optional[int],
+    str,
+    Optional[Instance],
+    bool,
+    Tuple[Tuple[str, Hashable], ...],
+]
+_Error = Tuple[Type[Exception], Tuple[object, ...]]
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class OptimizerCache:
+    """Thread-safe bounded LRU cache of SparkConfOptimizer
+
+    Calling the cache takes the same arguments as SparkConfOptimizer and
+    returns a frozen SparkConfOptimizer shared by all callers with the same
+    arguments, so setting its attributes or the attributes of its
+    `optimizer` raises AttributeError.
+    Keyword arguments after dynamic_allocation like shuffle_size are passed
+    through and must be hashable.
+    Arguments which are rejected with ValueError are cached too, and
+    ValueError is raised again without recomputing.
+
+    Args:
+        maxsize (int, optional): Maximum number of cached arguments.
+            Least recently used one is evicted when exceeded.
+            Defaults to 128.
+
+    ```python
+    from scopt.cache import OptimizerCache
+    from scopt.instances import Instance
+
+
+    >>> cache = OptimizerCache(maxsize=64)
+    >>> sco = cache(Instance(32, 250), 10, 'client')
+    >>> sco is cache(Instance(32, 250), 10, 'client')
+    True
+    >>> cache.cache_info()
+    CacheInfo(hits=1, misses=1, evictions=0, maxsize=64, currsize=1)
+    ```
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        if maxsize < 1:
+            raise ValueError(
+                f'maxsize must be more than 1, but actually {maxsize}'
+            )
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[_Key, Union[SparkConfOptimizer, _Error]]'
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __call__(
+        self,
+        executor_instance: Union[Instance, Fleet],
+        num_nodes: Optional[int] = None,
+        deploy_mode: str = 'client',
+        driver_instance: Optional[Instance] = None,
+        dynamic_allocation: bool = False,
+        **options: Any,
+    ) -> SparkConfOptimizer:
+        key: _Key = (
+            (
+                executor_instance
+                if isinstance(executor_instance, Instance)
+                # fleet may be given as list
+                else tuple((i, c) for i, c in executor_instance)
+            ),
+            num_nodes,
+            deploy_mode.lower(),
+            driver_instance,
+            dynamic_allocation,
+            tuple(sorted(options.items())),
+        )
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+            else:
+                self._misses += 1
+
+        if entry is None:
+            # compute without lock not to block other threads
+            try:
+                entry = SparkConfOptimizer(
+                    executor_instance,
+                    num_nodes,
+                    deploy_mode,
+                    driver_instance,
+                    dynamic_allocation,
+                    **options,
+                ).freeze()
+            except ValueError as e:
+                entry = (type(e), e.args)
+            entry = self._store(key, entry)
+
+        if isinstance(entry, SparkConfOptimizer):
+            return entry
+        # raise new exception object not to share traceback between threads
+        error_type, args = entry
+        raise error_type(*args)
+
+    def _store(
+        self, key: _Key, entry: Union[SparkConfOptimizer, _Error]
+    ) -> Union[SparkConfOptimizer, _Error]:
+        with self._lock:
+            # another thread may have stored same key while computing
+            stored = self._entries.setdefault(key, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+            return stored
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self.maxsize,
+                len(self._entries),
+            )
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
@@ -0,0 +1,267 @@
+import argparse
+import csv
+import json
+import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import partial
+from itertools import islice
+from typing import (
+    IO,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from scopt.cache import OptimizerCache
+from scopt.spec import optimizer_arguments, optimizer_from_spec
+
+INPUT_FORMATS = ('jsonl', 'csv')
+OUTPUT_FORMATS = ('jsonl', 'spark-submit', 'spark-defaults')
+
+# raw JSON line or parsed CSV row
+_Item = Union[str, Dict[str, str]]
+# rendered text and error message
+_Rendered = Tuple[str, Optional[str]]
+
+# job catalogs often repeat same specification
+_cache = OptimizerCache(1024)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='scopt',
+        description='Calculate optimized properties of Spark configuration',
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser(
+        'serve', help='Serve Spark properties over HTTP as JSON'
+    )
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8080)
+    serve_parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=1024,
+        help='Maximum number of cached optimizers',
+    )
+
+    generate_parser = subparsers.add_parser(
+        'generate',
+        help='Generate Spark properties for job specifications',
+        description=(
+            'Read job specifications from JSONL or CSV and write Spark '
+            'properties of each one in input order.'
+        ),
+    )
+    generate_parser.add_argument(
+        'files',
+        nargs='*',
+        default=['-'],
+        help='Job specification files. Reads stdin when omitted or -',
+    )
+    generate_parser.add_argument(
+        '--input-format',
+        choices=INPUT_FORMATS,
+        help='Defaults to csv for *.csv files and jsonl for others',
+    )
+    generate_parser.add_argument(
+        '--output-format', choices=OUTPUT_FORMATS, default='jsonl'
+    )
+    generate_parser.add_argument(
+        '-o', '--output', help='Output file. Writes stdout when omitted'
+    )
+    generate_parser.add_argument(
+        '--processes',
+        type=int,
+        default=1,
+        help='Number of worker processes',
+    )
+    generate_parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=1000,
+        help='Number of specifications sent to a worker process at once',
+    )
+
+    analyze_parser = subparsers.add_parser(
+        'analyze',
+        help='Recommend Spark properties from an event log of a job',
+        description=(
+            'Read Spark event log of a previous run of the job, plain or '
+            'gzip compressed, and write Spark properties adjusted by '
+            'observed spill, GC time, skew and lost executors with '
+            'explanation of changes as JSON.'
+        ),
+    )
+    analyze_parser.add_argument('event_log', help='Spark event log file')
+    analyze_parser.add_argument(
+        'spec', help='Job specification of the run as JSON object'
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == 'analyze':
+        return analyze(args.event_log, args.spec, sys.stdout)
+    if args.command == 'serve':
+        from scopt.server import serve
+
+        try:
+            serve(args.host, args.port, args.cache_size)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    with ExitStack() as stack:
+        output = (
+            sys.stdout
+            if args.output is None
+            else stack.enter_context(open(args.output, 'w'))
+        )
+        return generate(
+            _read_items(args.files, args.input_format),
+            output,
+            args.output_format,
+            args.processes,
+            args.chunk_size,
+        )
+
+
+def generate(
+    items: Iterable[_Item],
+    output: IO[str],
+    output_format: str = 'jsonl',
+    processes: int = 1,
+    chunk_size: int = 1000,
+) -> int:
+    """Write Spark properties of job specifications in input order
+
+    Only a bounded number of chunks are read ahead, so memory usage does not
+    depend on number of specifications. Invalid specifications are reported
+    to stderr, and written as `{"error": message}` in jsonl output to keep
+    one output line per input.
+
+    Returns:
+        int: Exit status, 1 when any specification is invalid
+    """
+
+    status = 0
+    rendered = _render_all(items, output_format, processes, chunk_size)
+    for number, (text, error) in enumerate(rendered, 1):
+        if error is not None:
+            print(f'scopt: spec {number}: {error}', file=sys.stderr)
+            status = 1
+        if text:
+            output.write(text)
+    return status
+
+
+def analyze(event_log: str, spec: str, output: IO[str]) -> int:
+    """Write Spark properties recommended by an event log as JSON
+
+    Returns:
+        int: Exit status, 1 when event log or specification is invalid
+    """
+
+    from scopt.eventlog import analyze_event_log, recommend
+
+    try:
+        parsed = json.loads(spec)
+        if not isinstance(parsed, dict):
+            raise ValueError('Spec must be JSON object')
+        args, options = optimizer_arguments(parsed)
+        recommendation = recommend(
+            analyze_event_log(event_log), *args, **options
+        )
+    except (OSError, ValueError) as e:
+        print(f'scopt: {e}', file=sys.stderr)
+        return 1
+    result = {
+        'changes': recommendation.changes,
+        'conf': recommendation.optimizer.as_dict(),
+    }
+    output.write(f'{json.dumps(result)}\n')
+    return 0
+
+
+def _read_items(
+    paths: List[str], input_format: Optional[str]
+) -> Iterator[_Item]:
+    for path in paths:
+        fmt = input_format or ('csv' if path.endswith('.csv') else 'jsonl')
+        with ExitStack() as stack:
+            f = (
+                sys.stdin
+                if path == '-'
+                else stack.enter_context(open(path, newline=''))
+            )
+            if fmt == 'csv':
+                yield from csv.DictReader(f)
+            else:
+                yield from (line for line in f if line.strip())
+
+
+def _render_all(
+    items: Iterable[_Item],
+    output_format: str,
+    processes: int,
+    chunk_size: int,
+) -> Iterator[_Rendered]:
+    render = partial(_render_chunk, output_format)
+    chunks = _chunked(items, max(chunk_size, 1))
+    if processes <= 1:
+        for chunk in chunks:
+            yield from render(chunk)
+        return
+
+    with ProcessPoolExecutor(processes) as pool:
+        # bound read ahead, pool.map would consume whole input at once
+        pending: Deque['Future[List[_Rendered]]'] = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(render, chunk))
+            if len(pending) >= processes * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _chunked(items: Iterable[_Item], size: int) -> Iterator[List[_Item]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _render_chunk(output_format: str, chunk: List[_Item]) -> List[_Rendered]:
+    return [_render(output_format, item) for item in chunk]
+
+
+def _render(output_format: str, item: _Item) -> _Rendered:
+    try:
+        spec = json.loads(item) if isinstance(item, str) else item
+        if not isinstance(spec, dict):
+            raise ValueError('Spec must be JSON object')
+        conf = optimizer_from_spec(spec, _cache).as_dict()
+    except ValueError as e:
+        # a bad spec must not stop the rest of stream, nor worker pool
+        if output_format == 'jsonl':
+            return f'{json.dumps({"error": str(e)})}\n', str(e)
+        return '', str(e)
+
+    if output_format == 'spark-submit':
+        args = ' '.join(f'--conf {k}={v}' for k, v in conf.items())
+        return f'{args}\n', None
+    if output_format == 'spark-defaults':
+        name = spec.get('name')
+        lines = [] if not name else [f'# {name}']
+        lines.extend(f'{k} {v}' for k, v in conf.items())
+        return '\n'.join(lines) + '\n\n', None
+    return f'{json.dumps(conf)}\n', None
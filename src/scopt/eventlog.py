@@ -0,0 +1,426 @@
+import gzip
+import json
+import math
+import re
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Union
+
+from scopt.optimizer import (
+    ClientModeOptimizer,
+    ClusterModeOptimizer,
+    SparkConfOptimizer,
+)
+from scopt.profile import WorkloadProfile
+
+# share of task run time in GC which makes executors smaller
+GC_TIME_RATIO = 0.1
+# longest task over mean task duration of a skewed stage
+SKEW_RATIO = 4.0
+# stages with fewer tasks are not judged skewed
+MIN_SKEW_TASKS = 10
+# heap share moved to overhead when executors are lost
+HEAP_FRACTION_STEP = 0.1
+MIN_HEAP_FRACTION = 0.5
+
+# dynamic allocation removes idle executors with this reason
+_IDLE_REMOVED_REASON = 'killed by driver'
+_EVENTS = (
+    'SparkListenerTaskEnd',
+    'SparkListenerStageSubmitted',
+    'SparkListenerExecutorRemoved',
+    'SparkListenerEnvironmentUpdate',
+)
+# event name is the first field written by Spark, lines of other events
+# are skipped by it without decoding
+_EVENT = re.compile(r'"Event"\s*:\s*"(%s)"' % '|'.join(_EVENTS))
+_EVENT_BYTES = re.compile(_EVENT.pattern.encode())
+_GZIP_MAGIC = b'\x1f\x8b'
+
+
+@dataclass(frozen=True)
+class StageMetrics:
+    """Task metrics of a stage summed over its successful tasks
+
+    Times are milliseconds and sizes are bytes. All attempts of a stage are
+    merged. Peak execution memory is the largest one of a task.
+    """
+
+    stage_id: int
+    name: str = ''
+    num_tasks: int = 0
+    run_time: int = 0
+    gc_time: int = 0
+    memory_spilled: int = 0
+    disk_spilled: int = 0
+    peak_execution_memory: int = 0
+    input_bytes: int = 0
+    shuffle_read_bytes: int = 0
+    total_duration: int = 0
+    max_duration: int = 0
+
+    @property
+    def gc_ratio(self) -> float:
+        return self.gc_time / self.run_time if self.run_time else 0.0
+
+    @property
+    def skew(self) -> float:
+        """Longest task duration over mean task duration"""
+
+        if not self.total_duration:
+            return 1.0
+        return self.max_duration * self.num_tasks / self.total_duration
+
+
+@dataclass(frozen=True)
+class EventLogSummary:
+    """Metrics collected from a Spark event log by `analyze_event_log`
+
+    Args:
+        stages (List[StageMetrics]): Metrics of stages ordered by stage id.
+        lost_executors (Dict[str, str]): Executor id to reason of executors
+            lost by failures. Idle executors removed by dynamic allocation
+            are not included.
+        properties (Dict[str, str]): Spark properties the job ran with.
+    """
+
+    stages: List[StageMetrics] = field(default_factory=list)
+    lost_executors: Dict[str, str] = field(default_factory=dict)
+    properties: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def run_time(self) -> int:
+        return sum(s.run_time for s in self.stages)
+
+    @property
+    def gc_time(self) -> int:
+        return sum(s.gc_time for s in self.stages)
+
+    @property
+    def gc_ratio(self) -> float:
+        run_time = self.run_time
+        return self.gc_time / run_time if run_time else 0.0
+
+    @property
+    def disk_spilled(self) -> int:
+        return sum(s.disk_spilled for s in self.stages)
+
+
+@dataclass(frozen=True)
+class Recommendation:
+    """Optimizer adjusted by observed metrics
+
+    Args:
+        optimizer (SparkConfOptimizer): Adjusted optimizer.
+        baseline (SparkConfOptimizer): Optimizer of the given arguments.
+        changes (List[str]): What was changed and why. Empty when the
+            job ran without problems.
+    """
+
+    optimizer: SparkConfOptimizer
+    baseline: SparkConfOptimizer
+    changes: List[str]
+
+    def __str__(self) -> str:
+        lines = [f'# {c}' for c in self.changes] or ['# no change']
+        lines.extend(f'{k}: {v}' for k, v in self.optimizer.as_dict().items())
+        return '\n'.join(lines)
+
+
+# summed fields of StageMetrics
+_SUMMED = (
+    'num_tasks',
+    'run_time',
+    'gc_time',
+    'memory_spilled',
+    'disk_spilled',
+    'input_bytes',
+    'shuffle_read_bytes',
+    'total_duration',
+)
+
+
+class _Stage:
+    __slots__ = ('name', 'totals', 'max_duration', 'peak')
+
+    def __init__(self) -> None:
+        self.name = ''
+        self.totals = [0] * len(_SUMMED)
+        self.max_duration = 0
+        self.peak = 0
+
+    def metrics(self, stage_id: int) -> StageMetrics:
+        return StageMetrics(
+            stage_id,
+            self.name,
+            peak_execution_memory=self.peak,
+            max_duration=self.max_duration,
+            **dict(zip(_SUMMED, self.totals)),
+        )
+
+
+def analyze_event_log(
+    source: Union[str, Path, Iterable[Union[str, bytes]]],
+) -> EventLogSummary:
+    """Collect metrics of a Spark event log
+
+    Event log is read line by line, so memory usage does not depend on the
+    size of it. Gzip compressed file is detected by its content. Lines of
+    events which are not used are skipped without JSON parsing.
+
+    Args:
+        source (Union[str, Path, Iterable[Union[str, bytes]]]): Path of
+            event log file, or lines of it.
+
+    Raises:
+        ValueError: When a line is not valid JSON.
+
+    Returns:
+        EventLogSummary: Collected metrics
+    """
+
+    if isinstance(source, (str, Path)):
+        return _summarize(_read_lines(Path(source)))
+    return _summarize(source)
+
+
+def _read_lines(path: Path) -> Iterator[bytes]:
+    with path.open('rb') as f:
+        if f.read(2) != _GZIP_MAGIC:
+            f.seek(0)
+            yield from f
+            return
+    with gzip.open(path) as g:
+        yield from g
+
+
+def _summarize(lines: Iterable[Union[str, bytes]]) -> EventLogSummary:
+    stages: Dict[int, _Stage] = {}
+    lost: Dict[str, str] = {}
+    properties: Dict[str, str] = {}
+    for event in _events(lines):
+        name = event['Event']
+        if name == 'SparkListenerTaskEnd':
+            _add_task(stages, lost, event)
+        elif name == 'SparkListenerStageSubmitted':
+            info = event.get('Stage Info', {})
+            stage = stages.setdefault(info.get('Stage ID', -1), _Stage())
+            stage.name = info.get('Stage Name', '')
+        elif name == 'SparkListenerExecutorRemoved':
+            reason = str(event.get('Removed Reason', ''))
+            if _IDLE_REMOVED_REASON not in reason:
+                lost[str(event.get('Executor ID'))] = reason
+        else:
+            properties.update(event.get('Spark Properties') or {})
+    return EventLogSummary(
+        [
+            stage.metrics(stage_id)
+            for stage_id, stage in sorted(stages.items())
+        ],
+        lost,
+        properties,
+    )
+
+
+def _events(lines: Iterable[Union[str, bytes]]) -> Iterator[Dict[str, Any]]:
+    for number, line in enumerate(lines, 1):
+        used = (
+            _EVENT_BYTES.search(line, 0, 200)
+            if isinstance(line, bytes)
+            else _EVENT.search(line, 0, 200)
+        )
+        if used is None:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            raise ValueError(f'Invalid event log line {number}: {e}')
+
+
+def _add_task(
+    stages: Dict[int, _Stage], lost: Dict[str, str], event: Dict[str, Any]
+) -> None:
+    reason = event.get('Task End Reason', {})
+    if reason.get('Reason') == 'ExecutorLostFailure':
+        lost.setdefault(
+            str(reason.get('Executor ID')), str(reason.get('Loss Reason', ''))
+        )
+    info = event.get('Task Info', {})
+    metrics = event.get('Task Metrics')
+    if info.get('Failed') or info.get('Killed') or not metrics:
+        return
+    stage = stages.setdefault(event.get('Stage ID', -1), _Stage())
+    shuffle_read = metrics.get('Shuffle Read Metrics', {})
+    duration = info.get('Finish Time', 0) - info.get('Launch Time', 0)
+    values = (
+        1,
+        metrics.get('Executor Run Time', 0),
+        metrics.get('JVM GC Time', 0),
+        metrics.get('Memory Bytes Spilled', 0),
+        metrics.get('Disk Bytes Spilled', 0),
+        metrics.get('Input Metrics', {}).get('Bytes Read', 0),
+        shuffle_read.get('Remote Bytes Read', 0)
+        + shuffle_read.get('Local Bytes Read', 0),
+        duration,
+    )
+    totals = stage.totals
+    for i, value in enumerate(values):
+        totals[i] += value
+    stage.max_duration = max(stage.max_duration, duration)
+    stage.peak = max(stage.peak, metrics.get('Peak Execution Memory', 0))
+
+
+def recommend(
+    summary: EventLogSummary, *args: Any, **options: Any
+) -> Recommendation:
+    """Adjust optimizer by metrics of a previous run of the job
+
+    Arguments are the same as SparkConfOptimizer, and they are adjusted
+    by the rules below.
+
+    - Executors lost by failures, mostly killed for exceeding memory
+      limit: heap fraction of the workload profile is lowered by 0.1 and
+      memory overhead takes it.
+    - GC time over 10% of task run time: executor cores are searched
+      below the current ones, since smaller heaps have shorter GC pauses.
+      Only for an Instance in client or cluster mode.
+    - Spill to disk: parallelism is sized from the largest observed input
+      and shuffle read of a stage in half of partition_size.
+    - A stage of 10 tasks or more whose longest task takes over 4 times of
+      the mean: Adaptive Query Execution is enabled to split skewed
+      partitions.
+
+    ```python
+    >>> summary = analyze_event_log('eventlog.gz')
+    >>> recommendation = recommend(summary, Instance(32, 250), 10)
+    >>> recommendation.changes
+    ['executor 3 was lost (Container killed by YARN for exceeding memory
+    limits), heap fraction is lowered from 0.9 to 0.8 for overhead']
+    >>> recommendation.optimizer.as_dict()['spark.executor.memoryOverhead']
+    '9g'
+    ```
+
+    Args:
+        summary (EventLogSummary): Metrics of a previous run.
+
+    Raises:
+        ValueError: When arguments are invalid for SparkConfOptimizer.
+
+    Returns:
+        Recommendation: Adjusted optimizer and explanation of changes
+    """
+
+    baseline = SparkConfOptimizer(*args, **options)
+    adjusted = dict(options)
+    changes: List[str] = []
+    for rule in (_lost_rule, _gc_rule, _spill_rule, _skew_rule):
+        change = rule(summary, baseline, adjusted)
+        if change:
+            changes.append(change)
+    # some problems are reported but can not be fixed by options
+    optimizer = (
+        baseline
+        if adjusted == options
+        else SparkConfOptimizer(*args, **adjusted)
+    )
+    return Recommendation(optimizer, baseline, changes)
+
+
+def _lost_rule(
+    summary: EventLogSummary,
+    baseline: SparkConfOptimizer,
+    options: Dict[str, Any],
+) -> str:
+    if not summary.lost_executors:
+        return ''
+    executor_id, reason = next(iter(summary.lost_executors.items()))
+    lost = (
+        f'executor {executor_id} was lost ({reason})'
+        if len(summary.lost_executors) == 1
+        else f'{len(summary.lost_executors)} executors were lost, '
+        f'executor {executor_id} by {reason}'
+    )
+    profile = baseline.profile or WorkloadProfile()
+    heap_fraction = round(profile.heap_fraction - HEAP_FRACTION_STEP, 2)
+    if heap_fraction < MIN_HEAP_FRACTION:
+        return f'{lost}, but heap fraction is already {profile.heap_fraction}'
+    options['profile'] = replace(profile, heap_fraction=heap_fraction)
+    return (
+        f'{lost}, heap fraction is lowered from {profile.heap_fraction} to '
+        f'{heap_fraction} for overhead'
+    )
+
+
+def _gc_rule(
+    summary: EventLogSummary,
+    baseline: SparkConfOptimizer,
+    options: Dict[str, Any],
+) -> str:
+    gc_ratio = summary.gc_ratio
+    if gc_ratio <= GC_TIME_RATIO:
+        return ''
+    gc = f'GC took {gc_ratio:.0%} of task run time'
+    cores = baseline.resolved.executor_cores
+    if cores <= 1 or not isinstance(
+        baseline.optimizer, (ClientModeOptimizer, ClusterModeOptimizer)
+    ):
+        return f'{gc}, but executor cores can not be lowered'
+    options['executor_cores_range'] = (max(cores // 2, 1), cores - 1)
+    return (
+        f'{gc}, executor cores are searched up to {cores - 1} for smaller '
+        'heaps'
+    )
+
+
+def _spill_rule(
+    summary: EventLogSummary,
+    baseline: SparkConfOptimizer,
+    options: Dict[str, Any],
+) -> str:
+    spilled = summary.disk_spilled
+    if not spilled:
+        return ''
+    stage = max(summary.stages, key=lambda s: s.disk_spilled)
+    peak = stage.peak_execution_memory / 1024**2
+    partition_size = baseline.partition_size / 2
+    options['partition_size'] = partition_size
+    input_bytes = max(s.input_bytes for s in summary.stages)
+    if input_bytes:
+        options['input_size'] = _gb(input_bytes)
+    shuffle_bytes = max(s.shuffle_read_bytes for s in summary.stages)
+    if shuffle_bytes:
+        options['shuffle_size'] = _gb(shuffle_bytes)
+    return (
+        f'{_gb(spilled)}GB was spilled to disk, most by stage '
+        f'{stage.stage_id} with {peak:.0f}MB peak execution memory of a '
+        f'task, parallelism is sized for {partition_size * 1024:.0f}MB '
+        'partitions'
+    )
+
+
+def _skew_rule(
+    summary: EventLogSummary,
+    baseline: SparkConfOptimizer,
+    options: Dict[str, Any],
+) -> str:
+    skewed = [
+        s
+        for s in summary.stages
+        if s.num_tasks >= MIN_SKEW_TASKS and s.skew > SKEW_RATIO
+    ]
+    if not skewed:
+        return ''
+    stage = max(skewed, key=lambda s: s.skew)
+    skew = (
+        f'longest task of stage {stage.stage_id} took {stage.skew:.1f} '
+        'times of the mean'
+    )
+    if baseline.adaptive:
+        return f'{skew}, but adaptive query execution is already enabled'
+    options['adaptive'] = True
+    return f'{skew}, adaptive query execution is enabled for skew join'
+
+
+def _gb(size: int) -> float:
+    # round up to MB not to be 0
+    return math.ceil(size / 1024**2) / 1024
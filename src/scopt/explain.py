@@ -0,0 +1,759 @@
+import copy
+import html
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from scopt.optimizer import (
+    PYSPARK_MEMORY_FRACTION,
+    YARN_MINIMUM_ALLOCATION_MB,
+    ClientModeOptimizer,
+    ClusterModeOptimizer,
+    DeployMode,
+    FleetOptimizer,
+    GpuOptimizer,
+    KubernetesOptimizer,
+    ResolvedConf,
+    Sizing,
+    SparkConfOptimizer,
+    adaptive_sizing,
+    arrow_sizing,
+    bandwidth_sizing,
+    cached_property,
+    dynamic_allocation_sizing,
+    memory_mb_sizing,
+    network_sizing,
+    overhead_factor,
+    partitions_for_size,
+    reserve_pyspark_memory,
+    split_memory,
+)
+from scopt.profile import WorkloadProfile
+
+# rule, formula and binding limit of a value of an optimizer
+_Rule = Tuple[str, str, Optional[str]]
+_Explainer = Callable[[Any], _Rule]
+
+
+@dataclass(frozen=True)
+class Step:
+    """A value evaluated while resolving Spark properties
+
+    Args:
+        name (str): Name of value like 'executor_per_node'.
+        value (Union[int, float, str]): Evaluated value.
+        rule (str): Rule producing the value, like 'daemon reserve'.
+        formula (str): Arithmetic of the rule with actual operands.
+        binding (Optional[str], optional): Limit which determined the
+            value, like 'cores' or 'memory' of node. None when no limits
+            are compared. Defaults to None.
+        elapsed (float, optional): Seconds taken to evaluate the value.
+            Values evaluated together by one function carry its time on
+            the first of them and 0.0 on the others. Defaults to 0.0.
+    """
+
+    name: str
+    value: Union[int, float, str]
+    rule: str
+    formula: str
+    binding: Optional[str] = None
+    elapsed: float = 0.0
+
+    def __str__(self) -> str:
+        binding = '' if self.binding is None else f' [{self.binding}]'
+        return (
+            f'{self.name} = {self.value}{binding} '
+            f'({self.elapsed * 1e6:.1f}us)\n'
+            f'    {self.rule}: {self.formula}'
+        )
+
+
+@dataclass(frozen=True)
+class Explanation:
+    """Trace of values resolved by SparkConfOptimizer
+
+    Steps are in order of evaluation. A value adjusted by options like
+    profile or input_size has a later step of the same name.
+
+    Args:
+        optimizer (SparkConfOptimizer): Explained optimizer.
+        steps (List[Step]): Evaluated values.
+    """
+
+    optimizer: SparkConfOptimizer
+    steps: List[Step]
+
+    def __getitem__(self, name: str) -> Step:
+        """Return the last step of name, which holds the final value"""
+
+        for step in reversed(self.steps):
+            if step.name == name:
+                return step
+        raise KeyError(name)
+
+    @property
+    def elapsed(self) -> float:
+        return sum(s.elapsed for s in self.steps)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return steps and Spark properties as JSON serializable dict"""
+
+        return {
+            'steps': [
+                {
+                    'name': s.name,
+                    'value': s.value,
+                    'rule': s.rule,
+                    'formula': s.formula,
+                    'binding': s.binding,
+                    'elapsed': s.elapsed,
+                }
+                for s in self.steps
+            ],
+            'conf': self.optimizer.as_dict(),
+        }
+
+    def __str__(self) -> str:
+        lines = [str(s) for s in self.steps]
+        lines.append(
+            f'# {len(self.steps)} steps in {self.elapsed * 1e6:.1f}us'
+        )
+        lines.append(str(self.optimizer))
+        return '\n'.join(lines)
+
+    def _repr_html_(self) -> str:
+        header_style = 'style="text-align:center"'
+        body_style = 'style="text-align:left"'
+        columns = ('Step', 'Value', 'Rule', 'Formula', 'Binding', 'Time')
+        header = ''.join(f'<td {header_style}>{c}</td>' for c in columns)
+        rows = []
+        for s in self.steps:
+            cells = (
+                s.name,
+                s.value,
+                s.rule,
+                s.formula,
+                '' if s.binding is None else s.binding,
+                f'{s.elapsed * 1e6:.1f}us',
+            )
+            data = ''.join(
+                f'<td {body_style}>{html.escape(str(c))}</td>' for c in cells
+            )
+            rows.append(f'<tr>{data}</tr>')
+        data = '\n'.join(rows)
+        return f'''
+            <table>
+                <thead>
+                    <tr>{header}</tr>
+                </thead>
+                <tbody>
+                    {data}
+                </tbody>
+            </table>
+            {self.optimizer._repr_html_()}
+        '''
+
+
+def _fixed_cores(core_per_node: int) -> _Rule:
+    formula = f'5 if {core_per_node} > 5 else max({core_per_node} - 1, 1)'
+    if core_per_node > 5:
+        return '5-core cap', formula, 'cap'
+    return 'daemon reserve', formula, 'cores'
+
+
+def _yarn_executor_cores(o: Any) -> _Rule:
+    if o.executor_cores_range is None:
+        return _fixed_cores(o.core_per_node)
+    low, high = o.executor_cores_range
+    shape = o.shape
+    return (
+        'cores search',
+        f'best utilization of {low} to {high} cores = '
+        f'{shape.core_utilization:.3f} * {shape.memory_utilization:.3f}',
+        # the less utilized resource limits the shape
+        (
+            'cores'
+            if shape.core_utilization < shape.memory_utilization
+            else 'memory'
+        ),
+    )
+
+
+def _yarn_executor_per_node(o: Any) -> _Rule:
+    per_node = math.floor((o.core_per_node - 1) / o.executor_cores)
+    return (
+        'daemon reserve',
+        f'max(floor(({o.core_per_node} - 1) / {o.executor_cores}), 1)',
+        'cores' if per_node > 0 else 'minimum',
+    )
+
+
+def _yarn_total_executor_memory(o: Any) -> _Rule:
+    return (
+        'daemon reserve',
+        f'floor(({o.memory_per_node} - 1) / {o.executor_per_node})',
+        'memory',
+    )
+
+
+def _heap(o: Any) -> _Rule:
+    return '90% heap', f'floor({o.total_executor_memory} * 0.9)', None
+
+
+def _overhead(o: Any) -> _Rule:
+    return '10% overhead', f'ceil({o.total_executor_memory} * 0.1)', None
+
+
+def _driver_slot(name: str) -> _Explainer:
+    def explainer(o: Any) -> _Rule:
+        return 'driver slot', f'{name} = {getattr(o, name)}', None
+
+    return explainer
+
+
+def _client_driver_cores(o: Any) -> _Rule:
+    cores = max(o.driver_instance.num_cores - 1, 1)
+    return (
+        'system reserve',
+        f'min(max({o.driver_instance.num_cores} - 1, 1), '
+        f'{o.executor_cores})',
+        'driver instance' if cores < o.executor_cores else 'executor',
+    )
+
+
+def _client_driver_memory(o: Any) -> _Rule:
+    total = math.floor(o.driver_instance.memory_size - 1)
+    return (
+        '90% heap',
+        f'min(floor(floor({o.driver_instance.memory_size} - 1) * 0.9), '
+        f'{o.executor_memory})',
+        (
+            'driver instance'
+            if math.floor(total * 0.9) < o.executor_memory
+            else 'executor'
+        ),
+    )
+
+
+def _client_driver_memory_overhead(o: Any) -> _Rule:
+    total = math.floor(o.driver_instance.memory_size - 1)
+    return (
+        '10% overhead',
+        f'min(ceil(floor({o.driver_instance.memory_size} - 1) * 0.1), '
+        f'{o.executor_memory_overhead})',
+        (
+            'driver instance'
+            if math.ceil(total * 0.1) < o.executor_memory_overhead
+            else 'executor'
+        ),
+    )
+
+
+def _driver(name: str, client: _Explainer) -> _Explainer:
+    # driver of optimizers supporting both client and cluster mode
+    def explainer(o: Any) -> _Rule:
+        if o.deploy_mode == DeployMode.CLUSTER:
+            return _driver_slot(name.replace('driver', 'executor'))(o)
+        return client(o)
+
+    return explainer
+
+
+def _executor_instances(o: Any) -> _Rule:
+    formula = f'{o.executor_per_node} * {o.num_nodes}'
+    if isinstance(o, (ClusterModeOptimizer, KubernetesOptimizer)) or (
+        getattr(o, 'deploy_mode', None) == DeployMode.CLUSTER
+    ):
+        return 'driver slot', f'{formula} - 1', None
+    return 'executors per node', formula, None
+
+
+def _default_parallelism(o: Any) -> _Rule:
+    return (
+        '2 tasks per core',
+        f'{o.executor_instances} * {o.executor_cores} * 2',
+        None,
+    )
+
+
+def _sql_shuffle_partitions(o: Any) -> _Rule:
+    return 'same as parallelism', f'{o.default_parallelism}', None
+
+
+def _kubernetes_executor_cores(o: Any) -> _Rule:
+    return (
+        '5-core cap' if o.allocatable_cores >= 5 else 'node reserve',
+        f'min(floor({o.allocatable_cores}), 5)',
+        'cap' if o.allocatable_cores >= 5 else 'cores',
+    )
+
+
+def _kubernetes_executor_per_node(o: Any) -> _Rule:
+    return (
+        'node reserve',
+        f'floor({o.allocatable_cores} / {o.executor_cores})',
+        'cores',
+    )
+
+
+def _kubernetes_request_cores(o: Any) -> _Rule:
+    return (
+        'even share',
+        f'floor({o.allocatable_cores} * 1000 / {o.executor_per_node})m',
+        None,
+    )
+
+
+def _kubernetes_limit_cores(o: Any) -> _Rule:
+    return (
+        'even share',
+        f'ceil({o.allocatable_cores} / {o.executor_per_node})',
+        None,
+    )
+
+
+def _kubernetes_total_executor_memory(o: Any) -> _Rule:
+    return (
+        'node reserve',
+        f'floor({o.allocatable_memory} / {o.executor_per_node})',
+        'memory',
+    )
+
+
+def _kubernetes_executor_memory(o: Any) -> _Rule:
+    return (
+        'overhead factor',
+        f'floor({o.total_executor_memory} / '
+        f'(1 + {o.conf.memory_overhead_factor}))',
+        None,
+    )
+
+
+def _kubernetes_executor_memory_overhead(o: Any) -> _Rule:
+    return (
+        'overhead factor',
+        f'{o.total_executor_memory} - {o.executor_memory}',
+        None,
+    )
+
+
+def _gpu_executor_per_node(o: Any) -> _Rule:
+    return 'executor per GPU', f'{o.num_gpus}', 'gpus'
+
+
+def _gpu_executor_cores(o: Any) -> _Rule:
+    return (
+        'daemon reserve',
+        f'max(floor(({o.core_per_node} - 1) / {o.executor_per_node}), 1)',
+        'cores',
+    )
+
+
+def _gpu_task_amount(o: Any) -> _Rule:
+    return (
+        'tasks share GPU',
+        f'floor(10000 / {o.executor_cores}) / 10000',
+        None,
+    )
+
+
+def _gpu_concurrent_tasks(o: Any) -> _Rule:
+    return (
+        '8GB per GPU task',
+        f'min(max(floor({o.gpu_memory} / 8), 1), 4)',
+        'cap' if o.gpu_memory >= 32 else 'gpu memory',
+    )
+
+
+def _fleet_executor_cores(o: Any) -> _Rule:
+    return _fixed_cores(min(i.num_cores for i, _ in o.fleet))
+
+
+def _fleet_total_executor_memory(o: Any) -> _Rule:
+    largest = min(math.floor(i.memory_size - 1) for i, _ in o.fleet)
+    return (
+        'fleet utilization',
+        f'best utilization of memory dividing nodes, up to {largest}',
+        'memory',
+    )
+
+
+def _fleet_executor_per_node(o: Any) -> _Rule:
+    fewest = min(o.usage, key=lambda u: u.executor_per_node)
+    by_cores = max(
+        math.floor((fewest.instance.num_cores - 1) / o.executor_cores), 1
+    )
+    return (
+        'fewest on a node',
+        'min(' + ', '.join(str(u.executor_per_node) for u in o.usage) + ')',
+        'cores' if by_cores == fewest.executor_per_node else 'memory',
+    )
+
+
+def _fleet_executor_instances(o: Any) -> _Rule:
+    formula = ' + '.join(
+        f'{u.executor_per_node} * {u.num_nodes}' for u in o.usage
+    )
+    if o.deploy_mode == DeployMode.CLUSTER:
+        return 'driver slot', f'{formula} - 1', None
+    return 'executors per node', formula, None
+
+
+_YARN_EXECUTOR: List[Tuple[str, _Explainer]] = [
+    ('executor_cores', _yarn_executor_cores),
+    ('executor_per_node', _yarn_executor_per_node),
+    ('total_executor_memory', _yarn_total_executor_memory),
+    ('executor_memory', _heap),
+    ('executor_memory_overhead', _overhead),
+]
+_PARALLELISM: List[Tuple[str, _Explainer]] = [
+    ('default_parallelism', _default_parallelism),
+    ('sql_shuffle_partitions', _sql_shuffle_partitions),
+]
+_DRIVER_SLOT: List[Tuple[str, _Explainer]] = [
+    ('driver_cores', _driver_slot('executor_cores')),
+    ('driver_memory', _driver_slot('executor_memory')),
+    ('driver_memory_overhead', _driver_slot('executor_memory_overhead')),
+]
+_DRIVER: List[Tuple[str, _Explainer]] = [
+    ('driver_cores', _driver('driver_cores', _client_driver_cores)),
+    ('driver_memory', _driver('driver_memory', _client_driver_memory)),
+    (
+        'driver_memory_overhead',
+        _driver('driver_memory_overhead', _client_driver_memory_overhead),
+    ),
+]
+
+# values in order of evaluation, so that a step does not evaluate others
+_EXPLAINERS: Dict[type, List[Tuple[str, _Explainer]]] = {
+    ClusterModeOptimizer: _YARN_EXECUTOR
+    + _DRIVER_SLOT
+    + [('executor_instances', _executor_instances)]
+    + _PARALLELISM,
+    ClientModeOptimizer: _YARN_EXECUTOR
+    + [
+        ('driver_cores', _client_driver_cores),
+        ('driver_memory', _client_driver_memory),
+        ('driver_memory_overhead', _client_driver_memory_overhead),
+        ('executor_instances', _executor_instances),
+    ]
+    + _PARALLELISM,
+    KubernetesOptimizer: [
+        ('executor_cores', _kubernetes_executor_cores),
+        ('executor_per_node', _kubernetes_executor_per_node),
+        ('request_cores', _kubernetes_request_cores),
+        ('limit_cores', _kubernetes_limit_cores),
+        ('total_executor_memory', _kubernetes_total_executor_memory),
+        ('executor_memory', _kubernetes_executor_memory),
+        ('executor_memory_overhead', _kubernetes_executor_memory_overhead),
+    ]
+    + _DRIVER_SLOT
+    + [('executor_instances', _executor_instances)]
+    + _PARALLELISM,
+    GpuOptimizer: [
+        ('executor_per_node', _gpu_executor_per_node),
+        ('executor_cores', _gpu_executor_cores),
+        ('total_executor_memory', _yarn_total_executor_memory),
+        ('executor_memory', _heap),
+        ('executor_memory_overhead', _overhead),
+    ]
+    + _DRIVER
+    + [
+        ('executor_instances', _executor_instances),
+        ('task_gpu_amount', _gpu_task_amount),
+        ('concurrent_gpu_tasks', _gpu_concurrent_tasks),
+    ]
+    + _PARALLELISM,
+    FleetOptimizer: [
+        ('executor_cores', _fleet_executor_cores),
+        ('total_executor_memory', _fleet_total_executor_memory),
+        ('executor_per_node', _fleet_executor_per_node),
+        ('executor_memory', _heap),
+        ('executor_memory_overhead', _overhead),
+    ]
+    + _DRIVER
+    + [('executor_instances', _fleet_executor_instances)]
+    + _PARALLELISM,
+}
+
+
+def _container_mb(o: Any) -> str:
+    unit = YARN_MINIMUM_ALLOCATION_MB
+    if isinstance(o, KubernetesOptimizer):
+        return f'floor({o.allocatable_memory} * 1024 / {o.executor_per_node})'
+    if isinstance(o, FleetOptimizer):
+        nodes = ', '.join(
+            f'{u.instance.memory_size}GB / {u.executor_per_node}'
+            for u in o.usage
+        )
+        return f'min({nodes}) after daemon reserve, in {unit}MB units'
+    return (
+        f'floor(({o.memory_per_node} - 1) * 1024 / {o.executor_per_node}) '
+        f'in {unit}MB units'
+    )
+
+
+def _sized_steps(sizing: Dict[str, Sizing], elapsed: float) -> List[Step]:
+    # values sized together by one function, which was measured as a whole
+    # and reports its time on the first of them
+    return [
+        Step(
+            name,
+            s.value,
+            s.rule,
+            s.formula.format(*s.operands),
+            s.limit,
+            elapsed if i == 0 else 0.0,
+        )
+        for i, (name, s) in enumerate(sizing.items())
+    ]
+
+
+def _memory_mb_steps(
+    o: Any, profile: Optional[WorkloadProfile], pyspark_memory: int
+) -> List[Step]:
+    total, elapsed = _timed(lambda: o.total_executor_memory_mb)
+    steps = [
+        Step(
+            'total_executor_memory_mb',
+            total,
+            'MB container',
+            _container_mb(o),
+            'memory',
+            elapsed,
+        )
+    ]
+    driver, elapsed = _timed(lambda: o.total_driver_memory_mb)
+    steps.append(
+        Step(
+            'total_driver_memory_mb',
+            driver,
+            'MB container',
+            (
+                'total_executor_memory_mb'
+                if driver == total
+                else f'floor(({o.driver_instance.memory_size} - 1) * 1024)'
+            ),
+            None,
+            elapsed,
+        )
+    )
+    sizing, elapsed = _timed(
+        lambda: memory_mb_sizing(
+            total, driver, overhead_factor(o), profile, pyspark_memory
+        )
+    )
+    steps.extend(
+        _sized_steps(
+            {f'{name}_mb': value for name, value in sizing.items()}, elapsed
+        )
+    )
+    return steps
+
+
+def _property_steps(optimizer: SparkConfOptimizer, o: Any) -> List[Step]:
+    # properties sized from resolved values by the helpers of as_dict
+    resolved = optimizer.resolved
+    memory_mb = optimizer.memory_mb
+    steps = []
+    if optimizer.pyspark:
+        arrow, elapsed = _timed(lambda: arrow_sizing(resolved))
+        steps.extend(
+            _sized_steps(
+                {'spark.sql.execution.arrow.maxRecordsPerBatch': arrow},
+                elapsed,
+            )
+        )
+    if optimizer.min_nodes is not None or optimizer.max_nodes is not None:
+        max_nodes = (
+            optimizer.num_nodes if optimizer.specified_num_nodes else None
+        )
+        sizing, elapsed = _timed(
+            lambda: dynamic_allocation_sizing(
+                resolved,
+                optimizer.num_nodes,
+                optimizer.min_nodes or 0,
+                max_nodes,
+            )
+        )
+        steps.extend(_sized_steps(sizing, elapsed))
+    if optimizer.adaptive:
+        sizing, elapsed = _timed(
+            lambda: adaptive_sizing(
+                resolved, optimizer.specified_num_nodes, memory_mb
+            )
+        )
+        steps.extend(_sized_steps(sizing, elapsed))
+    if optimizer.executor_bandwidth is not None:
+        bandwidth, elapsed = _timed(
+            lambda: bandwidth_sizing(optimizer.executor_instance, o)
+        )
+        steps.extend(_sized_steps({'executor_bandwidth': bandwidth}, elapsed))
+        sizing, elapsed = _timed(
+            lambda: network_sizing(resolved, bandwidth.value, memory_mb)
+        )
+        steps.extend(_sized_steps(sizing, elapsed))
+    return steps
+
+
+def _fresh(optimizer: Any) -> Any:
+    # copy without evaluated values, which are cached on the object
+    fresh = copy.copy(optimizer)
+    for cls in type(optimizer).__mro__:
+        for name, attribute in vars(cls).items():
+            if isinstance(attribute, cached_property):
+                fresh.__dict__.pop(name, None)
+    return fresh
+
+
+def _timed(func: Callable[[], Any]) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    value = func()
+    return value, time.perf_counter() - start
+
+
+def _changed(
+    before: ResolvedConf,
+    after: ResolvedConf,
+    elapsed: float,
+    rules: Dict[str, Tuple[str, str]],
+) -> List[Step]:
+    # steps of values changed by an adjustment measured as a whole, which
+    # reports its time on the first of them
+    names = [n for n in rules if getattr(before, n) != getattr(after, n)]
+    return [
+        Step(
+            name,
+            getattr(after, name),
+            *rules[name],
+            elapsed=elapsed if i == 0 else 0.0,
+        )
+        for i, name in enumerate(names)
+    ]
+
+
+def explain(optimizer: SparkConfOptimizer) -> Explanation:
+    """Return how values of optimizer were resolved
+
+    Values are evaluated again one by one on a copy of `optimizer.optimizer`
+    and adjusted by the options of optimizer, measuring each step. Nothing
+    is recorded while optimizer itself is resolved, so explaining costs
+    only when called. Properties computed from the values, like dynamic
+    allocation, adaptive and network ones, are steps named by the property
+    and explained by the operands and limits the sizing functions of
+    `SparkConfOptimizer.as_dict` return with them.
+
+    Args:
+        optimizer (SparkConfOptimizer): Optimizer to be explained.
+
+    Raises:
+        ValueError: When optimizer is not supported.
+
+    Returns:
+        Explanation: Steps and Spark properties
+
+    ```python
+    from scopt import SparkConfOptimizer
+    from scopt.explain import explain
+    from scopt.instances import Instance
+
+
+    >>> explanation = explain(SparkConfOptimizer(Instance(32, 250), 10))
+    >>> print(explanation['executor_per_node'])
+    executor_per_node = 6 [cores] (0.6us)
+        daemon reserve: max(floor((32 - 1) / 5), 1)
+    ```
+    """
+
+    explainers = _EXPLAINERS.get(type(optimizer.optimizer))
+    if explainers is None:
+        raise ValueError(
+            f'{type(optimizer.optimizer).__name__} can not be explained'
+        )
+    fresh = _fresh(optimizer.optimizer)
+    steps = []
+    for name, explainer in explainers:
+        value, elapsed = _timed(lambda: getattr(fresh, name))
+        steps.append(Step(name, value, *explainer(fresh), elapsed=elapsed))
+
+    resolved = ResolvedConf.from_optimizer(fresh)
+    total = resolved.total_executor_memory
+    profile = optimizer.profile
+    if profile is not None:
+        adjusted, elapsed = _timed(lambda: split_memory(resolved, profile))
+        steps.extend(
+            _changed(
+                resolved,
+                adjusted,
+                elapsed,
+                {
+                    'executor_memory': (
+                        'profile heap',
+                        f'floor({total} * {profile.heap_fraction})',
+                    ),
+                    'executor_off_heap_memory': (
+                        'profile off-heap',
+                        f'floor({total} * {profile.off_heap_fraction})',
+                    ),
+                    'executor_memory_overhead': (
+                        'profile overhead',
+                        f'{total} - {adjusted.executor_memory} - '
+                        f'{adjusted.executor_off_heap_memory}',
+                    ),
+                },
+            )
+        )
+        resolved = adjusted
+    if optimizer.pyspark:
+        adjusted, elapsed = _timed(lambda: reserve_pyspark_memory(resolved))
+        cores = resolved.executor_cores
+        steps.extend(
+            _changed(
+                resolved,
+                adjusted,
+                elapsed,
+                {
+                    'executor_pyspark_memory': (
+                        'python worker per core',
+                        f'max(floor({total} * {PYSPARK_MEMORY_FRACTION} / '
+                        f'{cores}), 1) * {cores}',
+                    ),
+                    'executor_memory': (
+                        'python worker per core',
+                        f'{resolved.executor_memory} - '
+                        f'{adjusted.executor_pyspark_memory}',
+                    ),
+                },
+            )
+        )
+        resolved = adjusted
+    total_cores = resolved.executor_instances * resolved.executor_cores
+    for name, size in (
+        ('default_parallelism', optimizer.input_size),
+        ('sql_shuffle_partitions', optimizer.shuffle_size),
+    ):
+        if size is None:
+            continue
+        value, elapsed = _timed(
+            lambda: partitions_for_size(
+                size, optimizer.partition_size, total_cores
+            )
+        )
+        steps.append(
+            Step(
+                name,
+                value,
+                'partition size',
+                f'ceil(ceil({size} / {optimizer.partition_size}) / '
+                f'{total_cores}) * {total_cores}',
+                'cores' if value == total_cores else None,
+                elapsed,
+            )
+        )
+    if optimizer.memory_mb is not None:
+        steps.extend(
+            _memory_mb_steps(fresh, profile, resolved.executor_pyspark_memory)
+        )
+    steps.extend(_property_steps(optimizer, fresh))
+    return Explanation(optimizer, steps)
@@ -1,3 +1,11 @@
 from scopt.instances.base import Instance
+from scopt.instances.catalog import dump_catalog, load_catalog, parse_catalog
+from scopt.instances.index import InstanceIndex
 
-__all__ = ['Instance']
+__all__ = [
+    'Instance',
+    'InstanceIndex',
+    'dump_catalog',
+    'load_catalog',
+    'parse_catalog',
+]
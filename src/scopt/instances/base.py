@@ -1,17 +1,26 @@
+import math
 from dataclasses import dataclass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, repr=False)
 class Instance:
     """Instance infomation used for Spark cluster nodes
 
     Args:
         num_cores (int, optional): Number of CPU cores. Defaults to 5.
         memory_size (float, optional): Memory size GB. Defaults to 1.0.
+        num_gpus (int, optional): Number of GPUs. Defaults to 0.
+        gpu_memory (float, optional): Memory size GB of each GPU.
+            Defaults to 0.0.
+        network_bandwidth (float, optional): Network bandwidth Gbps.
+            0.0 means unknown. Defaults to 0.0.
     """
 
     num_cores: int = 1
     memory_size: float = 1.0
+    num_gpus: int = 0
+    gpu_memory: float = 0.0
+    network_bandwidth: float = 0.0
 
     def __post_init__(self) -> None:
         if self.num_cores < 1:
@@ -23,3 +32,30 @@ class Instance:
                 'memory_size must be more than 0, '
                 f'but actually {self.memory_size}'
             )
+        # memory is sized in MB too, which must not overflow
+        if not math.isfinite(self.memory_size * 1024):
+            raise ValueError(
+                'memory_size must be finite in MB, '
+                f'but actually {self.memory_size}'
+            )
+        if self.num_gpus < 0 or self.gpu_memory < 0.0:
+            raise ValueError(
+                'num_gpus and gpu_memory must be 0 or more, '
+                f'but actually {self.num_gpus}, {self.gpu_memory}'
+            )
+        if self.network_bandwidth < 0.0:
+            raise ValueError(
+                'network_bandwidth must be 0 or more, '
+                f'but actually {self.network_bandwidth}'
+            )
+
+    def __repr__(self) -> str:
+        # accelerators and bandwidth are shown only when they are known
+        fields = f'num_cores={self.num_cores}, memory_size={self.memory_size}'
+        if self.num_gpus:
+            fields += (
+                f', num_gpus={self.num_gpus}, gpu_memory={self.gpu_memory}'
+            )
+        if self.network_bandwidth:
+            fields += f', network_bandwidth={self.network_bandwidth}'
+        return f'{self.__class__.__qualname__}({fields})'
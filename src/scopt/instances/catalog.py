@@ -0,0 +1,129 @@
+import pkgutil
+from pathlib import Path
+from typing import Dict, List, Mapping, Union
+
+from scopt.instances.base import Instance
+
+COLUMNS = ('name', 'num_cores', 'memory_size')
+# optional columns which can be omitted from the end of row
+OPTIONAL_COLUMNS = ('num_gpus', 'gpu_memory', 'network_bandwidth')
+
+
+def parse_catalog(text: str) -> Dict[str, Instance]:
+    """Parse instance catalog text
+
+    Catalog is a CSV text. Lines starting with `#` are comments and the first
+    other line is a header which must start with `name,num_cores,memory_size`.
+    Header can be followed by `num_gpus,gpu_memory,network_bandwidth` and
+    rows can omit them from the end or leave them empty when they are
+    unknown.
+    Instance types with same resources share one Instance object.
+
+    ```
+    # comment
+    name,num_cores,memory_size,num_gpus,gpu_memory,network_bandwidth
+    c4.large,2,1
+    r5.4xlarge,16,120,,,10
+    p3.8xlarge,32,236,4,16,10
+    ```
+
+    Args:
+        text (str): Catalog text.
+
+    Raises:
+        ValueError: When text is not a valid catalog.
+
+    Returns:
+        Dict[str, Instance]: Instance type name to Instance
+    """
+
+    rows = (
+        line.split(',')
+        for line in text.splitlines()
+        if line.strip() and not line.startswith('#')
+    )
+    header = next(rows, None)
+    if header is None or tuple(header[: len(COLUMNS)]) != COLUMNS:
+        raise ValueError(
+            f'Catalog header must start with {",".join(COLUMNS)}, '
+            f'but actually {header}'
+        )
+
+    optional = header[len(COLUMNS) : len(COLUMNS) + len(OPTIONAL_COLUMNS)]
+    if tuple(optional) != OPTIONAL_COLUMNS[: len(optional)]:
+        raise ValueError(
+            f'Catalog optional columns must be {",".join(OPTIONAL_COLUMNS)}, '
+            f'but actually {optional}'
+        )
+    shared: Dict[Instance, Instance] = {}
+    instances = {}
+    for number, row in enumerate(rows, 2):
+        try:
+            name, num_cores, memory_size = row[: len(COLUMNS)]
+            # omitted or empty optional columns are 0
+            values = row[len(COLUMNS) : len(COLUMNS) + len(optional)]
+            values += [''] * (len(OPTIONAL_COLUMNS) - len(values))
+            num_gpus, gpu_memory, network_bandwidth = (
+                v or '0' for v in values
+            )
+            instance = Instance(
+                int(num_cores),
+                _number(memory_size),
+                int(num_gpus),
+                _number(gpu_memory),
+                _number(network_bandwidth),
+            )
+        except ValueError as e:
+            raise ValueError(f'Invalid catalog row {number}: {row}: {e}')
+        instances[name] = shared.setdefault(instance, instance)
+    return instances
+
+
+def load_catalog(path: Union[str, Path]) -> Dict[str, Instance]:
+    """Load instance catalog file
+
+    See `parse_catalog` for the file format.
+
+    Args:
+        path (Union[str, Path]): Path of catalog file.
+
+    Returns:
+        Dict[str, Instance]: Instance type name to Instance
+    """
+
+    return parse_catalog(Path(path).read_text())
+
+
+def dump_catalog(instances: Mapping[str, Instance]) -> str:
+    """Return catalog text which can be parsed by `parse_catalog`
+
+    Args:
+        instances (Mapping[str, Instance]): Instance type name to Instance.
+
+    Returns:
+        str: Catalog text
+    """
+
+    lines: List[str] = [','.join(COLUMNS + OPTIONAL_COLUMNS)]
+    for name, i in instances.items():
+        line = f'{name},{i.num_cores},{i.memory_size}'
+        if i.num_gpus:
+            line += f',{i.num_gpus},{i.gpu_memory}'
+        if i.network_bandwidth:
+            if not i.num_gpus:
+                line += ',,'
+            line += f',{i.network_bandwidth}'
+        lines.append(line)
+    return '\n'.join(lines) + '\n'
+
+
+def load_package_catalog(name: str) -> Dict[str, Instance]:
+    data = pkgutil.get_data(__package__, f'data/{name}.csv')
+    if data is None:
+        raise FileNotFoundError(f'Catalog {name} is not found')
+    return parse_catalog(data.decode())
+
+
+def _number(value: str) -> Union[int, float]:
+    # keep integer memory size as int like Instance(16, 120)
+    return float(value) if '.' in value else int(value)
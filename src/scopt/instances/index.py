@@ -0,0 +1,205 @@
+from bisect import bisect_left, bisect_right
+from typing import Callable, List, Mapping, Optional, Tuple
+
+from scopt.instances.base import Instance
+
+NamedInstance = Tuple[str, Instance]
+
+
+def _memory_per_core(instance: Instance) -> float:
+    return instance.memory_size / instance.num_cores
+
+
+def _order(item: NamedInstance) -> Tuple[int, float, str]:
+    name, instance = item
+    return (instance.num_cores, instance.memory_size, name)
+
+
+class _SortedIndex:
+    def __init__(
+        self,
+        items: List[NamedInstance],
+        key: Callable[[Instance], float],
+    ) -> None:
+        self.entries = sorted(items, key=lambda i: (key(i[1]), _order(i)))
+        self.keys = [key(instance) for _, instance in self.entries]
+
+    def bounds(
+        self, lower: Optional[float], upper: Optional[float]
+    ) -> Tuple[int, int]:
+        start = 0 if lower is None else bisect_left(self.keys, lower)
+        stop = (
+            len(self.keys) if upper is None else bisect_right(self.keys, upper)
+        )
+        return start, max(start, stop)
+
+
+class InstanceIndex:
+    """Sorted indexes over a catalog of Instance
+
+    Keeps indexes on num_cores, memory_size and memory size per core, so range
+    and nearest fit queries are answered by bisection. Results are
+    (name, Instance) pairs ordered by num_cores, memory_size and name.
+    All bounds are inclusive and None means unbounded.
+
+    Args:
+        instances (Mapping[str, Instance]): Catalog to be indexed.
+            For example AwsInstanceMap.
+
+    ```python
+    from scopt.instances import InstanceIndex
+    from scopt.instances.aws import AwsInstanceMap
+
+
+    >>> index = InstanceIndex(AwsInstanceMap())
+    >>> index.smallest(min_cores=16, min_memory_per_core=7)
+    ('d2.4xlarge', Instance(num_cores=16, memory_size=114))
+    >>> index.query(min_cores=16, max_cores=16, min_memory=100)
+    [
+        ('d2.4xlarge', Instance(num_cores=16, memory_size=114)),
+        ('d3.4xlarge', Instance(num_cores=16, memory_size=114)),
+        ...
+    ]
+    ```
+    """
+
+    def __init__(self, instances: Mapping[str, Instance]) -> None:
+        items = list(instances.items())
+        self._cores = _SortedIndex(items, lambda i: i.num_cores)
+        self._memory = _SortedIndex(items, lambda i: i.memory_size)
+        self._memory_per_core = _SortedIndex(items, _memory_per_core)
+        # entries of the cores index are grouped by num_cores and sorted by
+        # memory_size within a group, so smallest bisects on memory_size
+        entries = self._cores.entries
+        self._memories = [instance.memory_size for _, instance in entries]
+        self._group_cores: List[int] = []
+        self._group_starts: List[int] = []
+        for i, (_, instance) in enumerate(entries):
+            if not self._group_cores or (
+                self._group_cores[-1] != instance.num_cores
+            ):
+                self._group_cores.append(instance.num_cores)
+                self._group_starts.append(i)
+        self._group_starts.append(len(entries))
+
+    def __len__(self) -> int:
+        return len(self._cores.entries)
+
+    def query(
+        self,
+        min_cores: Optional[int] = None,
+        max_cores: Optional[int] = None,
+        min_memory: Optional[float] = None,
+        max_memory: Optional[float] = None,
+        min_memory_per_core: Optional[float] = None,
+        max_memory_per_core: Optional[float] = None,
+    ) -> List[NamedInstance]:
+        """Return instances within all of the given ranges
+
+        Args:
+            min_cores (Optional[int], optional): Lower bound of num_cores.
+            max_cores (Optional[int], optional): Upper bound of num_cores.
+            min_memory (Optional[float], optional): Lower bound of
+                memory_size GB.
+            max_memory (Optional[float], optional): Upper bound of
+                memory_size GB.
+            min_memory_per_core (Optional[float], optional): Lower bound of
+                memory_size GB per core.
+            max_memory_per_core (Optional[float], optional): Upper bound of
+                memory_size GB per core.
+
+        Returns:
+            List[NamedInstance]: Matched (name, Instance) pairs
+        """
+
+        ranges = [
+            (self._cores, self._cores.bounds(min_cores, max_cores)),
+            (self._memory, self._memory.bounds(min_memory, max_memory)),
+            (
+                self._memory_per_core,
+                self._memory_per_core.bounds(
+                    min_memory_per_core, max_memory_per_core
+                ),
+            ),
+        ]
+        # scan only the narrowest range and check others for each entry
+        index, (start, stop) = min(ranges, key=lambda r: r[1][1] - r[1][0])
+        matched = [
+            (name, instance)
+            for name, instance in index.entries[start:stop]
+            if _within(instance.num_cores, min_cores, max_cores)
+            and _within(instance.memory_size, min_memory, max_memory)
+            and _within(
+                _memory_per_core(instance),
+                min_memory_per_core,
+                max_memory_per_core,
+            )
+        ]
+        return matched if index is self._cores else sorted(matched, key=_order)
+
+    def smallest(
+        self,
+        min_cores: Optional[int] = None,
+        min_memory: Optional[float] = None,
+        min_memory_per_core: Optional[float] = None,
+    ) -> Optional[NamedInstance]:
+        """Return the smallest instance satisfying all of the lower bounds
+
+        The smallest means fewest num_cores, then least memory_size.
+        Each num_cores from min_cores is tried by bisection on memory_size,
+        so the cost is O(G log N) for G distinct num_cores and N instances.
+
+        Args:
+            min_cores (Optional[int], optional): Lower bound of num_cores.
+            min_memory (Optional[float], optional): Lower bound of
+                memory_size GB.
+            min_memory_per_core (Optional[float], optional): Lower bound of
+                memory_size GB per core.
+
+        Returns:
+            Optional[NamedInstance]: Found (name, Instance) pair or None
+        """
+
+        entries = self._cores.entries
+        first = 0
+        if min_cores is not None:
+            first = bisect_left(self._group_cores, min_cores)
+        for group in range(first, len(self._group_cores)):
+            lo = self._group_starts[group]
+            hi = self._group_starts[group + 1]
+            required = min_memory or 0.0
+            if min_memory_per_core is not None:
+                required = max(
+                    required, min_memory_per_core * self._group_cores[group]
+                )
+            i = bisect_left(self._memories, required, lo, hi)
+            # memory_size / num_cores may round apart from the product
+            while i > lo and _fits(
+                entries[i - 1][1], min_memory, min_memory_per_core
+            ):
+                i -= 1
+            while i < hi and not _fits(
+                entries[i][1], min_memory, min_memory_per_core
+            ):
+                i += 1
+            if i < hi:
+                return entries[i]
+        return None
+
+
+def _fits(
+    instance: Instance,
+    min_memory: Optional[float],
+    min_memory_per_core: Optional[float],
+) -> bool:
+    return _within(instance.memory_size, min_memory, None) and _within(
+        _memory_per_core(instance), min_memory_per_core, None
+    )
+
+
+def _within(
+    value: float, lower: Optional[float], upper: Optional[float]
+) -> bool:
+    return (lower is None or lower <= value) and (
+        upper is None or value <= upper
+    )
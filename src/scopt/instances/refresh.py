@@ -0,0 +1,473 @@
+import argparse
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from scopt.instances.base import Instance
+from scopt.instances.catalog import dump_catalog, parse_catalog
+
+EMR_URL = 'https://docs.aws.amazon.com/emr/latest/ReleaseGuide/emr-hadoop-task-config.html'  # noqa: E501
+EC2_URL = 'https://aws.amazon.com/ec2/instance-types/'
+# page name to url, page name is also file name in cache directory
+SOURCES = {'emr': EMR_URL, 'ec2': EC2_URL}
+
+_MEMORY_KEY = 'yarn.nodemanager.resource.memory-mb'
+_INSTANCE_TYPE = re.compile(r'^[a-z][a-z0-9-]*\.[a-z0-9]+$')
+_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+_SIZES = ('nano', 'micro', 'small', 'medium', 'large', 'xlarge')
+
+
+@dataclass(frozen=True)
+class InstanceSpec:
+    """Resources of an instance type listed on EC2 page
+
+    Zero means the value is not listed, like 'Moderate' network
+    performance. 'Up to' burst bandwidth is zero with network_burst, since
+    baseline bandwidth is lower and not listed.
+    """
+
+    num_cores: int
+    network_bandwidth: float = 0.0
+    num_gpus: int = 0
+    gpu_memory: float = 0.0
+    network_burst: bool = False
+
+
+@dataclass(frozen=True)
+class CatalogDiff:
+    """Difference between two catalogs"""
+
+    added: Dict[str, Instance] = field(default_factory=dict)
+    removed: Dict[str, Instance] = field(default_factory=dict)
+    changed: Dict[str, Tuple[Instance, Instance]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def __str__(self) -> str:
+        lines = [f'+ {k} {v}' for k, v in self.added.items()]
+        lines.extend(f'- {k} {v}' for k, v in self.removed.items())
+        lines.extend(
+            f'~ {k} {old} -> {new}' for k, (old, new) in self.changed.items()
+        )
+        return '\n'.join(lines)
+
+
+class _TableParser(HTMLParser):
+    # collects cell texts of tables with the last title text before them
+    def __init__(self) -> None:
+        super().__init__()
+        self.tables: List[Tuple[str, List[List[str]]]] = []
+        self._title = ''
+        self._title_tag: Optional[str] = None
+        self._title_depth = 0
+        self._title_text: List[str] = []
+        self._table_depth = 0
+        self._cell: Optional[List[str]] = None
+
+    def handle_starttag(
+        self, tag: str, attrs: List[Tuple[str, Optional[str]]]
+    ) -> None:
+        if self._title_tag is not None:
+            self._title_depth += tag == self._title_tag
+        elif 'title' in (dict(attrs).get('class') or '').split():
+            self._title_tag = tag
+            self._title_depth = 1
+            self._title_text = []
+        if tag == 'table':
+            self._table_depth += 1
+            if self._table_depth == 1:
+                self.tables.append((self._title, []))
+        elif self._table_depth == 1 and tag == 'tr':
+            self.tables[-1][1].append([])
+        elif self._table_depth == 1 and tag in ('td', 'th'):
+            self._cell = []
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == self._title_tag:
+            self._title_depth -= 1
+            if self._title_depth == 0:
+                self._title = _text(self._title_text)
+                self._title_tag = None
+        if tag == 'table':
+            self._table_depth = max(self._table_depth - 1, 0)
+        elif tag in ('td', 'th') and self._cell is not None:
+            rows = self.tables[-1][1]
+            if rows:
+                rows[-1].append(_text(self._cell))
+            self._cell = None
+
+    def handle_data(self, data: str) -> None:
+        if self._title_tag is not None:
+            self._title_text.append(data)
+        if self._cell is not None:
+            self._cell.append(data)
+
+
+def _text(parts: List[str]) -> str:
+    return ' '.join(''.join(parts).split())
+
+
+def _tables(html: str) -> List[Tuple[str, List[List[str]]]]:
+    parser = _TableParser()
+    parser.feed(html)
+    parser.close()
+    return parser.tables
+
+
+def parse_emr_page(html: str) -> Dict[str, Union[int, float]]:
+    """Parse YARN memory of instance types from EMR task configuration page
+
+    Each instance type has a table of default configurations titled by its
+    name.
+
+    Args:
+        html (str): HTML of EMR task configuration page.
+
+    Returns:
+        Dict[str, Union[int, float]]: Instance type to
+            yarn.nodemanager.resource.memory-mb in GB, which is not rounded
+            so that memory can be sized in MB
+    """
+
+    memory = {}
+    for title, rows in _tables(html):
+        if not _INSTANCE_TYPE.match(title):
+            continue
+        for row in rows:
+            if len(row) >= 2 and row[0] == _MEMORY_KEY:
+                memory[title] = _integral(int(row[1]) / 1024)
+                break
+    return memory
+
+
+def parse_ec2_page(html: str) -> Dict[str, InstanceSpec]:
+    """Parse resources of instance types from EC2 instance types page
+
+    Each instance family has a table whose first row is header, and columns
+    are found by header names, vCPU, network and GPU.
+
+    Args:
+        html (str): HTML of EC2 instance types page.
+
+    Returns:
+        Dict[str, InstanceSpec]: Instance type to resources
+    """
+
+    specs = {}
+    for _, rows in _tables(html):
+        if not rows:
+            continue
+        columns = _columns(rows[0])
+        if 'cores' not in columns:
+            continue
+        for row in rows[1:]:
+            if not row or not _INSTANCE_TYPE.match(row[0]):
+                continue
+            values = {
+                k: _number(row[i]) if i < len(row) else 0.0
+                for k, i in columns.items()
+            }
+            num_gpus = int(values.get('gpus', 0))
+            burst = _burst(row, columns)
+            specs[row[0]] = InstanceSpec(
+                int(values['cores']),
+                0.0 if burst else values.get('network', 0.0),
+                num_gpus,
+                # page lists total memory of GPUs
+                values.get('gpu_memory', 0.0) / num_gpus if num_gpus else 0.0,
+                burst,
+            )
+    return specs
+
+
+def _columns(header: List[str]) -> Dict[str, int]:
+    columns: Dict[str, int] = {}
+    for i, name in enumerate(header):
+        name = name.lower()
+        if 'vcpu' in name:
+            columns.setdefault('cores', i)
+        elif 'network' in name:
+            columns.setdefault('network', i)
+        elif 'gpu' in name and 'mem' in name:
+            columns.setdefault('gpu_memory', i)
+        elif name.startswith('gpu'):
+            columns.setdefault('gpus', i)
+    return columns
+
+
+def _burst(row: List[str], columns: Dict[str, int]) -> bool:
+    # 'Up to 10' is burst bandwidth of smaller sizes
+    i = columns.get('network', len(row))
+    return i < len(row) and row[i].lower().startswith('up to')
+
+
+def _number(text: str) -> float:
+    # '25 Gigabit' is 25, and 'Moderate' is unknown
+    match = _NUMBER.search(text)
+    return float(match.group()) if match else 0.0
+
+
+def build_catalog(
+    memory: Mapping[str, float],
+    specs: Mapping[str, InstanceSpec],
+    current: Optional[Mapping[str, Instance]] = None,
+) -> Tuple[Dict[str, Instance], List[str]]:
+    """Build catalog of EMR instance types
+
+    Values not listed on pages, like GPUs of instance types whose family
+    table has no GPU column, are taken from current catalog. Network
+    bandwidth of 'Up to' burst is left unknown, so that network tuning does
+    not size for burst.
+
+    Args:
+        memory (Mapping[str, float]): Result of `parse_emr_page`.
+        specs (Mapping[str, InstanceSpec]): Result of `parse_ec2_page`.
+        current (Optional[Mapping[str, Instance]], optional): Current
+            catalog. Defaults to None.
+
+    Returns:
+        Tuple[Dict[str, Instance], List[str]]: Catalog ordered by family
+            and size, and instance types whose cores are unknown
+    """
+
+    current = current or {}
+    catalog = {}
+    unknown = []
+    for name in sorted(memory, key=_sort_key):
+        spec = specs.get(name)
+        old = current.get(name)
+        if spec is None and old is None:
+            unknown.append(name)
+            continue
+        if spec is None:
+            assert old is not None
+            spec = InstanceSpec(old.num_cores)
+        if old is not None:
+            spec = InstanceSpec(
+                spec.num_cores,
+                # burst bandwidth is not taken from current catalog
+                spec.network_bandwidth
+                or (0.0 if spec.network_burst else old.network_bandwidth),
+                spec.num_gpus or old.num_gpus,
+                spec.gpu_memory or old.gpu_memory,
+            )
+        catalog[name] = Instance(
+            spec.num_cores,
+            memory[name],
+            spec.num_gpus,
+            _integral(spec.gpu_memory),
+            _integral(spec.network_bandwidth),
+        )
+    return catalog, unknown
+
+
+def _integral(value: float) -> Union[int, float]:
+    # write 16 rather than 16.0 in catalog
+    return int(value) if float(value).is_integer() else value
+
+
+def _sort_key(name: str) -> Tuple[str, int, int]:
+    # c5.large, c5.xlarge, c5.2xlarge, ..., c5.metal
+    family, _, size = name.partition('.')
+    if size in _SIZES:
+        return family, _SIZES.index(size), 0
+    match = re.match(r'^(\d+)xlarge$', size)
+    if match:
+        return family, len(_SIZES), int(match.group(1))
+    return family, len(_SIZES) + 1, 0
+
+
+def diff_catalog(
+    current: Mapping[str, Instance], new: Mapping[str, Instance]
+) -> CatalogDiff:
+    """Return difference from current catalog to new one
+
+    Args:
+        current (Mapping[str, Instance]): Current catalog.
+        new (Mapping[str, Instance]): New catalog.
+
+    Returns:
+        CatalogDiff: Added, removed and changed instance types
+    """
+
+    return CatalogDiff(
+        {k: v for k, v in new.items() if k not in current},
+        {k: v for k, v in current.items() if k not in new},
+        {
+            k: (current[k], v)
+            for k, v in new.items()
+            if k in current and current[k] != v
+        },
+    )
+
+
+def fetch_pages(
+    sources: Mapping[str, str] = SOURCES,
+    cache_dir: Optional[Path] = None,
+    offline: bool = False,
+    timeout: float = 30.0,
+) -> Dict[str, str]:
+    """Fetch pages concurrently
+
+    With cache_dir, a page is saved as `<name>.html` with its ETag in
+    `<name>.etag`, and it is requested with `If-None-Match` next time.
+    Offline, pages are read only from cache_dir, so saved HTML files can
+    be used as fixtures.
+
+    Args:
+        sources (Mapping[str, str], optional): Page name to url.
+            Defaults to SOURCES.
+        cache_dir (Optional[Path], optional): Cache directory.
+            Defaults to None.
+        offline (bool, optional): Read pages only from cache_dir.
+            Defaults to False.
+        timeout (float, optional): Timeout seconds of a request.
+            Defaults to 30.0.
+
+    Raises:
+        ValueError: When a page is not cached offline.
+
+    Returns:
+        Dict[str, str]: Page name to HTML
+    """
+
+    if offline and cache_dir is None:
+        raise ValueError('cache_dir is required offline')
+    if cache_dir is not None:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    with ThreadPoolExecutor(max(len(sources), 1)) as pool:
+        futures = {
+            name: pool.submit(
+                _fetch,
+                url,
+                None if cache_dir is None else cache_dir / name,
+                offline,
+                timeout,
+            )
+            for name, url in sources.items()
+        }
+        return {name: f.result() for name, f in futures.items()}
+
+
+def _fetch(
+    url: str, cache: Optional[Path], offline: bool, timeout: float
+) -> str:
+    html_path = None if cache is None else cache.with_suffix('.html')
+    etag_path = None if cache is None else cache.with_suffix('.etag')
+    if offline:
+        assert html_path is not None
+        if not html_path.exists():
+            raise ValueError(f'{html_path} is not cached')
+        return html_path.read_text()
+
+    request = Request(url, headers={'User-Agent': 'scopt'})
+    cached = html_path is not None and html_path.exists()
+    if cached and etag_path is not None and etag_path.exists():
+        request.add_header('If-None-Match', etag_path.read_text().strip())
+    try:
+        with urlopen(request, timeout=timeout) as response:
+            charset = response.headers.get_content_charset() or 'utf-8'
+            html: str = response.read().decode(charset)
+            etag = response.headers.get('ETag')
+    except HTTPError as e:
+        if e.code == 304 and html_path is not None and cached:
+            return html_path.read_text()
+        raise
+    if html_path is not None and etag_path is not None:
+        html_path.write_text(html)
+        if etag:
+            etag_path.write_text(etag)
+        elif etag_path.exists():
+            etag_path.unlink()
+    return html
+
+
+def refresh(
+    current: Mapping[str, Instance],
+    cache_dir: Optional[Path] = None,
+    offline: bool = False,
+) -> Tuple[Dict[str, Instance], CatalogDiff, List[str]]:
+    """Fetch pages and build new catalog
+
+    Args:
+        current (Mapping[str, Instance]): Current catalog.
+        cache_dir (Optional[Path], optional): See `fetch_pages`.
+            Defaults to None.
+        offline (bool, optional): See `fetch_pages`. Defaults to False.
+
+    Raises:
+        ValueError: When no instance type is found on pages.
+
+    Returns:
+        Tuple[Dict[str, Instance], CatalogDiff, List[str]]: New catalog,
+            difference from current catalog and instance types whose cores
+            are unknown
+    """
+
+    pages = fetch_pages(SOURCES, cache_dir, offline)
+    memory = parse_emr_page(pages['emr'])
+    if not memory:
+        raise ValueError('No instance type is found on EMR page')
+    catalog, unknown = build_catalog(
+        memory, parse_ec2_page(pages['ec2']), current
+    )
+    return catalog, diff_catalog(current, catalog), unknown
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    package_catalog = Path(__file__).parent / 'data' / 'aws.csv'
+    parser = argparse.ArgumentParser(
+        prog='python -m scopt.instances.refresh',
+        description='Refresh AWS instance catalog',
+    )
+    parser.add_argument(
+        '--catalog',
+        type=Path,
+        default=package_catalog,
+        help='Current catalog. Defaults to the package catalog',
+    )
+    parser.add_argument('--cache-dir', type=Path, help='Cache directory')
+    parser.add_argument(
+        '--offline',
+        action='store_true',
+        help='Read pages only from cache directory',
+    )
+    parser.add_argument(
+        '-o', '--output', help='Output file. Writes stdout when omitted'
+    )
+    args = parser.parse_args(argv)
+
+    text = args.catalog.read_text()
+    try:
+        catalog, diff, unknown = refresh(
+            parse_catalog(text), args.cache_dir, args.offline
+        )
+    except (OSError, ValueError) as e:
+        print(f'scopt: {e}', file=sys.stderr)
+        return 1
+    for name in unknown:
+        print(f'scopt: cores of {name} are unknown', file=sys.stderr)
+    if diff:
+        print(diff, file=sys.stderr)
+
+    # comment lines of current catalog are kept
+    comments = ''.join(
+        f'{line}\n' for line in text.splitlines() if line.startswith('#')
+    )
+    output = comments + dump_catalog(catalog)
+    if args.output is None:
+        sys.stdout.write(output)
+    else:
+        Path(args.output).write_text(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
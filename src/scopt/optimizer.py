@@ -1,233 +1,1898 @@
 import math
+from dataclasses import dataclass
 from enum import Enum, unique
-from typing import Dict, List, Optional, Protocol, Tuple, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    NamedTuple,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    overload,
+)
 
 from scopt.instances import Instance
+from scopt.profile import WorkloadProfile, get_profile
+
+if TYPE_CHECKING:
+    from scopt.explain import Explanation
+
+_T = TypeVar('_T')
+_F = TypeVar('_F', bound='Freezable')
+
+# pairs of instance and number of nodes
+Fleet = Sequence[Tuple[Instance, int]]
+
+# share of total executor memory for python workers in pyspark mode
+PYSPARK_MEMORY_FRACTION = 0.25
+# assumed record size (bytes) and copies of an arrow batch in a worker
+ARROW_RECORD_SIZE = 1024
+ARROW_BATCH_COPIES = 16
+# seconds a shuffle fetch request waits for remote disk and network
+FETCH_LATENCY = 0.1
+# Gbps a single TCP connection reaches between instances
+CONNECTION_BANDWIDTH = 5.0
+# YARN rounds container requests up to a multiple of
+# yarn.scheduler.minimum-allocation-mb, which is 32 on EMR
+YARN_MINIMUM_ALLOCATION_MB = 32
+
+
+class cached_property(Generic[_T]):
+    """Property evaluated once per object
+
+    Unlike functools.cached_property before Python 3.12, this does not take
+    a lock on each evaluation. Still, caching costs more than a little
+    arithmetic, so values derived cheaply from cached ones are plain
+    properties.
+    """
+
+    def __init__(self, func: Callable[[Any], _T]) -> None:
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    @overload
+    def __get__(self, obj: None, owner: Type[Any]) -> 'cached_property[_T]':
+        ...
+
+    @overload
+    def __get__(self, obj: object, owner: Type[Any]) -> _T:
+        ...
+
+    def __get__(
+        self, obj: Optional[object], owner: Type[Any]
+    ) -> Union['cached_property[_T]', _T]:
+        if obj is None:
+            return self
+        # instance attribute takes precedence over this non-data descriptor
+        value = obj.__dict__[self.name] = self.func(obj)
+        return value
+
+
+class Freezable:
+    """Object whose attributes can be made read-only by `freeze`
+
+    Values cached by cached_property are still stored on first access,
+    as they do not change once evaluated. Constructors set attributes at
+    once by `vars(self).update`, without the frozen check of `__setattr__`
+    for each.
+    """
+
+    _frozen = False
+
+    def freeze(self: _F) -> _F:
+        """Make attributes read-only to share the object between callers
+
+        Setting or deleting an attribute of a frozen object raises
+        AttributeError, and a pickled one is still frozen when loaded.
+
+        Returns:
+            This object
+        """
+
+        object.__setattr__(self, '_frozen', True)
+        return self
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if self._frozen:
+            raise AttributeError(
+                f'Can not set {name} of frozen {type(self).__name__}'
+            )
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name: str) -> None:
+        if self._frozen:
+            raise AttributeError(
+                f'Can not delete {name} of frozen {type(self).__name__}'
+            )
+        super().__delattr__(name)
+
+
+@unique
+class DeployMode(Enum):
+    CLIENT = 'client'
+    CLUSTER = 'cluster'
+    KUBERNETES = 'kubernetes'
+
+
+# lookup by value without the slower Enum call on each optimizer
+_DEPLOY_MODES = {mode.value: mode for mode in DeployMode}
+
+
+class Optimizer(Protocol):
+    @property
+    def executor_cores(self) -> int:
+        ...
+
+    @property
+    def executor_per_node(self) -> int:
+        ...
+
+    @property
+    def total_executor_memory(self) -> int:
+        ...
+
+    @property
+    def executor_memory(self) -> int:
+        ...
+
+    @property
+    def executor_memory_overhead(self) -> int:
+        ...
+
+    @property
+    def driver_cores(self) -> int:
+        ...
+
+    @property
+    def driver_memory(self) -> int:
+        ...
+
+    @property
+    def driver_memory_overhead(self) -> int:
+        ...
+
+    @property
+    def executor_instances(self) -> int:
+        ...
+
+    @property
+    def default_parallelism(self) -> int:
+        ...
+
+    @property
+    def sql_shuffle_partitions(self) -> int:
+        ...
+
+    @property
+    def total_executor_memory_mb(self) -> int:
+        ...
+
+    @property
+    def total_driver_memory_mb(self) -> int:
+        ...
+
+    def freeze(self) -> 'Optimizer':
+        ...
+
+
+# larger heap makes GC pauses long, memory beyond this is not counted as used
+MAX_EXECUTOR_MEMORY = 64
+# Spark's minimum memory overhead (MB) of a container
+MIN_MEMORY_OVERHEAD_MB = 384
+
+
+class ExecutorShape(NamedTuple):
+    """Executors on a YARN node and utilization of the node
+
+    Utilization is ratio of resources allocated to executors in resources
+    not reserved for hadoop daemon. Executor memory over
+    MAX_EXECUTOR_MEMORY is not counted as used.
+    """
+
+    executor_cores: int
+    executor_per_node: int
+    total_executor_memory: int
+    core_utilization: float
+    memory_utilization: float
+
+    @property
+    def utilization(self) -> float:
+        return self.core_utilization * self.memory_utilization
+
+
+def executor_shape(
+    core_per_node: int, memory_per_node: float, executor_cores: int
+) -> ExecutorShape:
+    """Return ExecutorShape of executor_cores on a YARN node
+
+    Args:
+        core_per_node (int): Number of CPU cores of node.
+        memory_per_node (float): Memory size GB of node.
+        executor_cores (int): Number of cores of an executor.
+
+    Raises:
+        ValueError: When node has no memory left for executors.
+
+    Returns:
+        ExecutorShape: Executors and utilization
+    """
+
+    if memory_per_node <= 1:
+        raise ValueError(
+            'Can not reserve memory for executor. '
+            'You shuld scale up instance size.'
+        )
+    # one core and 1GB for hadoop daemon
+    executor_per_node = max(
+        math.floor((core_per_node - 1) / executor_cores), 1
+    )
+    total_executor_memory = math.floor(
+        (memory_per_node - 1) / executor_per_node
+    )
+    used_memory = min(
+        math.floor(total_executor_memory * 0.9), MAX_EXECUTOR_MEMORY
+    ) + math.ceil(total_executor_memory * 0.1)
+    return ExecutorShape(
+        executor_cores,
+        executor_per_node,
+        total_executor_memory,
+        min(executor_per_node * executor_cores / max(core_per_node - 1, 1), 1),
+        executor_per_node * used_memory / (memory_per_node - 1),
+    )
+
+
+def search_executor_shape(
+    core_per_node: int,
+    memory_per_node: float,
+    executor_cores_range: Tuple[int, int],
+) -> ExecutorShape:
+    """Return ExecutorShape utilizing node the most
+
+    Ties are broken by executor cores closer to 5 and then larger.
+
+    Args:
+        core_per_node (int): Number of CPU cores of node.
+        memory_per_node (float): Memory size GB of node.
+        executor_cores_range (Tuple[int, int]): Minimum and maximum number
+            of executor cores, inclusive.
+
+    Raises:
+        ValueError: When range is empty.
+
+    Returns:
+        ExecutorShape: Best executors and utilization
+    """
+
+    low, high = executor_cores_range
+    # executor can not have more cores than node
+    high = min(high, max(core_per_node - 1, 1))
+    if not 1 <= low <= high:
+        raise ValueError(
+            f'executor_cores_range {executor_cores_range} has no executor '
+            f'cores for {core_per_node} cores node'
+        )
+    shapes = (
+        executor_shape(core_per_node, memory_per_node, cores)
+        for cores in range(low, high + 1)
+    )
+    return max(
+        shapes,
+        key=lambda s: (
+            round(s.utilization, 9),
+            -abs(s.executor_cores - 5),
+            s.executor_cores,
+        ),
+    )
+
+
+def _yarn_container_mb(memory_per_node: float, executor_per_node: int) -> int:
+    # 1GB for hadoop daemon, and a multiple of YARN allocation so that
+    # rounded up requests still fit in yarn.nodemanager.resource.memory-mb
+    memory = math.floor((memory_per_node - 1) * 1024 / executor_per_node)
+    return memory - memory % YARN_MINIMUM_ALLOCATION_MB
+
+
+class _DriverSizing:
+    """Driver sizing shared by optimizers of YARN nodes
+
+    In cluster mode, driver takes an executor slot and is sized as an
+    executor. In client mode, driver runs on driver_instance keeping one
+    core and 1GB for system resource, and is not larger than an executor.
+    """
+
+    deploy_mode: DeployMode
+    driver_instance: Instance
+
+    @property
+    def executor_cores(self) -> int:
+        raise NotImplementedError
+
+    @property
+    def executor_memory(self) -> int:
+        raise NotImplementedError
+
+    @property
+    def executor_memory_overhead(self) -> int:
+        raise NotImplementedError
+
+    @property
+    def total_executor_memory_mb(self) -> int:
+        raise NotImplementedError
+
+    @property
+    def driver_cores(self) -> int:
+        if self.deploy_mode == DeployMode.CLUSTER:
+            return self.executor_cores
+        # one core for system resource
+        driver_cores = max(self.driver_instance.num_cores - 1, 1)
+        return min(driver_cores, self.executor_cores)
+
+    @cached_property
+    def total_driver_memory(self) -> int:
+        # 1GB for system resource
+        return math.floor(self.driver_instance.memory_size - 1)
+
+    @property
+    def driver_memory(self) -> int:
+        if self.deploy_mode == DeployMode.CLUSTER:
+            return self.executor_memory
+        driver_memory = math.floor(self.total_driver_memory * 0.9)
+        return min(driver_memory, self.executor_memory)
+
+    @property
+    def driver_memory_overhead(self) -> int:
+        if self.deploy_mode == DeployMode.CLUSTER:
+            return self.executor_memory_overhead
+        driver_memory_overhead = math.ceil(self.total_driver_memory * 0.1)
+        return min(driver_memory_overhead, self.executor_memory_overhead)
+
+    @property
+    def total_driver_memory_mb(self) -> int:
+        if self.deploy_mode == DeployMode.CLUSTER:
+            return self.total_executor_memory_mb
+        # 1GB for system resource
+        return math.floor((self.driver_instance.memory_size - 1) * 1024)
+
+
+class _YarnExecutorSizing:
+    """Executor sizing shared by client and cluster mode optimizers
+
+    Executors have 5 cores, or cores searched in executor_cores_range, and
+    one core and 1GB of a node are kept for hadoop daemon.
+    """
+
+    core_per_node: int
+    memory_per_node: float
+    num_nodes: int
+    executor_cores_range: Optional[Tuple[int, int]]
+
+    @property
+    def executor_instances(self) -> int:
+        raise NotImplementedError
+
+    @cached_property
+    def executor_cores(self) -> int:
+        if self.executor_cores_range is not None:
+            return self.shape.executor_cores
+        # keep one core for hadoop daemon when core of instance less than 5
+        return 5 if self.core_per_node > 5 else max(self.core_per_node - 1, 1)
+
+    @cached_property
+    def shape(self) -> ExecutorShape:
+        if self.executor_cores_range is None:
+            return executor_shape(
+                self.core_per_node, self.memory_per_node, self.executor_cores
+            )
+        return search_executor_shape(
+            self.core_per_node,
+            self.memory_per_node,
+            self.executor_cores_range,
+        )
+
+    @cached_property
+    def default_shape(self) -> ExecutorShape:
+        # shape by the fixed rule, to be compared with searched one
+        return executor_shape(
+            self.core_per_node,
+            self.memory_per_node,
+            5 if self.core_per_node > 5 else max(self.core_per_node - 1, 1),
+        )
+
+    @cached_property
+    def executor_per_node(self) -> int:
+        # one core for hadoop daemon
+        cpe = math.floor((self.core_per_node - 1) / self.executor_cores)
+        return cpe if cpe > 0 else 1
+
+    @cached_property
+    def total_executor_memory(self) -> int:
+        # 1GB for hadoop daemon
+        return math.floor((self.memory_per_node - 1) / self.executor_per_node)
+
+    @property
+    def executor_memory(self) -> int:
+        return math.floor(self.total_executor_memory * 0.9)
+
+    @property
+    def executor_memory_overhead(self) -> int:
+        return math.ceil(self.total_executor_memory * 0.1)
+
+    @property
+    def default_parallelism(self) -> int:
+        return self.executor_instances * self.executor_cores * 2
+
+    @property
+    def sql_shuffle_partitions(self) -> int:
+        return self.default_parallelism
+
+    @cached_property
+    def total_executor_memory_mb(self) -> int:
+        return _yarn_container_mb(self.memory_per_node, self.executor_per_node)
+
+
+class ClusterModeOptimizer(_YarnExecutorSizing, _DriverSizing, Freezable):
+    deploy_mode = DeployMode.CLUSTER
+
+    def __init__(
+        self,
+        executor_instance: Instance,
+        num_nodes: int,
+        executor_cores_range: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        vars(self).update(
+            core_per_node=executor_instance.num_cores,
+            memory_per_node=executor_instance.memory_size,
+            num_nodes=num_nodes,
+            executor_cores_range=executor_cores_range,
+        )
+        self.valid()
+
+    @property
+    def executor_instances(self) -> int:
+        # one instance for driver
+        executor_instances = self.executor_per_node * self.num_nodes - 1
+        if executor_instances < 1:
+            raise ValueError(
+                'Can not reserve cpu cores for executor. '
+                'You shuld scale up instance size or increase number of nodes.'
+            )
+        return executor_instances
+
+    def valid(self) -> None:
+        self.executor_instances
+
+
+class ClientModeOptimizer(_YarnExecutorSizing, _DriverSizing, Freezable):
+    deploy_mode = DeployMode.CLIENT
+
+    def __init__(
+        self,
+        executor_instance: Instance,
+        num_nodes: int,
+        driver_instance: Optional[Instance] = None,
+        executor_cores_range: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        vars(self).update(
+            core_per_node=executor_instance.num_cores,
+            memory_per_node=executor_instance.memory_size,
+            num_nodes=num_nodes,
+            executor_cores_range=executor_cores_range,
+            driver_instance=(
+                executor_instance
+                if driver_instance is None
+                else driver_instance
+            ),
+        )
+        self.valid()
+
+    @property
+    def executor_instances(self) -> int:
+        return self.executor_per_node * self.num_nodes
+
+    def valid(self) -> None:
+        pass
+
+
+@dataclass(frozen=True)
+class KubernetesConf:
+    """Node reservations and overhead of Spark on Kubernetes
+
+    Reserved resources are per node resources which can not be requested by
+    executor pods, like kube-reserved, system-reserved, eviction threshold
+    and daemonsets.
+
+    Args:
+        reserved_cores (float, optional): Reserved cores per node.
+            Defaults to 0.5.
+        reserved_memory (float, optional): Reserved memory GB per node.
+            Defaults to 2.0.
+        memory_overhead_factor (float, optional):
+            'spark.kubernetes.memoryOverheadFactor', fraction of pod memory
+            to heap for non-heap memory. Defaults to 0.1.
+    """
+
+    reserved_cores: float = 0.5
+    reserved_memory: float = 2.0
+    memory_overhead_factor: float = 0.1
+
+    def __post_init__(self) -> None:
+        if self.reserved_cores < 0.0 or self.reserved_memory < 0.0:
+            raise ValueError(
+                'reserved_cores and reserved_memory must be 0 or more, '
+                f'but actually {self.reserved_cores}, '
+                f'{self.reserved_memory}'
+            )
+        if not 0.0 < self.memory_overhead_factor < 1.0:
+            raise ValueError(
+                'memory_overhead_factor must be between 0 and 1, '
+                f'but actually {self.memory_overhead_factor}'
+            )
+
+
+class KubernetesOptimizer(Freezable):
+    """Optimizer for executor pods on Kubernetes nodes
+
+    Unlike YARN, no core and memory are kept for hadoop daemon but
+    resources reserved by KubernetesConf. As many executor pods as fit are
+    packed on each node, and allocatable cores and memory of a node are
+    divided evenly to the pods. Driver pod takes one executor pod slot like
+    cluster mode.
+
+    Args:
+        executor_instance (Instance): Instance for executor nodes.
+        num_nodes (int): Number of nodes.
+        conf (Optional[KubernetesConf], optional): Reservations and
+            overhead. Defaults to None, which means KubernetesConf().
+    """
+
+    conf: KubernetesConf
+    allocatable_cores: float
+    allocatable_memory: float
+    num_nodes: int
+
+    def __init__(
+        self,
+        executor_instance: Instance,
+        num_nodes: int,
+        conf: Optional[KubernetesConf] = None,
+    ) -> None:
+        if conf is None:
+            conf = KubernetesConf()
+        vars(self).update(
+            conf=conf,
+            allocatable_cores=executor_instance.num_cores
+            - conf.reserved_cores,
+            allocatable_memory=executor_instance.memory_size
+            - conf.reserved_memory,
+            num_nodes=num_nodes,
+        )
+        self.valid()
+
+    @cached_property
+    def executor_cores(self) -> int:
+        if self.allocatable_cores < 1:
+            raise ValueError(
+                'Can not reserve cpu cores for executor pod. '
+                'You shuld scale up instance size or reduce reserved cores.'
+            )
+        return min(math.floor(self.allocatable_cores), 5)
+
+    @cached_property
+    def executor_per_node(self) -> int:
+        return math.floor(self.allocatable_cores / self.executor_cores)
+
+    @cached_property
+    def request_cores(self) -> str:
+        # pods share allocatable cores evenly, in millicores
+        millicores = math.floor(
+            self.allocatable_cores * 1000 / self.executor_per_node
+        )
+        return f'{millicores}m'
+
+    @cached_property
+    def limit_cores(self) -> int:
+        return math.ceil(self.allocatable_cores / self.executor_per_node)
+
+    @cached_property
+    def total_executor_memory(self) -> int:
+        memory = math.floor(self.allocatable_memory / self.executor_per_node)
+        if memory < 1:
+            raise ValueError(
+                'Can not reserve memory for executor pod. '
+                'You shuld scale up instance size or reduce reserved memory.'
+            )
+        return memory
+
+    @cached_property
+    def executor_memory(self) -> int:
+        # pod memory is heap * (1 + memoryOverheadFactor)
+        return math.floor(
+            self.total_executor_memory
+            / (1 + self.conf.memory_overhead_factor)
+        )
+
+    @cached_property
+    def executor_memory_overhead(self) -> int:
+        return self.total_executor_memory - self.executor_memory
+
+    @cached_property
+    def driver_cores(self) -> int:
+        return self.executor_cores
+
+    @cached_property
+    def driver_memory(self) -> int:
+        return self.executor_memory
+
+    @cached_property
+    def driver_memory_overhead(self) -> int:
+        return self.executor_memory_overhead
+
+    @cached_property
+    def executor_instances(self) -> int:
+        # one pod for driver
+        executor_instances = self.executor_per_node * self.num_nodes - 1
+        if executor_instances < 1:
+            raise ValueError(
+                'Can not reserve cpu cores for executor. '
+                'You shuld scale up instance size or increase number of nodes.'
+            )
+        return executor_instances
+
+    @cached_property
+    def default_parallelism(self) -> int:
+        return self.executor_instances * self.executor_cores * 2
+
+    @cached_property
+    def sql_shuffle_partitions(self) -> int:
+        return self.default_parallelism
+
+    @cached_property
+    def total_executor_memory_mb(self) -> int:
+        return math.floor(
+            self.allocatable_memory * 1024 / self.executor_per_node
+        )
+
+    @cached_property
+    def total_driver_memory_mb(self) -> int:
+        return self.total_executor_memory_mb
+
+    def valid(self) -> None:
+        self.total_executor_memory
+        self.executor_instances
+
+    def as_dict(self) -> Dict[str, Union[int, str]]:
+        """Return Kubernetes specific Spark properties"""
+
+        return {
+            'spark.kubernetes.driver.request.cores': self.request_cores,
+            'spark.kubernetes.driver.limit.cores': self.limit_cores,
+            'spark.kubernetes.executor.request.cores': self.request_cores,
+            'spark.kubernetes.executor.limit.cores': self.limit_cores,
+            'spark.kubernetes.memoryOverheadFactor': str(
+                self.conf.memory_overhead_factor
+            ),
+        }
+
+
+class GpuOptimizer(_DriverSizing, Freezable):
+    """Optimizer for YARN nodes with GPUs
+
+    One executor is placed for each GPU, so that every GPU is used, and CPU
+    cores and memory of a node are divided to the executors. Tasks of an
+    executor share the GPU.
+
+    Args:
+        executor_instance (Instance): Instance with GPUs for executor.
+        num_nodes (int): Number of nodes.
+        deploy_mode (DeployMode, optional): Spark deploy mode.
+            Defaults to DeployMode.CLIENT.
+        driver_instance (Optional[Instance], optional): Instance for driver
+            in client mode. If not be specified, executor_instance is used.
+            Defaults to None.
+    """
+
+    core_per_node: int
+    memory_per_node: float
+    num_gpus: int
+    gpu_memory: float
+    num_nodes: int
+    deploy_mode: DeployMode
+    driver_instance: Instance
+
+    def __init__(
+        self,
+        executor_instance: Instance,
+        num_nodes: int,
+        deploy_mode: DeployMode = DeployMode.CLIENT,
+        driver_instance: Optional[Instance] = None,
+    ) -> None:
+        if executor_instance.num_gpus < 1:
+            raise ValueError(f'{executor_instance} does not have GPU')
+        vars(self).update(
+            core_per_node=executor_instance.num_cores,
+            memory_per_node=executor_instance.memory_size,
+            num_gpus=executor_instance.num_gpus,
+            gpu_memory=executor_instance.gpu_memory,
+            num_nodes=num_nodes,
+            deploy_mode=deploy_mode,
+            driver_instance=(
+                executor_instance
+                if driver_instance is None
+                else driver_instance
+            ),
+        )
+        self.valid()
+
+    @cached_property
+    def executor_per_node(self) -> int:
+        return self.num_gpus
+
+    @cached_property
+    def executor_cores(self) -> int:
+        # one core for hadoop daemon
+        return max(
+            math.floor((self.core_per_node - 1) / self.executor_per_node), 1
+        )
+
+    @cached_property
+    def total_executor_memory(self) -> int:
+        # 1GB for hadoop daemon
+        return math.floor((self.memory_per_node - 1) / self.executor_per_node)
+
+    @cached_property
+    def executor_memory(self) -> int:
+        return math.floor(self.total_executor_memory * 0.9)
+
+    @cached_property
+    def executor_memory_overhead(self) -> int:
+        return math.ceil(self.total_executor_memory * 0.1)
+
+    @cached_property
+    def executor_instances(self) -> int:
+        executor_instances = self.executor_per_node * self.num_nodes
+        if self.deploy_mode == DeployMode.CLUSTER:
+            # one instance for driver
+            executor_instances -= 1
+        if executor_instances < 1:
+            raise ValueError(
+                'Can not reserve GPU for executor. '
+                'You shuld scale up instance size or increase number of nodes.'
+            )
+        return executor_instances
+
+    @cached_property
+    def task_gpu_amount(self) -> str:
+        # rounded down, Spark runs int(1 / amount) tasks on a GPU
+        return str(math.floor(10000 / self.executor_cores) / 10000)
+
+    @cached_property
+    def concurrent_gpu_tasks(self) -> int:
+        # about 8GB of GPU memory for each concurrent task
+        return min(max(math.floor(self.gpu_memory / 8), 1), 4)
+
+    @cached_property
+    def default_parallelism(self) -> int:
+        return self.executor_instances * self.executor_cores * 2
+
+    @cached_property
+    def sql_shuffle_partitions(self) -> int:
+        return self.default_parallelism
+
+    @cached_property
+    def total_executor_memory_mb(self) -> int:
+        return _yarn_container_mb(self.memory_per_node, self.executor_per_node)
+
+    def valid(self) -> None:
+        self.executor_instances
+
+    def as_dict(self) -> Dict[str, Union[int, str]]:
+        """Return GPU resource scheduling Spark properties"""
+
+        return {
+            'spark.executor.resource.gpu.amount': 1,
+            'spark.task.resource.gpu.amount': self.task_gpu_amount,
+            'spark.task.cpus': 1,
+            'spark.rapids.sql.concurrentGpuTasks': self.concurrent_gpu_tasks,
+        }
+
+
+class FleetUsage(NamedTuple):
+    """Executors and wasted resources on nodes of an instance type in fleet
+
+    Wasted cores and memory are node resources which are neither reserved
+    for hadoop daemon nor allocated to executors, summed over num_nodes.
+    """
+
+    instance: Instance
+    num_nodes: int
+    executor_per_node: int
+    wasted_cores: int
+    wasted_memory: float
+
+
+class FleetOptimizer(_DriverSizing, Freezable):
+    """Optimizer for executor nodes of mixed instance types
+
+    One executor shape is used on every node. Executor cores follow the rule
+    of single instance type for the smallest cores in fleet, and executor
+    memory is chosen to allocate the most cores and memory of the whole
+    fleet.
+
+    Args:
+        fleet (Fleet): Pairs of Instance and number of nodes.
+        deploy_mode (DeployMode, optional): Spark deploy mode.
+            Defaults to DeployMode.CLIENT.
+        driver_instance (Optional[Instance], optional): Instance for driver
+            in client mode. If not be specified, the first instance in fleet
+            is used. Defaults to None.
+    """
+
+    fleet: Tuple[Tuple[Instance, int], ...]
+    num_nodes: int
+    deploy_mode: DeployMode
+    driver_instance: Instance
+
+    def __init__(
+        self,
+        fleet: Fleet,
+        deploy_mode: DeployMode = DeployMode.CLIENT,
+        driver_instance: Optional[Instance] = None,
+    ) -> None:
+        pairs = tuple((instance, count) for instance, count in fleet)
+        if not pairs:
+            raise ValueError('fleet must have at least one instance')
+        for instance, count in pairs:
+            if count < 1:
+                raise ValueError(
+                    f'Number of {instance} must be more than 1, '
+                    f'but actually {count}'
+                )
+        vars(self).update(
+            fleet=pairs,
+            num_nodes=sum(count for _, count in pairs),
+            deploy_mode=deploy_mode,
+            driver_instance=(
+                pairs[0][0] if driver_instance is None else driver_instance
+            ),
+        )
+        self.valid()
+
+    @cached_property
+    def executor_cores(self) -> int:
+        core_per_node = min(instance.num_cores for instance, _ in self.fleet)
+        return 5 if core_per_node > 5 else max(core_per_node - 1, 1)
+
+    @cached_property
+    def total_executor_memory(self) -> int:
+        # executor memory fitting on every node once
+        largest = min(
+            math.floor(instance.memory_size - 1) for instance, _ in self.fleet
+        )
+        if largest < 1:
+            raise ValueError(
+                'Can not reserve memory for executor. '
+                'You shuld scale up instance size.'
+            )
+        # memory dividing node memory of any type without remainder
+        candidates = {
+            math.floor((instance.memory_size - 1) / k)
+            for instance, _ in self.fleet
+            for k in range(1, self._executor_per_node(instance, 1) + 1)
+        }
+        return max(
+            (m for m in candidates if 1 <= m <= largest),
+            key=lambda m: (self._utilization(m), m),
+        )
+
+    @cached_property
+    def usage(self) -> Tuple[FleetUsage, ...]:
+        memory = self.total_executor_memory
+        usage = []
+        for instance, count in self.fleet:
+            per_node = self._executor_per_node(instance, memory)
+            # one core and 1GB for hadoop daemon
+            wasted_cores = max(
+                instance.num_cores - 1 - per_node * self.executor_cores, 0
+            )
+            wasted_memory = max(
+                instance.memory_size - 1 - per_node * memory, 0
+            )
+            usage.append(
+                FleetUsage(
+                    instance,
+                    count,
+                    per_node,
+                    wasted_cores * count,
+                    wasted_memory * count,
+                )
+            )
+        # tuple, which callers sharing a frozen optimizer can not change
+        return tuple(usage)
+
+    @cached_property
+    def executor_per_node(self) -> int:
+        # the fewest executors on a node
+        return min(u.executor_per_node for u in self.usage)
+
+    @cached_property
+    def executor_memory(self) -> int:
+        return math.floor(self.total_executor_memory * 0.9)
+
+    @cached_property
+    def executor_memory_overhead(self) -> int:
+        return math.ceil(self.total_executor_memory * 0.1)
+
+    @cached_property
+    def executor_instances(self) -> int:
+        executor_instances = sum(
+            u.executor_per_node * u.num_nodes for u in self.usage
+        )
+        if self.deploy_mode == DeployMode.CLUSTER:
+            # one instance for driver
+            executor_instances -= 1
+        if executor_instances < 1:
+            raise ValueError(
+                'Can not reserve cpu cores for executor. '
+                'You shuld scale up instance size or increase number of nodes.'
+            )
+        return executor_instances
+
+    @cached_property
+    def default_parallelism(self) -> int:
+        return self.executor_instances * self.executor_cores * 2
+
+    @cached_property
+    def sql_shuffle_partitions(self) -> int:
+        return self.default_parallelism
+
+    @cached_property
+    def total_executor_memory_mb(self) -> int:
+        # container fitting on nodes of every type
+        return min(
+            _yarn_container_mb(u.instance.memory_size, u.executor_per_node)
+            for u in self.usage
+        )
+
+    def valid(self) -> None:
+        self.executor_instances
+
+    def _executor_per_node(self, instance: Instance, memory: int) -> int:
+        # one core and 1GB for hadoop daemon
+        by_cores = max(
+            math.floor((instance.num_cores - 1) / self.executor_cores), 1
+        )
+        return min(by_cores, math.floor((instance.memory_size - 1) / memory))
+
+    def _utilization(self, memory: int) -> float:
+        # mean of core and memory utilization weighted by number of nodes
+        utilization = 0.0
+        for instance, count in self.fleet:
+            per_node = self._executor_per_node(instance, memory)
+            cores = per_node * self.executor_cores / max(
+                instance.num_cores - 1, 1
+            )
+            utilization += count * (
+                cores + per_node * memory / (instance.memory_size - 1)
+            )
+        return utilization
+
+
+class ResolvedConf(NamedTuple):
+    """Values of Optimizer evaluated once
+
+    Memory values are GB.
+    """
+
+    executor_cores: int
+    executor_per_node: int
+    total_executor_memory: int
+    executor_memory: int
+    executor_memory_overhead: int
+    driver_cores: int
+    driver_memory: int
+    driver_memory_overhead: int
+    executor_instances: int
+    default_parallelism: int
+    sql_shuffle_partitions: int
+    executor_off_heap_memory: int = 0
+    executor_pyspark_memory: int = 0
+
+    @classmethod
+    def from_optimizer(cls, optimizer: Optimizer) -> 'ResolvedConf':
+        return cls(
+            optimizer.executor_cores,
+            optimizer.executor_per_node,
+            optimizer.total_executor_memory,
+            optimizer.executor_memory,
+            optimizer.executor_memory_overhead,
+            optimizer.driver_cores,
+            optimizer.driver_memory,
+            optimizer.driver_memory_overhead,
+            optimizer.executor_instances,
+            optimizer.default_parallelism,
+            optimizer.sql_shuffle_partitions,
+        )
+
+
+class Sizing(NamedTuple):
+    """A value with the rule, operands and limit which sized it
+
+    Sizing functions like `adaptive_sizing` return them, and values are
+    taken from them, so that `scopt.explain` shows how values were sized
+    without sizing again.
+
+    Args:
+        value (Any): Sized value, like a Spark property value.
+        rule (str): Rule sizing the value, like 'fetch latency'.
+        formula (str): Arithmetic of the rule, into which operands are
+            formatted by `str.format`.
+        operands (Tuple[Any, ...]): Operands of formula.
+        limit (Optional[str], optional): Limit which bound the value, like
+            'network' or 'cap'. None when no limits are compared.
+            Defaults to None.
+    """
+
+    value: Any
+    rule: str
+    formula: str
+    operands: Tuple[Any, ...]
+    limit: Optional[str] = None
+
+
+class MemoryMb(NamedTuple):
+    """Container, heap and overhead MB of executor and driver
+
+    Containers are the memory sized to MB of `Optimizer`, and heap and
+    overhead are split from them by `split_memory_mb`, or executor's by
+    `WorkloadProfile` with off-heap.
+    """
+
+    total_executor_memory: int
+    executor_memory: int
+    executor_memory_overhead: int
+    total_driver_memory: int
+    driver_memory: int
+    driver_memory_overhead: int
+    executor_off_heap_memory: int = 0
+
+
+def _heap_mb(total: int, overhead_factor: float) -> Sizing:
+    by_factor = math.floor(total / (1 + overhead_factor))
+    heap = min(by_factor, total - MIN_MEMORY_OVERHEAD_MB)
+    if heap < 1:
+        raise ValueError(
+            f'Can not reserve {MIN_MEMORY_OVERHEAD_MB}m overhead and heap '
+            f'from {total}m memory'
+        )
+    return Sizing(
+        heap,
+        'overhead rule',
+        'min(floor({0} / (1 + {1})), {0} - {2})',
+        (total, overhead_factor, MIN_MEMORY_OVERHEAD_MB),
+        'overhead factor' if heap == by_factor else 'minimum overhead',
+    )
+
+
+def split_memory_mb(
+    total: int, overhead_factor: float = 0.1
+) -> Tuple[int, int]:
+    """Return heap and overhead MB of a container
+
+    Overhead is Spark's rule max(overhead_factor * heap, 384MB), and heap is
+    the largest with which heap and overhead fit in the container.
+
+    Args:
+        total (int): Container memory MB.
+        overhead_factor (float, optional): Overhead factor to heap.
+            Defaults to 0.1.
+
+    Raises:
+        ValueError: When container can not have minimum overhead and heap.
+
+    Returns:
+        Tuple[int, int]: Heap and overhead MB
+    """
+
+    heap = _heap_mb(total, overhead_factor).value
+    return heap, total - heap
+
+
+def _profile_memory_mb(
+    total: int, profile: WorkloadProfile
+) -> Tuple[Sizing, Sizing]:
+    # same as split_memory, but overhead is kept Spark's minimum
+    off_heap = math.floor(total * profile.off_heap_fraction)
+    by_fraction = math.floor(total * profile.heap_fraction)
+    heap = min(by_fraction, total - off_heap - MIN_MEMORY_OVERHEAD_MB)
+    if heap < 1:
+        raise ValueError(
+            f'Can not reserve {MIN_MEMORY_OVERHEAD_MB}m overhead, '
+            f'{off_heap}m off-heap and heap from {total}m memory'
+        )
+    return (
+        Sizing(
+            heap,
+            'profile heap',
+            'min(floor({0} * {1}), {0} - {2} - {3})',
+            (total, profile.heap_fraction, off_heap, MIN_MEMORY_OVERHEAD_MB),
+            'profile' if heap == by_fraction else 'minimum overhead',
+        ),
+        Sizing(
+            off_heap,
+            'profile off-heap',
+            'floor({0} * {1})',
+            (total, profile.off_heap_fraction),
+        ),
+    )
+
+
+def memory_mb_sizing(
+    total: int,
+    total_driver: int,
+    overhead_factor: float = 0.1,
+    profile: Optional[WorkloadProfile] = None,
+    pyspark_memory: int = 0,
+) -> Dict[str, Sizing]:
+    """Return sizing of heap and overhead MB of executor and driver
+
+    Containers are split by `split_memory_mb`, or executor's into heap,
+    off-heap and overhead by profile instead. Python worker memory is
+    reserved from executor heap same as `reserve_pyspark_memory`. Driver is
+    not larger than executor.
+
+    Args:
+        total (int): Executor container MB.
+        total_driver (int): Driver container MB.
+        overhead_factor (float, optional): Overhead factor to heap.
+            Defaults to 0.1.
+        profile (Optional[WorkloadProfile], optional): Workload profile.
+            Defaults to None.
+        pyspark_memory (int, optional): Python worker memory GB of an
+            executor, `executor_pyspark_memory` of ResolvedConf.
+            Defaults to 0.
+
+    Raises:
+        ValueError: When a container can not have minimum overhead and heap,
+            or heap is not left for python workers.
+
+    Returns:
+        Dict[str, Sizing]: Sizing by name of MemoryMb field
+    """
+
+    if profile is None:
+        heap = _heap_mb(total, overhead_factor)
+        overhead = total - heap.value
+        sizing = {
+            'executor_memory': heap,
+            'executor_memory_overhead': Sizing(
+                overhead, 'overhead rule', '{0} - {1}', (total, heap.value)
+            ),
+        }
+    else:
+        heap, off_heap = _profile_memory_mb(total, profile)
+        overhead = total - heap.value - off_heap.value
+        sizing = {
+            'executor_memory': heap,
+            'executor_off_heap_memory': off_heap,
+            'executor_memory_overhead': Sizing(
+                overhead,
+                'profile overhead',
+                '{0} - {1} - {2}',
+                (total, heap.value, off_heap.value),
+            ),
+        }
+    if pyspark_memory > 0:
+        # python workers run in the container beside heap
+        if heap.value - pyspark_memory * 1024 < 1:
+            raise ValueError(
+                f'Can not reserve {pyspark_memory}g for python workers '
+                f'from {heap.value}m executor heap'
+            )
+        sizing['executor_memory'] = Sizing(
+            heap.value - pyspark_memory * 1024,
+            'python worker per core',
+            f'{heap.formula} - {{{len(heap.operands)}}} * 1024',
+            (*heap.operands, pyspark_memory),
+            heap.limit,
+        )
+    # driver is not larger than executor same as GB sizing
+    driver = _heap_mb(total_driver, overhead_factor)
+    smaller = driver.value < heap.value
+    sizing['driver_memory'] = Sizing(
+        min(driver.value, heap.value),
+        driver.rule,
+        f'min({driver.formula}, {{3}})',
+        (*driver.operands, heap.value),
+        'driver instance' if smaller else 'executor',
+    )
+    smaller = total_driver - driver.value < overhead
+    sizing['driver_memory_overhead'] = Sizing(
+        min(total_driver - driver.value, overhead),
+        driver.rule,
+        'min({0} - {1}, {2})',
+        (total_driver, driver.value, overhead),
+        'driver instance' if smaller else 'executor',
+    )
+    return sizing
+
+
+def overhead_factor(optimizer: Optimizer) -> float:
+    """Return overhead factor to heap of optimizer
+
+    Args:
+        optimizer (Optimizer): Optimizer whose values are resolved.
+
+    Returns:
+        float: 'spark.kubernetes.memoryOverheadFactor' on Kubernetes, or
+            Spark's 0.1
+    """
+
+    if isinstance(optimizer, KubernetesOptimizer):
+        return optimizer.conf.memory_overhead_factor
+    return 0.1
+
+
+def resolve_memory_mb(
+    optimizer: Optimizer,
+    profile: Optional[WorkloadProfile] = None,
+    pyspark_memory: int = 0,
+) -> MemoryMb:
+    """Return MB memory of executor and driver of optimizer
+
+    Containers are `total_executor_memory_mb` and `total_driver_memory_mb`
+    of optimizer, and split by `memory_mb_sizing` with the overhead factor
+    of optimizer.
+
+    Args:
+        optimizer (Optimizer): Optimizer whose values are resolved.
+        profile (Optional[WorkloadProfile], optional): Workload profile.
+            Defaults to None.
+        pyspark_memory (int, optional): Python worker memory GB of an
+            executor, `executor_pyspark_memory` of ResolvedConf.
+            Defaults to 0.
+
+    Raises:
+        ValueError: When a container can not have minimum overhead and heap,
+            or heap is not left for python workers.
+
+    Returns:
+        MemoryMb: Container, heap and overhead MB
+    """
+
+    total = optimizer.total_executor_memory_mb
+    total_driver = optimizer.total_driver_memory_mb
+    sizing = memory_mb_sizing(
+        total,
+        total_driver,
+        overhead_factor(optimizer),
+        profile,
+        pyspark_memory,
+    )
+    return MemoryMb(
+        total_executor_memory=total,
+        total_driver_memory=total_driver,
+        **{name: s.value for name, s in sizing.items()},
+    )
+
+
+def get_optimizer(
+    executor_instance: Union[Instance, Fleet],
+    num_nodes: int,
+    deploy_mode: DeployMode,
+    driver_instance: Optional[Instance] = None,
+    kubernetes: Optional[KubernetesConf] = None,
+    executor_cores_range: Optional[Tuple[int, int]] = None,
+    gpu: bool = False,
+) -> Optimizer:
+    if deploy_mode != DeployMode.CLIENT and driver_instance is not None:
+        raise ValueError('driver_instance can be specified only client_mode')
+    if deploy_mode != DeployMode.KUBERNETES and kubernetes is not None:
+        raise ValueError('kubernetes can be specified only kubernetes mode')
+
+    if executor_cores_range is not None and (
+        deploy_mode == DeployMode.KUBERNETES
+        or not isinstance(executor_instance, Instance)
+    ):
+        raise ValueError(
+            'executor_cores_range can be specified only for an Instance in '
+            'client or cluster mode'
+        )
+
+    if gpu:
+        if (
+            deploy_mode == DeployMode.KUBERNETES
+            or not isinstance(executor_instance, Instance)
+            or executor_cores_range is not None
+        ):
+            raise ValueError(
+                'gpu can be specified only for an Instance in client or '
+                'cluster mode without executor_cores_range'
+            )
+        return GpuOptimizer(
+            executor_instance, num_nodes, deploy_mode, driver_instance
+        )
+    if deploy_mode == DeployMode.KUBERNETES:
+        if not isinstance(executor_instance, Instance):
+            raise ValueError('fleet is not supported in kubernetes mode')
+        return KubernetesOptimizer(executor_instance, num_nodes, kubernetes)
+    if not isinstance(executor_instance, Instance):
+        # number of nodes is given in fleet
+        return FleetOptimizer(executor_instance, deploy_mode, driver_instance)
+
+    if deploy_mode == DeployMode.CLUSTER:
+        return ClusterModeOptimizer(
+            executor_instance, num_nodes, executor_cores_range
+        )
+    return ClientModeOptimizer(
+        executor_instance, num_nodes, driver_instance, executor_cores_range
+    )
+
+
+def partitions_for_size(
+    size: float, partition_size: float, total_cores: int, name: str = 'size'
+) -> int:
+    """Return number of partitions for data size
+
+    Number of partitions is rounded up to a multiple of total_cores, so that
+    every wave of tasks uses all executor cores.
+
+    Args:
+        size (float): Data size (GB).
+        partition_size (float): Target partition size (GB).
+        total_cores (int): Total number of executor cores.
+        name (str, optional): Name of size used in error message.
+            Defaults to 'size'.
+
+    Raises:
+        ValueError: When size is not positive.
+
+    Returns:
+        int: Number of partitions
+    """
+
+    if size <= 0:
+        raise ValueError(f'{name} must be more than 0, but actually {size}')
+    waves = math.ceil(math.ceil(size / partition_size) / total_cores)
+    return waves * total_cores
+
+
+def split_memory(
+    resolved: ResolvedConf, profile: WorkloadProfile
+) -> ResolvedConf:
+    """Re-split total executor memory by a workload profile
+
+    Container size is kept, and overhead takes the rest of heap and
+    off-heap.
+
+    Args:
+        resolved (ResolvedConf): Values resolved by an optimizer.
+        profile (WorkloadProfile): Workload profile.
 
+    Returns:
+        ResolvedConf: Values with heap, off-heap and overhead of the profile
+    """
 
-@unique
-class DeployMode(Enum):
-    CLIENT = 'client'
-    CLUSTER = 'cluster'
+    total = resolved.total_executor_memory
+    heap = math.floor(total * profile.heap_fraction)
+    off_heap = math.floor(total * profile.off_heap_fraction)
+    return resolved._replace(
+        executor_memory=heap,
+        executor_off_heap_memory=off_heap,
+        executor_memory_overhead=total - heap - off_heap,
+    )
 
 
-class Optimizer(Protocol):
-    @property
-    def executor_cores(self) -> int:
-        ...
+def reserve_pyspark_memory(resolved: ResolvedConf) -> ResolvedConf:
+    """Reserve memory of python workers from heap
 
-    @property
-    def executor_per_node(self) -> int:
-        ...
+    A python worker runs for each executor core, and each gets
+    PYSPARK_MEMORY_FRACTION of total executor memory divided by cores.
 
-    @property
-    def total_executor_memory(self) -> int:
-        ...
+    Args:
+        resolved (ResolvedConf): Values resolved by an optimizer.
 
-    @property
-    def executor_memory(self) -> int:
-        ...
+    Raises:
+        ValueError: When heap is not left.
 
-    @property
-    def executor_memory_overhead(self) -> int:
-        ...
+    Returns:
+        ResolvedConf: Values with python worker memory and shrunk heap
+    """
 
-    @property
-    def driver_cores(self) -> int:
-        ...
+    per_core = max(
+        math.floor(
+            resolved.total_executor_memory
+            * PYSPARK_MEMORY_FRACTION
+            / resolved.executor_cores
+        ),
+        1,
+    )
+    pyspark_memory = per_core * resolved.executor_cores
+    heap = resolved.executor_memory - pyspark_memory
+    if heap < 1:
+        raise ValueError(
+            f'Can not reserve {pyspark_memory}g for python workers from '
+            f'{resolved.total_executor_memory}g executor memory'
+        )
+    return resolved._replace(
+        executor_memory=heap, executor_pyspark_memory=pyspark_memory
+    )
+
+
+def _resource_conf(
+    resolved: ResolvedConf, memory_mb: Optional[MemoryMb]
+) -> Dict[str, Union[int, str]]:
+    # memory is MB when sized by MB
+    memory: Union[ResolvedConf, MemoryMb] = resolved
+    unit = 'g'
+    if memory_mb is not None:
+        memory, unit = memory_mb, 'm'
+    # Explicit type hint to avoid mypy error
+    conf: Dict[str, Union[int, str]] = {
+        'spark.driver.cores': resolved.driver_cores,
+        'spark.driver.memory': f'{memory.driver_memory}{unit}',
+        'spark.driver.memoryOverhead': f'{memory.driver_memory_overhead}{unit}',  # noqa: E501
+        'spark.executor.cores': resolved.executor_cores,
+        'spark.executor.memory': f'{memory.executor_memory}{unit}',
+        'spark.executor.memoryOverhead': f'{memory.executor_memory_overhead}{unit}',  # noqa: E501
+    }
+    return conf
+
+
+def _off_heap_conf(
+    resolved: ResolvedConf, memory_mb: Optional[MemoryMb]
+) -> Dict[str, Union[int, str]]:
+    off_heap, unit = resolved.executor_off_heap_memory, 'g'
+    if memory_mb is not None:
+        off_heap, unit = memory_mb.executor_off_heap_memory, 'm'
+    if off_heap <= 0:
+        return {}
+    return {
+        'spark.memory.offHeap.enabled': 'true',
+        'spark.memory.offHeap.size': f'{off_heap}{unit}',
+    }
+
+
+def arrow_sizing(resolved: ResolvedConf) -> Sizing:
+    """Return sizing of records of an arrow batch fitting in a python worker
 
-    @property
-    def driver_memory(self) -> int:
-        ...
+    Args:
+        resolved (ResolvedConf): Values with python worker memory.
 
-    @property
-    def driver_memory_overhead(self) -> int:
-        ...
+    Returns:
+        Sizing: Records in a multiple of 1000, 1000 at least
+    """
 
-    @property
-    def executor_instances(self) -> int:
-        ...
+    worker_memory = resolved.executor_pyspark_memory / resolved.executor_cores
+    # a batch is copied between JVM, arrow and pandas and some are in flight
+    records = math.floor(
+        worker_memory * 1024**3 / ARROW_BATCH_COPIES / ARROW_RECORD_SIZE
+    )
+    return Sizing(
+        max(records // 1000 * 1000, 1000),
+        'batch copies per python worker',
+        'max(floor({0} / {1} * 1024**3 / {2} / {3}) // 1000 * 1000, 1000)',
+        (
+            resolved.executor_pyspark_memory,
+            resolved.executor_cores,
+            ARROW_BATCH_COPIES,
+            ARROW_RECORD_SIZE,
+        ),
+        'minimum' if records < 1000 else 'pyspark memory',
+    )
+
+
+def arrow_max_records(resolved: ResolvedConf) -> int:
+    """Return records of an arrow batch fitting in a python worker
 
-    @property
-    def default_parallelism(self) -> int:
-        ...
+    Args:
+        resolved (ResolvedConf): Values with python worker memory.
 
-    @property
-    def sql_shuffle_partitions(self) -> int:
-        ...
+    Returns:
+        int: Records in a multiple of 1000, 1000 at least
+    """
 
+    records: int = arrow_sizing(resolved).value
+    return records
 
-class ClusterModeOptimizer:
-    def __init__(
-        self,
-        executor_instance: Instance,
-        num_nodes: int,
-    ) -> None:
-        self.core_per_node = executor_instance.num_cores
-        self.memory_per_node = executor_instance.memory_size
-        self.num_nodes = num_nodes
-        self.valid()
 
-    @property
-    def executor_cores(self) -> int:
-        # keep one core for hadoop daemon when core of instance less than 5
-        return 5 if self.core_per_node > 5 else max(self.core_per_node - 1, 1)
+def adaptive_sizing(
+    resolved: ResolvedConf,
+    specified_num_nodes: bool,
+    memory_mb: Optional[MemoryMb] = None,
+) -> Dict[str, Sizing]:
+    """Return sizing of Adaptive Query Execution properties
 
-    @property
-    def executor_per_node(self) -> int:
-        # one core for hadoop daemon
-        cpe = math.floor((self.core_per_node - 1) / self.executor_cores)
-        return cpe if cpe > 0 else 1
+    Args:
+        resolved (ResolvedConf): Values resolved by an optimizer.
+        specified_num_nodes (bool): Whether number of nodes is known, which
+            is needed for initial number of partitions.
+        memory_mb (Optional[MemoryMb], optional): MB memory, whose heap is
+            used instead of GB heap of resolved. Defaults to None.
+
+    Returns:
+        Dict[str, Sizing]: Sizing by Spark property
+    """
 
-    @property
-    def total_executor_memory(self) -> int:
-        # 1GB for hadoop daemon
-        return math.floor((self.memory_per_node - 1) / self.executor_per_node)
+    heap = resolved.executor_memory * 1024
+    if memory_mb is not None:
+        heap = memory_mb.executor_memory
+    cores = resolved.executor_cores
+    # execution and storage share spark.memory.fraction (0.6) of heap,
+    # and each running task gets 1 / executor_cores of it at least
+    task_memory = heap * 0.6 / cores
+    # leave room for decompression and deserialization of a partition
+    by_task = math.floor(task_memory / 16)
+    advisory = min(max(by_task, 64), 1024)
+    sizing = {
+        'spark.sql.adaptive.advisoryPartitionSizeInBytes': Sizing(
+            f'{advisory}m',
+            '1/16 of task memory',
+            'min(max(floor({0} * 0.6 / {1} / 16), 64), 1024)',
+            (heap, cores),
+            (
+                'minimum'
+                if by_task < 64
+                else 'cap' if by_task > 1024 else 'task memory'
+            ),
+        ),
+        'spark.sql.adaptive.coalescePartitions.minPartitionSize': Sizing(
+            f'{advisory // 8}m',
+            '1/8 of advisory size',
+            '{0} // 8',
+            (advisory,),
+        ),
+    }
+    if specified_num_nodes:
+        # start with enough partitions for four waves, AQE coalesces them
+        instances = resolved.executor_instances
+        partitions = resolved.sql_shuffle_partitions
+        by_cores = instances * cores * 4
+        key = 'spark.sql.adaptive.coalescePartitions.initialPartitionNum'
+        sizing[key] = Sizing(
+            max(partitions, by_cores),
+            'four waves',
+            'max({0}, {1} * {2} * 4)',
+            (partitions, instances, cores),
+            'cores' if by_cores >= partitions else 'shuffle partitions',
+        )
+    # partitions over four advisory ones or task memory are skewed, but not
+    # ones under advisory, or every partition is split on small nodes
+    by_memory = math.floor(task_memory)
+    threshold = max(min(advisory * 4, by_memory), advisory)
+    key = 'spark.sql.adaptive.skewJoin.skewedPartitionThresholdInBytes'
+    sizing[key] = Sizing(
+        f'{threshold}m',
+        '4 times of advisory size',
+        'max(min({0} * 4, floor({1} * 0.6 / {2})), {0})',
+        (advisory, heap, cores),
+        (
+            'minimum'
+            if by_memory < advisory
+            else 'task memory' if by_memory < advisory * 4 else None
+        ),
+    )
+    return sizing
+
+
+def adaptive_conf(
+    resolved: ResolvedConf,
+    specified_num_nodes: bool,
+    memory_mb: Optional[MemoryMb] = None,
+) -> Dict[str, Union[int, str]]:
+    """Return Adaptive Query Execution properties
 
-    @property
-    def executor_memory(self) -> int:
-        return math.floor(self.total_executor_memory * 0.9)
+    Args:
+        resolved (ResolvedConf): Values resolved by an optimizer.
+        specified_num_nodes (bool): Whether number of nodes is known, which
+            is needed for initial number of partitions.
+        memory_mb (Optional[MemoryMb], optional): MB memory, whose heap is
+            used instead of GB heap of resolved. Defaults to None.
+
+    Returns:
+        Dict[str, Union[int, str]]: Spark properties
+    """
 
-    @property
-    def executor_memory_overhead(self) -> int:
-        return math.ceil(self.total_executor_memory * 0.1)
+    conf: Dict[str, Union[int, str]] = {'spark.sql.adaptive.enabled': 'true'}
+    sizing = adaptive_sizing(resolved, specified_num_nodes, memory_mb)
+    conf.update((key, s.value) for key, s in sizing.items())
+    return conf
 
-    @property
-    def driver_cores(self) -> int:
-        return self.executor_cores
 
-    @property
-    def driver_memory(self) -> int:
-        return self.executor_memory
+def bandwidth_sizing(
+    executor_instance: Union[Instance, Fleet], optimizer: Optimizer
+) -> Sizing:
+    """Return sizing of network bandwidth (Gbps) of an executor
 
-    @property
-    def driver_memory_overhead(self) -> int:
-        return self.executor_memory_overhead
+    Args:
+        executor_instance (Union[Instance, Fleet]): Instance or fleet of
+            optimizer.
+        optimizer (Optimizer): Optimizer whose values are resolved.
 
-    @property
-    def executor_instances(self) -> int:
-        # one instance for driver
-        executor_instances = self.executor_per_node * self.num_nodes - 1
-        if executor_instances < 1:
-            raise ValueError(
-                'Can not reserve cpu cores for executor. '
-                'You shuld scale up instance size or increase number of nodes.'
-            )
-        return executor_instances
+    Raises:
+        ValueError: When bandwidth of an instance is unknown.
 
-    @property
-    def default_parallelism(self) -> int:
-        return self.executor_instances * self.executor_cores * 2
+    Returns:
+        Sizing: Bandwidth of a node divided by executors on it
+    """
 
-    @property
-    def sql_shuffle_partitions(self) -> int:
-        return self.default_parallelism
+    # executors on a node share its network, the slowest fleet type binds
+    if isinstance(optimizer, FleetOptimizer):
+        shares = [
+            (u.instance, u.executor_per_node)
+            for u in optimizer.usage
+            if u.executor_per_node > 0
+        ]
+    else:
+        assert isinstance(executor_instance, Instance)
+        shares = [(executor_instance, optimizer.executor_per_node)]
+    unknown = [i for i, _ in shares if not i.network_bandwidth > 0.0]
+    if unknown:
+        raise ValueError(
+            f'network_bandwidth of {unknown[0]} is unknown, network tuning '
+            'needs it'
+        )
+    formula = ', '.join(
+        f'{{{k * 2}}} / {{{k * 2 + 1}}}' for k in range(len(shares))
+    )
+    return Sizing(
+        min(i.network_bandwidth / n for i, n in shares),
+        'node share',
+        formula if len(shares) == 1 else f'min({formula})',
+        tuple(v for i, n in shares for v in (i.network_bandwidth, n)),
+        'network',
+    )
+
+
+def executor_bandwidth(
+    executor_instance: Union[Instance, Fleet], optimizer: Optimizer
+) -> float:
+    """Return network bandwidth (Gbps) of an executor
 
-    def valid(self) -> None:
-        self.executor_instances
+    Args:
+        executor_instance (Union[Instance, Fleet]): Instance or fleet of
+            optimizer.
+        optimizer (Optimizer): Optimizer whose values are resolved.
 
+    Raises:
+        ValueError: When bandwidth of an instance is unknown.
 
-class ClientModeOptimizer:
-    def __init__(
-        self,
-        executor_instance: Instance,
-        num_nodes: int,
-        driver_instance: Optional[Instance] = None,
-    ) -> None:
-        self.core_per_node = executor_instance.num_cores
-        self.memory_per_node = executor_instance.memory_size
-        self.num_nodes = num_nodes
-        self.driver_instance = (
-            executor_instance if driver_instance is None else driver_instance
-        )
-        self.valid()
+    Returns:
+        float: Bandwidth of a node divided by executors on it
+    """
 
-    @property
-    def executor_cores(self) -> int:
-        # keep one core for hadoop daemon when core of instance less than 5
-        return 5 if self.core_per_node > 5 else max(self.core_per_node - 1, 1)
+    bandwidth: float = bandwidth_sizing(executor_instance, optimizer).value
+    return bandwidth
 
-    @property
-    def executor_per_node(self) -> int:
-        # one core for hadoop daemon
-        cpe = math.floor((self.core_per_node - 1) / self.executor_cores)
-        return cpe if cpe > 0 else 1
 
-    @property
-    def total_executor_memory(self) -> int:
-        # 1GB for hadoop daemon
-        return math.floor((self.memory_per_node - 1) / self.executor_per_node)
+def network_sizing(
+    resolved: ResolvedConf,
+    bandwidth: float,
+    memory_mb: Optional[MemoryMb] = None,
+) -> Dict[str, Sizing]:
+    """Return sizing of shuffle fetch and network properties
 
-    @property
-    def executor_memory(self) -> int:
-        return math.floor(self.total_executor_memory * 0.9)
+    Args:
+        resolved (ResolvedConf): Values resolved by an optimizer.
+        bandwidth (float): Result of `executor_bandwidth`.
+        memory_mb (Optional[MemoryMb], optional): MB memory, whose overhead
+            is used instead of GB overhead of resolved. Defaults to None.
 
-    @property
-    def executor_memory_overhead(self) -> int:
-        return math.ceil(self.total_executor_memory * 0.1)
+    Returns:
+        Dict[str, Sizing]: Sizing by Spark property
+    """
 
-    @property
-    def driver_cores(self) -> int:
-        # one core for system resource
-        driver_cores = max(self.driver_instance.num_cores - 1, 1)
-        return min(driver_cores, self.executor_cores)
+    overhead = resolved.executor_memory_overhead * 1024
+    if memory_mb is not None:
+        overhead = memory_mb.executor_memory_overhead
+    cores = resolved.executor_cores
+    instances = resolved.executor_instances
+    # blocks arriving while a fetch request is served keep the link busy,
+    # and they are buffered in overhead memory by every running task
+    by_network = math.floor(bandwidth * 1000 / 8 * FETCH_LATENCY) // 8 * 8
+    by_overhead = math.floor(overhead / 2 / cores)
+    smallest = min(by_network, by_overhead, 256)
+    in_flight = max(smallest, 48)
+    # an outstanding request per remote executor, of 512KB at least
+    peers = max(instances - 1, 1)
+    # fewer write syscalls for map outputs arriving faster
+    file_buffer = min(32 * 2 ** max(math.floor(math.log2(bandwidth)), 0), 1024)
+    # fetches queue longer on bigger clusters and slower links
+    timeout = max(120, instances)
+    slow = bandwidth < 1.0
+    if slow:
+        timeout *= 2
+    return {
+        'spark.reducer.maxSizeInFlight': Sizing(
+            f'{in_flight}m',
+            'fetch latency',
+            'max(min(floor({0} * 1000 / 8 * {1}) // 8 * 8, '
+            'floor({2} / 2 / {3}), 256), 48)',
+            (bandwidth, FETCH_LATENCY, overhead, cores),
+            (
+                'minimum'
+                if smallest < 48
+                else (
+                    'network'
+                    if smallest == by_network
+                    else 'overhead' if smallest == by_overhead else 'cap'
+                )
+            ),
+        ),
+        'spark.reducer.maxReqsInFlight': Sizing(
+            min(peers, in_flight * 2),
+            'request per peer',
+            'min(max({0} - 1, 1), {1} * 2)',
+            (instances, in_flight),
+            'peers' if peers <= in_flight * 2 else 'size in flight',
+        ),
+        # few peers can not fill the link with one connection each
+        'spark.shuffle.io.numConnectionsPerPeer': Sizing(
+            min(
+                max(math.ceil(bandwidth / CONNECTION_BANDWIDTH / peers), 1), 8
+            ),
+            'connection bandwidth',
+            'min(max(ceil({0} / {1} / {2}), 1), 8)',
+            (bandwidth, CONNECTION_BANDWIDTH, peers),
+        ),
+        'spark.shuffle.file.buffer': Sizing(
+            f'{file_buffer}k',
+            'network',
+            'min(32 * 2 ** max(floor(log2({0})), 0), 1024)',
+            (bandwidth,),
+        ),
+        'spark.network.timeout': Sizing(
+            f'{min(timeout, 600)}s',
+            'executors',
+            (
+                'min(max(120, {0}) * 2, 600)'
+                if slow
+                else 'min(max(120, {0}), 600)'
+            ),
+            (instances,),
+        ),
+    }
+
+
+def network_conf(
+    resolved: ResolvedConf,
+    bandwidth: float,
+    memory_mb: Optional[MemoryMb] = None,
+) -> Dict[str, Union[int, str]]:
+    """Return shuffle fetch and network properties
 
-    @property
-    def total_driver_memory(self) -> int:
-        # 1GB for system resource
-        return math.floor(self.driver_instance.memory_size - 1)
+    Args:
+        resolved (ResolvedConf): Values resolved by an optimizer.
+        bandwidth (float): Result of `executor_bandwidth`.
+        memory_mb (Optional[MemoryMb], optional): MB memory, whose overhead
+            is used instead of GB overhead of resolved. Defaults to None.
 
-    @property
-    def driver_memory(self) -> int:
-        driver_memory = math.floor(self.total_driver_memory * 0.9)
-        return min(driver_memory, self.executor_memory)
+    Returns:
+        Dict[str, Union[int, str]]: Spark properties
+    """
 
-    @property
-    def driver_memory_overhead(self) -> int:
-        driver_memory_overhead = math.ceil(self.total_driver_memory * 0.1)
-        return min(driver_memory_overhead, self.executor_memory_overhead)
+    sizing = network_sizing(resolved, bandwidth, memory_mb)
+    return {key: s.value for key, s in sizing.items()}
 
-    @property
-    def executor_instances(self) -> int:
-        return self.executor_per_node * self.num_nodes
 
-    @property
-    def default_parallelism(self) -> int:
-        return self.executor_instances * self.executor_cores * 2
+def dynamic_allocation_sizing(
+    resolved: ResolvedConf,
+    num_nodes: int,
+    min_nodes: int,
+    max_nodes: Optional[int],
+) -> Dict[str, Sizing]:
+    """Return sizing of executors of dynamic allocation for a range of nodes
 
-    @property
-    def sql_shuffle_partitions(self) -> int:
-        return self.default_parallelism
+    Args:
+        resolved (ResolvedConf): Values resolved for num_nodes.
+        num_nodes (int): Number of nodes of resolved.
+        min_nodes (int): Minimum number of nodes.
+        max_nodes (Optional[int]): Maximum number of nodes, None for
+            unbounded.
+
+    Returns:
+        Dict[str, Sizing]: Sizing by Spark property
+    """
 
-    def valid(self) -> None:
-        pass
+    instances = resolved.executor_instances
+    per_node = resolved.executor_per_node
 
+    def executors(rule: str, nodes: int, formula: str = '{3}') -> Sizing:
+        # resolved is for num_nodes, cluster mode driver takes one slot
+        return Sizing(
+            max(instances - per_node * (num_nodes - nodes), 0),
+            rule,
+            f'max({{0}} - {{1}} * ({{2}} - {formula}), 0)',
+            (instances, per_node, num_nodes, min_nodes, max_nodes),
+        )
 
-def get_optimizer(
-    executor_instance: Instance,
+    sizing = {
+        'spark.dynamicAllocation.minExecutors': executors(
+            'min_nodes', min_nodes
+        ),
+    }
+    if max_nodes is None:
+        sizing['spark.dynamicAllocation.initialExecutors'] = executors(
+            'min_nodes', min_nodes
+        )
+    else:
+        # start from the middle of the range to ramp up fewer times
+        sizing['spark.dynamicAllocation.initialExecutors'] = executors(
+            'middle of nodes',
+            math.ceil((min_nodes + max_nodes) / 2),
+            'ceil(({3} + {4}) / 2)',
+        )
+        sizing['spark.dynamicAllocation.maxExecutors'] = executors(
+            'max_nodes', max_nodes, '{4}'
+        )
+    return sizing
+
+
+def dynamic_allocation_conf(
+    resolved: ResolvedConf,
     num_nodes: int,
-    deploy_mode: DeployMode,
-    driver_instance: Optional[Instance] = None,
-) -> Optimizer:
-    if deploy_mode == DeployMode.CLUSTER and driver_instance is not None:
-        raise ValueError('driver_instance can be specified only client_mode')
+    min_nodes: int,
+    max_nodes: Optional[int],
+) -> Dict[str, Union[int, str]]:
+    """Return dynamic allocation properties for a range of nodes
 
-    if deploy_mode == DeployMode.CLUSTER:
-        return ClusterModeOptimizer(executor_instance, num_nodes)
-    return ClientModeOptimizer(executor_instance, num_nodes, driver_instance)
+    Args:
+        resolved (ResolvedConf): Values resolved for num_nodes.
+        num_nodes (int): Number of nodes of resolved.
+        min_nodes (int): Minimum number of nodes.
+        max_nodes (Optional[int]): Maximum number of nodes, None for
+            unbounded.
+
+    Returns:
+        Dict[str, Union[int, str]]: Spark properties
+    """
+
+    conf: Dict[str, Union[int, str]] = {
+        'spark.dynamicAllocation.enabled': 'true'
+    }
+    sizing = dynamic_allocation_sizing(
+        resolved, num_nodes, min_nodes, max_nodes
+    )
+    conf.update((key, s.value) for key, s in sizing.items())
+    conf.update(
+        {
+            'spark.dynamicAllocation.executorAllocationRatio': '1.0',
+            'spark.dynamicAllocation.shuffleTracking.enabled': 'true',
+            # release executors keeping shuffle or cache data eventually
+            'spark.dynamicAllocation.shuffleTracking.timeout': '600s',
+            'spark.dynamicAllocation.executorIdleTimeout': '60s',
+            'spark.dynamicAllocation.cachedExecutorIdleTimeout': '600s',
+        }
+    )
+    return conf
 
 
-class SparkConfOptimizer:
+class SparkConfOptimizer(Freezable):
     """Caliculate class for optimized Spark properties
 
     Assumed instance type of driver and executor are same.
 
     Args:
-        executor_instance (Instance): Instance for executor.
+        executor_instance (Union[Instance, Fleet]): Instance for executor,
+            or list of pairs of Instance and number of nodes for a fleet of
+            mixed instance types. When fleet is given, num_nodes is sum of
+            number of nodes in fleet, and per type usage can be seen by
+            `optimizer.usage` of FleetOptimizer.
         num_nodes (int, optional): Number of Spark cluster nodes.
-            None can be accepted only when dynamic_allocation is True.
+            None can be accepted only when dynamic_allocation is True or
+            executor_instance is fleet.
             Defaults to None.
-        deploy_mode (str, optional): Spark deploy mode. 'client' or 'cluster'.
+        deploy_mode (str, optional): Spark deploy mode. 'client', 'cluster'
+            or 'kubernetes'. 'kubernetes' is cluster mode on Kubernetes,
+            which packs executor pods on nodes with KubernetesOptimizer.
             Defaults to 'client'.
         driver_instance (Optional[Instance], optional): Instance for driver.
             This can be enabled only 'client' mode. If not be specified,
@@ -243,6 +1908,69 @@ class SparkConfOptimizer:
             'spark.sql.shuffle.partitions' for when executor nodes reach to
             num_nodes, but does not return 'spark.executor.instances'.
             Defaults to False.
+        min_nodes (Optional[int], optional): Minimum number of nodes of
+            autoscaling cluster. This can be specified only when
+            dynamic_allocation is True. When min_nodes or max_nodes is
+            specified, 'spark.dynamicAllocation.*' properties are returned.
+            Defaults to None, which means 0 when max_nodes is specified.
+        max_nodes (Optional[int], optional): Maximum number of nodes of
+            autoscaling cluster. Parallelism is calculated for max_nodes,
+            so this is used as num_nodes and both can not be different.
+            Defaults to None.
+        input_size (Optional[float], optional): Estimated input data size
+            (GB). When specified, 'spark.default.parallelism' is the number
+            of partitions of partition_size rounded up to a multiple of
+            total executor cores. Defaults to None.
+        shuffle_size (Optional[float], optional): Estimated shuffle data size
+            (GB). When specified, 'spark.sql.shuffle.partitions' is
+            calculated same as input_size. Defaults to None.
+        partition_size (float, optional): Target partition size (GB).
+            Defaults to 0.125.
+        executor_cores_range (Optional[Tuple[int, int]], optional): Range
+            of executor cores like (3, 8) to be searched for the best
+            utilization of node cores and memory, instead of the fixed rule
+            of 5 cores. Searched and fixed rule utilization can be compared
+            by `optimizer.shape` and `optimizer.default_shape`.
+            Defaults to None.
+        gpu (bool, optional): Size one executor for each GPU of
+            executor_instance and return GPU resource scheduling properties.
+            Tasks of an executor share the GPU. Defaults to False.
+        kubernetes (Optional[KubernetesConf], optional): Node reservations
+            and memory overhead factor in 'kubernetes' mode.
+            Defaults to None, which means KubernetesConf().
+        profile (Optional[Union[str, WorkloadProfile]], optional): Workload
+            profile, 'etl', 'ml-cache', 'interactive' or WorkloadProfile.
+            Total executor memory is re-split into heap, off-heap and
+            overhead by the profile, and 'spark.memory.*' properties are
+            returned. Defaults to None, which splits into 90% heap and 10%
+            overhead.
+        pyspark (bool, optional): Reserve memory for python workers.
+            About 25% of total executor memory is set to
+            'spark.executor.pyspark.memory' in units of executor cores and
+            heap is shrunk by it, so that container size is unchanged.
+            'spark.sql.execution.arrow.maxRecordsPerBatch' is sized from
+            memory per python worker. Defaults to False.
+        adaptive (bool, optional): Add Adaptive Query Execution properties
+            sized from executor memory, cores and count. Advisory partition
+            size is 1/16 of execution memory per task between 64MB and
+            1GB, and skewed partition threshold is 4 times of it.
+            Defaults to False.
+        network (bool, optional): Add shuffle fetch and network properties
+            sized from network bandwidth of executor_instance shared by
+            executors on a node, and number of executors. Bandwidth of
+            instance must be known. Defaults to False.
+        memory_mb (bool, optional): Size executor and driver memory in MB
+            instead of whole GB, and return 'm' suffixed memory
+            properties. Containers are YARN memory after the daemon
+            reserve divided by executors and rounded down to a YARN
+            allocation unit of 32MB, so that they fit in
+            yarn.nodemanager.resource.memory-mb, and are split by
+            `split_memory_mb`, or executor's by profile. MB values are
+            `optimizer.memory_mb`, and `optimizer.resolved` keeps GB values.
+            With pyspark, python worker memory is still whole GB and is
+            reserved from MB executor heap. Adaptive and network
+            properties are sized from MB heap and overhead.
+            Defaults to False.
 
     ```python
     from pyspark import SparkConf
@@ -319,37 +2047,237 @@ class SparkConfOptimizer:
     spark.default.parallelism: 600
     spark.sql.shuffle.partitions: 600
     ```
+
+    When data size is estimated, parallelism follows partitions of
+    partition_size instead of core count, so that 2TB shuffle is not split
+    into only 600 partitions.
+
+    ```python
+    >>> sco = SparkConfOptimizer(
+            Instance(32, 250),
+            num_nodes=10,
+            input_size=100,
+            shuffle_size=2000,
+        )
+    >>> sco.as_dict()['spark.default.parallelism']
+    900
+    >>> sco.as_dict()['spark.sql.shuffle.partitions']
+    16200
+    ```
+
+    Executor nodes of mixed instance types are given as a fleet.
+
+    ```python
+    >>> sco = SparkConfOptimizer(
+            [(Instance(16, 128), 10), (Instance(32, 128), 5)]
+        )
+    >>> sco.as_dict()['spark.executor.instances']
+    45
+    >>> sco.optimizer.usage[1]
+    FleetUsage(
+        instance=Instance(num_cores=32, memory_size=128),
+        num_nodes=5,
+        executor_per_node=3,
+        wasted_cores=80,
+        wasted_memory=5,
+    )
+    ```
     """
 
+    executor_instance: Union[Instance, Fleet]
+    num_nodes: int
+    specified_num_nodes: bool
+    deploy_mode: DeployMode
+    driver_instance: Optional[Instance]
+    dynamic_allocation: bool
+    min_nodes: Optional[int]
+    max_nodes: Optional[int]
+    input_size: Optional[float]
+    shuffle_size: Optional[float]
+    partition_size: float
+    pyspark: bool
+    adaptive: bool
+    optimizer: Optimizer
+    profile: Optional[WorkloadProfile]
+    resolved: ResolvedConf
+    memory_mb: Optional[MemoryMb]
+    executor_bandwidth: Optional[float]
+
     def __init__(
         self,
-        executor_instance: Instance,
+        executor_instance: Union[Instance, Fleet],
         num_nodes: Optional[int] = None,
         deploy_mode: str = 'client',
         driver_instance: Optional[Instance] = None,
         dynamic_allocation: bool = False,
+        min_nodes: Optional[int] = None,
+        max_nodes: Optional[int] = None,
+        input_size: Optional[float] = None,
+        shuffle_size: Optional[float] = None,
+        partition_size: float = 0.125,
+        executor_cores_range: Optional[Tuple[int, int]] = None,
+        gpu: bool = False,
+        kubernetes: Optional[KubernetesConf] = None,
+        profile: Optional[Union[str, WorkloadProfile]] = None,
+        pyspark: bool = False,
+        adaptive: bool = False,
+        network: bool = False,
+        memory_mb: bool = False,
     ) -> None:
+        self._valid_partition_size(partition_size)
+        if not isinstance(executor_instance, Instance):
+            executor_instance = tuple((i, c) for i, c in executor_instance)
+            num_nodes = self._fleet_num_nodes(
+                executor_instance, num_nodes, min_nodes, max_nodes
+            )
+        if min_nodes is not None or max_nodes is not None:
+            num_nodes = self._valid_node_range(
+                num_nodes, min_nodes, max_nodes, dynamic_allocation
+            )
+        specified_num_nodes = num_nodes is not None
         if num_nodes is None:
             if not dynamic_allocation:
                 raise ValueError(
                     'num_nodes is required when dynamic_allocation is False'
                 )
-            self.specified_num_nodes = False
             # Optimized SparkConfi values can be calculated only num_nodes = 2
             # when dynamic allocation is enabled
             num_nodes = 2
-        else:
-            self.specified_num_nodes = True
 
-        mode = DeployMode(deploy_mode.lower())
-        self.optimizer = get_optimizer(
-            executor_instance, num_nodes, mode, driver_instance
+        mode = _DEPLOY_MODES.get(deploy_mode.lower()) or DeployMode(
+            deploy_mode.lower()
+        )
+        optimizer = get_optimizer(
+            executor_instance,
+            num_nodes,
+            mode,
+            driver_instance,
+            kubernetes,
+            executor_cores_range,
+            gpu,
+        )
+        resolved = ResolvedConf.from_optimizer(optimizer)
+        workload = None if profile is None else get_profile(profile)
+        if workload is not None:
+            resolved = split_memory(resolved, workload)
+        if pyspark:
+            resolved = reserve_pyspark_memory(resolved)
+        total_cores = resolved.executor_instances * resolved.executor_cores
+        if input_size is not None:
+            resolved = resolved._replace(
+                default_parallelism=partitions_for_size(
+                    input_size, partition_size, total_cores, 'input_size'
+                )
+            )
+        if shuffle_size is not None:
+            resolved = resolved._replace(
+                sql_shuffle_partitions=partitions_for_size(
+                    shuffle_size, partition_size, total_cores, 'shuffle_size'
+                )
+            )
+        vars(self).update(
+            specified_num_nodes=specified_num_nodes,
+            optimizer=optimizer,
+            profile=workload,
+            resolved=resolved,
+            memory_mb=(
+                resolve_memory_mb(
+                    optimizer, workload, resolved.executor_pyspark_memory
+                )
+                if memory_mb
+                else None
+            ),
+            executor_bandwidth=(
+                executor_bandwidth(executor_instance, optimizer)
+                if network
+                else None
+            ),
+            executor_instance=executor_instance,
+            num_nodes=num_nodes,
+            deploy_mode=mode,
+            driver_instance=driver_instance,
+            dynamic_allocation=dynamic_allocation,
+            min_nodes=min_nodes,
+            max_nodes=max_nodes,
+            input_size=input_size,
+            shuffle_size=shuffle_size,
+            partition_size=partition_size,
+            pyspark=pyspark,
+            adaptive=adaptive,
         )
-        self.executor_instance = executor_instance
-        self.num_nodes = num_nodes
-        self.deploy_mode = mode
-        self.driver_instance = driver_instance
-        self.dynamic_allocation = dynamic_allocation
+
+    @staticmethod
+    def _valid_partition_size(partition_size: float) -> None:
+        if partition_size <= 0:
+            raise ValueError(
+                'partition_size must be more than 0, '
+                f'but actually {partition_size}'
+            )
+
+    @staticmethod
+    def _fleet_num_nodes(
+        fleet: Fleet,
+        num_nodes: Optional[int],
+        min_nodes: Optional[int],
+        max_nodes: Optional[int],
+    ) -> int:
+        if (num_nodes, min_nodes, max_nodes) != (None, None, None):
+            raise ValueError(
+                'num_nodes, min_nodes and max_nodes can not be specified '
+                'with fleet'
+            )
+        return sum(count for _, count in fleet)
+
+    @staticmethod
+    def _valid_node_range(
+        num_nodes: Optional[int],
+        min_nodes: Optional[int],
+        max_nodes: Optional[int],
+        dynamic_allocation: bool,
+    ) -> Optional[int]:
+        if not dynamic_allocation:
+            raise ValueError(
+                'min_nodes and max_nodes can be specified only when '
+                'dynamic_allocation is True'
+            )
+        if max_nodes is None:
+            max_nodes = num_nodes
+        elif num_nodes is not None and num_nodes != max_nodes:
+            raise ValueError(
+                f'num_nodes {num_nodes} and max_nodes {max_nodes} differ'
+            )
+        if min_nodes is not None and min_nodes < 0:
+            raise ValueError(
+                f'min_nodes must be 0 or more, but actually {min_nodes}'
+            )
+        if max_nodes is not None and max_nodes < (min_nodes or 1):
+            raise ValueError(
+                f'max_nodes must be 1 or more and min_nodes {min_nodes} or '
+                f'more, but actually {max_nodes}'
+            )
+        return max_nodes
+
+    def freeze(self) -> 'SparkConfOptimizer':
+        """Make attributes read-only to share the optimizer between callers
+
+        Setting or deleting an attribute of a frozen optimizer or its
+        `optimizer` raises AttributeError, and a pickled one is still
+        frozen when loaded.
+
+        ```python
+        >>> sco = SparkConfOptimizer(Instance(32, 250), 10).freeze()
+        >>> sco.num_nodes = 20
+        AttributeError: Can not set num_nodes of frozen SparkConfOptimizer
+        ```
+
+        Returns:
+            SparkConfOptimizer: This optimizer
+        """
+
+        super().freeze()
+        # the inner optimizer is shared by callers too
+        self.optimizer.freeze()
+        return self
 
     def __str__(self) -> str:
         return '\n'.join([f'{k}: {v}' for k, v in self.as_dict().items()])
@@ -391,27 +2319,63 @@ class SparkConfOptimizer:
             </table>
         '''
 
+    def explain(self) -> 'Explanation':
+        """Return how values were resolved, by scopt.explain.explain
+
+        Returns:
+            Explanation: Steps with rule, binding limit and time, which can
+                be shown as text, HTML or dict
+        """
+
+        from scopt.explain import explain
+
+        return explain(self)
+
     def as_dict(self) -> Dict[str, Union[int, str]]:
-        # Explicit type hint to avoid mypy error
-        conf: Dict[str, Union[int, str]] = {
-            'spark.driver.cores': self.optimizer.driver_cores,
-            'spark.driver.memory': f'{self.optimizer.driver_memory}g',
-            'spark.driver.memoryOverhead': f'{self.optimizer.driver_memory_overhead}g',  # noqa: E501
-            'spark.executor.cores': self.optimizer.executor_cores,
-            'spark.executor.memory': f'{self.optimizer.executor_memory}g',
-            'spark.executor.memoryOverhead': f'{self.optimizer.executor_memory_overhead}g',  # noqa: E501
-        }
+        resolved = self.resolved
+        conf = _resource_conf(resolved, self.memory_mb)
         if not self.dynamic_allocation:
-            conf[
-                'spark.executor.instances'
-            ] = self.optimizer.executor_instances  # noqa: E501
+            conf['spark.executor.instances'] = resolved.executor_instances
+        if isinstance(self.optimizer, (KubernetesOptimizer, GpuOptimizer)):
+            conf.update(self.optimizer.as_dict())
         if self.specified_num_nodes:
-            conf[
-                'spark.default.parallelism'
-            ] = self.optimizer.default_parallelism  # noqa: E501
+            conf['spark.default.parallelism'] = resolved.default_parallelism
             conf[
                 'spark.sql.shuffle.partitions'
-            ] = self.optimizer.sql_shuffle_partitions  # noqa: E501
+            ] = resolved.sql_shuffle_partitions
+        if self.profile is not None:
+            conf['spark.memory.fraction'] = str(self.profile.memory_fraction)
+            conf['spark.memory.storageFraction'] = str(
+                self.profile.storage_fraction
+            )
+            # only profiles split off-heap memory
+            conf.update(_off_heap_conf(resolved, self.memory_mb))
+        if self.pyspark:
+            conf[
+                'spark.executor.pyspark.memory'
+            ] = f'{resolved.executor_pyspark_memory}g'
+            conf[
+                'spark.sql.execution.arrow.maxRecordsPerBatch'
+            ] = arrow_max_records(resolved)
+        if self.min_nodes is not None or self.max_nodes is not None:
+            conf.update(
+                dynamic_allocation_conf(
+                    resolved,
+                    self.num_nodes,
+                    self.min_nodes or 0,
+                    self.num_nodes if self.specified_num_nodes else None,
+                )
+            )
+        if self.adaptive:
+            conf.update(
+                adaptive_conf(
+                    resolved, self.specified_num_nodes, self.memory_mb
+                )
+            )
+        if self.executor_bandwidth is not None:
+            conf.update(
+                network_conf(resolved, self.executor_bandwidth, self.memory_mb)
+            )
         return conf
 
     def as_list(self) -> List[Tuple[str, Union[int, str]]]:
@@ -424,4 +2388,4 @@ class SparkConfOptimizer:
             List[Tuple[str, Union[int, str]]]: List of tuple of Spark property
         """
 
-        return [(k, v) for k, v in self.as_dict().items()]
+        return list(self.as_dict().items())
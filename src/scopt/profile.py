@@ -0,0 +1,94 @@
+from dataclasses import dataclass
+from typing import Dict, Union
+
+
+@dataclass(frozen=True)
+class WorkloadProfile:
+    """How executor memory is used by a kind of workload
+
+    Total executor memory (container size) is split into heap, off-heap and
+    overhead by fractions, and the rest of heap_fraction and
+    off_heap_fraction goes to overhead.
+
+    Args:
+        heap_fraction (float, optional): Fraction of total executor memory
+            for 'spark.executor.memory'. Defaults to 0.9.
+        off_heap_fraction (float, optional): Fraction of total executor
+            memory for 'spark.memory.offHeap.size'. Defaults to 0.0.
+        memory_fraction (float, optional): 'spark.memory.fraction'.
+            Defaults to 0.6, which is Spark default.
+        storage_fraction (float, optional): 'spark.memory.storageFraction'.
+            Defaults to 0.5, which is Spark default.
+    """
+
+    heap_fraction: float = 0.9
+    off_heap_fraction: float = 0.0
+    memory_fraction: float = 0.6
+    storage_fraction: float = 0.5
+
+    def __post_init__(self) -> None:
+        if not 0.0 < self.heap_fraction < 1.0:
+            raise ValueError(
+                'heap_fraction must be between 0 and 1, '
+                f'but actually {self.heap_fraction}'
+            )
+        if not 0.0 <= self.off_heap_fraction < 1.0 - self.heap_fraction:
+            raise ValueError(
+                'off_heap_fraction must leave memory for overhead, '
+                f'but actually {self.off_heap_fraction}'
+            )
+        for name in ('memory_fraction', 'storage_fraction'):
+            value = getattr(self, name)
+            if not 0.0 < value < 1.0:
+                raise ValueError(
+                    f'{name} must be between 0 and 1, but actually {value}'
+                )
+
+
+PROFILES: Dict[str, WorkloadProfile] = {
+    # shuffle and sort heavy, Tungsten uses off-heap and little is cached
+    'etl': WorkloadProfile(
+        heap_fraction=0.7,
+        off_heap_fraction=0.2,
+        memory_fraction=0.8,
+        storage_fraction=0.2,
+    ),
+    # cached datasets are reused by iterations and must not be evicted
+    'ml-cache': WorkloadProfile(
+        heap_fraction=0.9,
+        off_heap_fraction=0.0,
+        memory_fraction=0.8,
+        storage_fraction=0.7,
+    ),
+    # many short queries, smaller heap keeps GC pauses short
+    'interactive': WorkloadProfile(
+        heap_fraction=0.8,
+        off_heap_fraction=0.1,
+        memory_fraction=0.6,
+        storage_fraction=0.5,
+    ),
+}
+
+
+def get_profile(profile: Union[str, WorkloadProfile]) -> WorkloadProfile:
+    """Return WorkloadProfile of name or profile itself
+
+    Args:
+        profile (Union[str, WorkloadProfile]): Name in PROFILES or profile.
+
+    Raises:
+        ValueError: When name is not in PROFILES.
+
+    Returns:
+        WorkloadProfile: Profile
+    """
+
+    if isinstance(profile, WorkloadProfile):
+        return profile
+    try:
+        return PROFILES[profile.lower()]
+    except KeyError:
+        raise ValueError(
+            f'profile must be one of {", ".join(PROFILES)}, '
+            f'but actually {profile}'
+        )
@@ -0,0 +1,320 @@
+import csv
+import json
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from scopt.instances import Instance
+from scopt.instances.aws import AwsInstanceMap
+from scopt.optimizer import (
+    DeployMode,
+    Optimizer,
+    SparkConfOptimizer,
+    get_optimizer,
+)
+
+_Job = Tuple[str, Instance, Optional[float]]
+
+
+@dataclass(frozen=True)
+class ClusterTarget:
+    """Resource or throughput which a searched cluster must satisfy
+
+    Args:
+        min_total_cores (int, optional): Total executor cores of the cluster.
+            Defaults to 0.
+        min_executor_memory (int, optional): spark.executor.memory GB.
+            Defaults to 0.
+        min_executor_instances (int, optional): Number of executors.
+            Defaults to 0.
+        min_default_parallelism (int, optional): spark.default.parallelism.
+            Defaults to 0.
+    """
+
+    min_total_cores: int = 0
+    min_executor_memory: int = 0
+    min_executor_instances: int = 0
+    min_default_parallelism: int = 0
+
+    def satisfied_by(self, optimizer: Optimizer) -> bool:
+        executor_instances = optimizer.executor_instances
+        return (
+            executor_instances * optimizer.executor_cores
+            >= self.min_total_cores
+            and optimizer.executor_memory >= self.min_executor_memory
+            and executor_instances >= self.min_executor_instances
+            and optimizer.default_parallelism >= self.min_default_parallelism
+        )
+
+
+@dataclass(frozen=True)
+class Candidate:
+    """Cluster configuration found by `search`
+
+    Wasted cores and memory are node resources which are neither reserved
+    for hadoop daemon nor allocated to executors, summed over all nodes.
+    Cost is hourly price of all nodes and None when no price table is given.
+    """
+
+    instance_type: str
+    instance: Instance
+    num_nodes: int
+    deploy_mode: str
+    cost: Optional[float]
+    executor_cores: int
+    executor_memory: int
+    executor_instances: int
+    default_parallelism: int
+    wasted_cores: int
+    wasted_memory: float
+
+    def to_optimizer(self) -> SparkConfOptimizer:
+        return SparkConfOptimizer(
+            self.instance, self.num_nodes, self.deploy_mode
+        )
+
+    def _objectives(self) -> Tuple[float, ...]:
+        # smaller is better for every objective
+        return (
+            0.0 if self.cost is None else self.cost,
+            -self.executor_instances,
+            -self.default_parallelism,
+            self.wasted_cores,
+            self.wasted_memory,
+        )
+
+    def dominates(self, other: 'Candidate') -> bool:
+        mine = self._objectives()
+        theirs = other._objectives()
+        return mine != theirs and all(m <= t for m, t in zip(mine, theirs))
+
+
+def load_prices(path: Union[str, Path]) -> Dict[str, float]:
+    """Load price table of instance types from a local file
+
+    JSON file must be an object of instance type to hourly price.
+    CSV file must have two columns, instance type and hourly price, with or
+    without header row.
+
+    Args:
+        path (Union[str, Path]): Path of JSON or CSV file.
+
+    Returns:
+        Dict[str, float]: Instance type to hourly price
+    """
+
+    path = Path(path)
+    with path.open() as f:
+        if path.suffix == '.json':
+            return {k: float(v) for k, v in json.load(f).items()}
+        prices = {}
+        for row in csv.reader(f):
+            if len(row) < 2:
+                continue
+            try:
+                prices[row[0].strip()] = float(row[1])
+            except ValueError:
+                # header row
+                continue
+        return prices
+
+
+def search(
+    target: ClusterTarget,
+    instances: Optional[Mapping[str, Instance]] = None,
+    prices: Optional[Mapping[str, float]] = None,
+    deploy_mode: str = 'client',
+    max_nodes: int = 1000,
+    processes: Optional[int] = None,
+) -> List[Candidate]:
+    """Search instance type and number of nodes satisfying target
+
+    For each instance type, only the fewest nodes satisfying target is the
+    candidate. More nodes also add executor instances and default
+    parallelism, so they are not always dominated, but they are not
+    searched; raise target to find larger clusters.
+    Instance types which can not satisfy target, for example executor memory
+    is too small, are pruned before trying number of nodes.
+    Candidates dominated by another one in cost, executor instances,
+    default parallelism and wasted capacity are dropped. Instance types are
+    evaluated from the cheapest, and a type is skipped when a cheaper type
+    of the same Instance is already on the front, since it would give the
+    same executors on the same number of nodes at a higher cost.
+    Worker processes do not share the front, so such types are dropped
+    before submitting instead.
+
+    Args:
+        target (ClusterTarget): Resource or throughput to be satisfied.
+        instances (Optional[Mapping[str, Instance]], optional): Instance
+            types to be searched. If not be specified, AwsInstanceMap is used.
+            Defaults to None.
+        prices (Optional[Mapping[str, float]], optional): Hourly price of
+            instance types. When specified, only instance types in prices are
+            searched. Defaults to None.
+        deploy_mode (str, optional): Spark deploy mode. 'client' or
+            'cluster'. Defaults to 'client'.
+        max_nodes (int, optional): Maximum number of nodes.
+            Defaults to 1000.
+        processes (Optional[int], optional): Number of worker processes.
+            If not be specified, searches in current process.
+            Defaults to None.
+
+    Returns:
+        List[Candidate]: Pareto optimal candidates ordered by cost and
+            executor instances
+
+    ```python
+    from scopt.search import ClusterTarget, load_prices, search
+
+
+    >>> target = ClusterTarget(min_total_cores=600, min_executor_memory=36)
+    >>> for c in search(target, prices=load_prices('prices.csv')):
+    ...     print(c.instance_type, c.num_nodes, c.cost)
+    ```
+    """
+
+    if instances is None:
+        instances = AwsInstanceMap()
+    mode = DeployMode(deploy_mode.lower())
+    jobs: List[_Job] = sorted(
+        (
+            (name, instance, None if prices is None else prices[name])
+            for name, instance in instances.items()
+            if prices is None or name in prices
+        ),
+        key=lambda j: 0.0 if j[2] is None else j[2],
+    )
+    evaluate = partial(_evaluate, target, mode, max_nodes)
+
+    if processes is None or processes <= 1:
+        front: List[Candidate] = []
+        for job in jobs:
+            if not any(_outpriced(c, job) for c in front):
+                _add_to_front(front, evaluate(job))
+        return _sorted_front(front)
+    jobs = _cheapest_jobs(jobs)
+    with ProcessPoolExecutor(processes) as pool:
+        chunksize = max(1, len(jobs) // (processes * 4))
+        return _pareto_front(pool.map(evaluate, jobs, chunksize=chunksize))
+
+
+def _evaluate(
+    target: ClusterTarget,
+    deploy_mode: DeployMode,
+    max_nodes: int,
+    job: _Job,
+) -> Optional[Candidate]:
+    name, instance, price = job
+    try:
+        largest = get_optimizer(instance, max_nodes, deploy_mode)
+    except ValueError:
+        return None
+    if not target.satisfied_by(largest):
+        return None
+
+    # executor shape does not depend on number of nodes, so start from the
+    # fewest nodes which can hold required executors
+    executor_cores = largest.executor_cores
+    required = max(
+        target.min_executor_instances,
+        math.ceil(target.min_total_cores / executor_cores),
+        math.ceil(target.min_default_parallelism / (executor_cores * 2)),
+        1,
+    )
+    start = max(1, math.ceil(required / largest.executor_per_node))
+    for num_nodes in range(start, max_nodes + 1):
+        try:
+            optimizer = get_optimizer(instance, num_nodes, deploy_mode)
+        except ValueError:
+            continue
+        if target.satisfied_by(optimizer):
+            return _candidate(
+                name, instance, num_nodes, deploy_mode, price, optimizer
+            )
+    return None
+
+
+def _candidate(
+    name: str,
+    instance: Instance,
+    num_nodes: int,
+    deploy_mode: DeployMode,
+    price: Optional[float],
+    optimizer: Optimizer,
+) -> Candidate:
+    per_node = optimizer.executor_per_node
+    # one core and 1GB for hadoop daemon
+    wasted_cores = max(
+        instance.num_cores - 1 - per_node * optimizer.executor_cores, 0
+    )
+    wasted_memory = max(
+        instance.memory_size - 1 - per_node * optimizer.total_executor_memory,
+        0,
+    )
+    return Candidate(
+        instance_type=name,
+        instance=instance,
+        num_nodes=num_nodes,
+        deploy_mode=deploy_mode.value,
+        cost=None if price is None else price * num_nodes,
+        executor_cores=optimizer.executor_cores,
+        executor_memory=optimizer.executor_memory,
+        executor_instances=optimizer.executor_instances,
+        default_parallelism=optimizer.default_parallelism,
+        wasted_cores=wasted_cores * num_nodes,
+        wasted_memory=wasted_memory * num_nodes,
+    )
+
+
+def _outpriced(candidate: Candidate, job: _Job) -> bool:
+    # the same Instance needs the same number of nodes, so a higher price
+    # only adds cost
+    _, instance, price = job
+    return (
+        candidate.instance == instance
+        and candidate.cost is not None
+        and price is not None
+        and candidate.cost < price * candidate.num_nodes
+    )
+
+
+def _cheapest_jobs(jobs: List[_Job]) -> List[_Job]:
+    cheapest: Dict[Instance, float] = {}
+    for _, instance, price in jobs:
+        if price is not None:
+            cheapest[instance] = min(price, cheapest.get(instance, price))
+    return [
+        job for job in jobs if job[2] is None or job[2] <= cheapest[job[1]]
+    ]
+
+
+def _add_to_front(
+    front: List[Candidate], candidate: Optional[Candidate]
+) -> None:
+    if candidate is None or any(c.dominates(candidate) for c in front):
+        return
+    front[:] = [c for c in front if not candidate.dominates(c)]
+    front.append(candidate)
+
+
+def _sorted_front(front: List[Candidate]) -> List[Candidate]:
+    return sorted(
+        front,
+        key=lambda c: (
+            0.0 if c.cost is None else c.cost,
+            -c.executor_instances,
+            c.instance_type,
+        ),
+    )
+
+
+def _pareto_front(
+    candidates: Iterable[Optional[Candidate]],
+) -> List[Candidate]:
+    front: List[Candidate] = []
+    for candidate in candidates:
+        _add_to_front(front, candidate)
+    return _sorted_front(front)
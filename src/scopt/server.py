@@ -0,0 +1,260 @@
+import asyncio
+import json
+import logging
+import time
+from http import HTTPStatus
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlsplit
+
+from scopt.cache import OptimizerCache
+from scopt.spec import optimizer_from_spec
+
+MAX_BODY_SIZE = 16 * 1024 * 1024
+
+_Json = Union[Dict[str, object], List[object]]
+
+logger = logging.getLogger(__name__)
+
+
+class HttpError(Exception):
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class ServerStats:
+    """Counters of served requests
+
+    Latency is measured from a request is read until its response is
+    written.
+    """
+
+    def __init__(self) -> None:
+        self.started_at = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.configs = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def record(self, latency: float, configs: int, error: bool) -> None:
+        self.requests += 1
+        self.errors += error
+        self.configs += configs
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def as_dict(self) -> Dict[str, float]:
+        uptime = time.monotonic() - self.started_at
+        return {
+            'uptime_seconds': uptime,
+            'requests': self.requests,
+            'errors': self.errors,
+            'configs': self.configs,
+            'requests_per_second': self.requests / uptime if uptime else 0.0,
+            'configs_per_second': self.configs / uptime if uptime else 0.0,
+            'mean_latency_ms': (
+                self.total_latency / self.requests * 1000
+                if self.requests
+                else 0.0
+            ),
+            'max_latency_ms': self.max_latency * 1000,
+        }
+
+
+class ConfServer:
+    """Asyncio HTTP server returning SparkConfOptimizer.as_dict as JSON
+
+    Endpoints:
+
+    - `GET /optimize?instance_type=r5.4xlarge&num_nodes=10`: Spark properties
+      of one job specification given by query string.
+    - `POST /optimize`: Spark properties of a JSON job specification. When
+      body is a JSON array, returns an array of results in the same order
+      and invalid specifications get `{"error": message}` in place.
+    - `GET /stats`: Request, latency, throughput and cache counters.
+    - `GET /health`: Always `{"status": "ok"}`.
+
+    Job specification is described in `scopt.spec.optimizer_from_spec`.
+
+    Args:
+        cache_size (int, optional): Maximum number of cached optimizers.
+            Defaults to 1024.
+    """
+
+    def __init__(self, cache_size: int = 1024) -> None:
+        self.cache = OptimizerCache(cache_size)
+        self.stats = ServerStats()
+
+    async def start(
+        self, host: str = '127.0.0.1', port: int = 8080
+    ) -> asyncio.base_events.Server:
+        return await asyncio.start_server(self._handle, host, port)
+
+    async def serve_forever(
+        self, host: str = '127.0.0.1', port: int = 8080
+    ) -> None:
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+    def dispatch(
+        self, method: str, target: str, body: bytes = b''
+    ) -> Tuple[HTTPStatus, _Json, int]:
+        """Return status, JSON response and number of computed configs"""
+
+        url = urlsplit(target)
+        if url.path == '/optimize':
+            if method == 'GET':
+                spec = dict(parse_qsl(url.query))
+                return HTTPStatus.OK, self._optimize(spec), 1
+            if method == 'POST':
+                return self._optimize_body(body)
+        elif url.path == '/stats':
+            if method == 'GET':
+                stats: Dict[str, object] = {**self.stats.as_dict()}
+                stats['cache'] = self.cache.cache_info()._asdict()
+                return HTTPStatus.OK, stats, 0
+        elif url.path == '/health':
+            if method == 'GET':
+                return HTTPStatus.OK, {'status': 'ok'}, 0
+        else:
+            raise HttpError(HTTPStatus.NOT_FOUND, f'Not found: {url.path}')
+        raise HttpError(
+            HTTPStatus.METHOD_NOT_ALLOWED, f'Method not allowed: {method}'
+        )
+
+    def _optimize(self, spec: Mapping[str, object]) -> Dict[str, object]:
+        try:
+            return {**optimizer_from_spec(spec, self.cache).as_dict()}
+        except ValueError as e:
+            raise HttpError(HTTPStatus.BAD_REQUEST, str(e))
+
+    def _optimize_body(self, body: bytes) -> Tuple[HTTPStatus, _Json, int]:
+        try:
+            payload = json.loads(body)
+        except ValueError as e:
+            raise HttpError(HTTPStatus.BAD_REQUEST, f'Invalid JSON: {e}')
+
+        if isinstance(payload, dict):
+            return HTTPStatus.OK, self._optimize(payload), 1
+        if not isinstance(payload, list):
+            raise HttpError(
+                HTTPStatus.BAD_REQUEST, 'Body must be JSON object or array'
+            )
+        results: List[object] = []
+        for spec in payload:
+            try:
+                if not isinstance(spec, dict):
+                    raise HttpError(
+                        HTTPStatus.BAD_REQUEST, 'Spec must be JSON object'
+                    )
+                results.append(self._optimize(spec))
+            except HttpError as e:
+                results.append({'error': str(e)})
+            except Exception:
+                # keep results of the other specs in the batch
+                logger.exception('Failed to optimize %s', spec)
+                results.append({'error': 'Internal server error'})
+        return HTTPStatus.OK, results, len(payload)
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            keep_alive = True
+            while keep_alive:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                started = time.perf_counter()
+                method, target, version, headers, body = request
+                keep_alive = _keep_alive(version, headers)
+                configs = 0
+                try:
+                    status, response, configs = self.dispatch(
+                        method, target, body
+                    )
+                except HttpError as e:
+                    status, response = e.status, {'error': str(e)}
+                except Exception:
+                    # keep serving and count it instead of dropping client
+                    logger.exception('Failed to handle %s %s', method, target)
+                    status = HTTPStatus.INTERNAL_SERVER_ERROR
+                    response = {'error': 'Internal server error'}
+                await _write_response(writer, status, response, keep_alive)
+                self.stats.record(
+                    time.perf_counter() - started,
+                    configs,
+                    status != HTTPStatus.OK,
+                )
+        except HttpError as e:
+            await _write_response(writer, e.status, {'error': str(e)}, False)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _read_request(
+    reader: asyncio.StreamReader,
+) -> Optional[Tuple[str, str, str, Dict[str, str], bytes]]:
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    try:
+        method, target, version = line.decode('latin-1').split()
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, 'Invalid request line')
+
+    headers = {}
+    while True:
+        header = await reader.readline()
+        if header in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = header.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, 'Invalid Content-Length')
+    if length > MAX_BODY_SIZE:
+        raise HttpError(
+            HTTPStatus.REQUEST_ENTITY_TOO_LARGE, 'Request body is too large'
+        )
+    body = await reader.readexactly(length) if length else b''
+    return method.upper(), target, version, headers, body
+
+
+def _keep_alive(version: str, headers: Dict[str, str]) -> bool:
+    connection = headers.get('connection', '').lower()
+    if version == 'HTTP/1.0':
+        return connection == 'keep-alive'
+    return connection != 'close'
+
+
+async def _write_response(
+    writer: asyncio.StreamWriter,
+    status: HTTPStatus,
+    response: _Json,
+    keep_alive: bool,
+) -> None:
+    body = json.dumps(response).encode()
+    head = (
+        f'HTTP/1.1 {status.value} {status.phrase}\r\n'
+        'Content-Type: application/json\r\n'
+        f'Content-Length: {len(body)}\r\n'
+        f'Connection: {"keep-alive" if keep_alive else "close"}\r\n'
+        '\r\n'
+    )
+    writer.write(head.encode('latin-1') + body)
+    await writer.drain()
+
+
+def serve(
+    host: str = '127.0.0.1', port: int = 8080, cache_size: int = 1024
+) -> None:
+    """Run ConfServer until interrupted"""
+
+    asyncio.run(ConfServer(cache_size).serve_forever(host, port))
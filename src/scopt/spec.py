@@ -0,0 +1,255 @@
+import math
+from typing import Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+from scopt.instances import Instance
+from scopt.instances.aws import AwsInstanceMap
+from scopt.optimizer import Fleet, KubernetesConf, SparkConfOptimizer
+
+OptimizerFactory = Callable[..., SparkConfOptimizer]
+
+_TRUE = ('true', '1', 'yes', 'on')
+_FALSE = ('false', '0', 'no', 'off', '')
+_SIZE_KEYS = ('input_size', 'shuffle_size', 'partition_size')
+_KUBERNETES_KEYS = (
+    'reserved_cores',
+    'reserved_memory',
+    'memory_overhead_factor',
+)
+
+
+def optimizer_from_spec(
+    spec: Mapping[str, object],
+    factory: OptimizerFactory = SparkConfOptimizer,
+) -> SparkConfOptimizer:
+    """Create SparkConfOptimizer from a job specification
+
+    Job specification is a mapping parsed from JSON, CSV row or query string
+    and values may be strings. Supported keys are below.
+
+    - instance_type: AWS instance type of executor like 'r5.4xlarge'.
+    - cores, memory: Instance of executor, when instance_type is not given.
+    - network_bandwidth: Network bandwidth (Gbps) of cores and memory
+      instance.
+    - fleet: Executor nodes of mixed AWS instance types, when neither
+      instance_type nor cores and memory is given. Object of instance type
+      to number of nodes, array of pairs of them or string like
+      'r5.4xlarge:10,r5d.8xlarge:4'.
+    - num_nodes: Number of Spark cluster nodes.
+    - deploy_mode: 'client', 'cluster' or 'kubernetes'.
+      Defaults to 'client'.
+    - driver_instance_type: AWS instance type of driver.
+    - driver_cores, driver_memory: Instance of driver, when
+      driver_instance_type is not given.
+    - dynamic_allocation: Dynamic allocation is enabled or not.
+      Defaults to False.
+    - min_nodes, max_nodes: Range of number of nodes for dynamic
+      allocation.
+    - input_size, shuffle_size, partition_size: Estimated data sizes and
+      target partition size (GB) for parallelism.
+    - executor_cores_range: Range of executor cores to be searched like
+      '3-8' or [3, 8].
+    - gpu: Size executors for GPUs of instance or not. Defaults to False.
+    - reserved_cores, reserved_memory, memory_overhead_factor: Node
+      reservations and memory overhead factor in 'kubernetes' mode.
+    - profile: Workload profile name like 'etl'.
+    - pyspark: Reserve memory for python workers or not.
+      Defaults to False.
+    - adaptive: Add Adaptive Query Execution properties or not.
+      Defaults to False.
+    - network: Add shuffle fetch and network properties or not.
+      Defaults to False.
+    - memory_mb: Size memory in MB instead of whole GB or not.
+      Defaults to False.
+
+    Args:
+        spec (Mapping[str, object]): Job specification.
+        factory (OptimizerFactory, optional): Callable taking the same
+            arguments as SparkConfOptimizer, for example OptimizerCache.
+            Defaults to SparkConfOptimizer.
+
+    Raises:
+        ValueError: When specification is invalid.
+
+    Returns:
+        SparkConfOptimizer: Optimizer for the job
+    """
+
+    args, options = optimizer_arguments(spec)
+    return factory(*args, **options)
+
+
+def optimizer_arguments(
+    spec: Mapping[str, object],
+) -> Tuple[Tuple[object, ...], Dict[str, object]]:
+    """Return arguments of SparkConfOptimizer for a job specification
+
+    See `optimizer_from_spec` for supported keys. This is useful to pass
+    a specification to functions taking the same arguments as
+    SparkConfOptimizer, like `scopt.eventlog.recommend`.
+
+    Args:
+        spec (Mapping[str, object]): Job specification.
+
+    Raises:
+        ValueError: When specification is invalid.
+
+    Returns:
+        Tuple[Tuple[object, ...], Dict[str, object]]: Positional and
+            keyword arguments
+    """
+
+    executor_instance: Union[Instance, Fleet, None] = _instance(spec, '')
+    if executor_instance is None:
+        executor_instance = _fleet(spec)
+    if executor_instance is None:
+        raise ValueError(
+            'instance_type, cores and memory or fleet is required'
+        )
+    options: Dict[str, object] = {
+        key: _float(spec[key], key)
+        for key in _SIZE_KEYS
+        if spec.get(key) not in (None, '')
+    }
+    for key in ('min_nodes', 'max_nodes'):
+        nodes = _optional_int(spec, key)
+        if nodes is not None:
+            options[key] = nodes
+    cores_range = spec.get('executor_cores_range')
+    if cores_range:
+        options['executor_cores_range'] = _range(
+            cores_range, 'executor_cores_range'
+        )
+    kubernetes = {
+        key: _float(spec[key], key)
+        for key in _KUBERNETES_KEYS
+        if spec.get(key) not in (None, '')
+    }
+    if kubernetes:
+        options['kubernetes'] = KubernetesConf(**kubernetes)
+    if spec.get('profile'):
+        options['profile'] = str(spec['profile'])
+    for key in ('gpu', 'pyspark', 'adaptive', 'network', 'memory_mb'):
+        if _bool(spec, key):
+            options[key] = True
+    args = (
+        executor_instance,
+        _num_nodes(spec),
+        str(spec.get('deploy_mode') or 'client'),
+        _instance(spec, 'driver_'),
+        _bool(spec, 'dynamic_allocation'),
+    )
+    return args, options
+
+
+def _instance(spec: Mapping[str, object], prefix: str) -> Optional[Instance]:
+    instance_type = spec.get(f'{prefix}instance_type')
+    if instance_type:
+        try:
+            return AwsInstanceMap()[str(instance_type)]
+        except KeyError:
+            raise ValueError(f'Unknown instance type: {instance_type}')
+    cores = _optional_int(spec, f'{prefix}cores')
+    memory = spec.get(f'{prefix}memory')
+    if cores is None and memory in (None, ''):
+        return None
+    if cores is None or memory in (None, ''):
+        raise ValueError(f'{prefix}cores and {prefix}memory must be pair')
+    bandwidth = spec.get(f'{prefix}network_bandwidth')
+    return Instance(
+        cores,
+        _float(memory, f'{prefix}memory'),
+        network_bandwidth=(
+            0.0
+            if bandwidth in (None, '')
+            else _float(bandwidth, f'{prefix}network_bandwidth')
+        ),
+    )
+
+
+def _fleet(spec: Mapping[str, object]) -> Optional[Fleet]:
+    fleet = spec.get('fleet')
+    if not fleet:
+        return None
+    if isinstance(fleet, str):
+        pairs: List[object] = [
+            item.split(':', 1) for item in fleet.split(',') if item.strip()
+        ]
+    elif isinstance(fleet, Mapping):
+        pairs = list(fleet.items())
+    elif isinstance(fleet, list):
+        pairs = fleet
+    else:
+        raise ValueError(
+            f'fleet must be object or array, but actually {fleet}'
+        )
+
+    instances = AwsInstanceMap()
+    result = []
+    for pair in pairs:
+        if not isinstance(pair, (list, tuple)) or len(pair) != 2:
+            raise ValueError(f'Invalid fleet item: {pair!r}')
+        instance_type, count = pair
+        try:
+            instance = instances[str(instance_type).strip()]
+        except KeyError:
+            raise ValueError(f'Unknown instance type: {instance_type}')
+        result.append((instance, _int(count, 'fleet')))
+    return result
+
+
+def _num_nodes(spec: Mapping[str, object]) -> Optional[int]:
+    num_nodes = _optional_int(spec, 'num_nodes')
+    if num_nodes is not None and num_nodes < 1:
+        raise ValueError(
+            f'num_nodes must be more than 0, but actually {num_nodes}'
+        )
+    return num_nodes
+
+
+def _range(value: object, key: str) -> Tuple[int, int]:
+    bounds = value.split('-') if isinstance(value, str) else value
+    if not isinstance(bounds, (list, tuple)) or len(bounds) != 2:
+        raise ValueError(f'{key} must be range like 3-8, but actually {value}')
+    return _int(bounds[0], key), _int(bounds[1], key)
+
+
+def _optional_int(spec: Mapping[str, object], key: str) -> Optional[int]:
+    value = spec.get(key)
+    if value is None or value == '':
+        return None
+    return _int(value, key)
+
+
+def _int(value: object, key: str) -> int:
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f'{key} must be integer, but actually {value!r}')
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f'{key} must be integer, but actually {value!r}')
+
+
+def _float(value: object, key: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f'{key} must be number, but actually {value!r}')
+    try:
+        number = float(value)
+    except ValueError:
+        raise ValueError(f'{key} must be number, but actually {value!r}')
+    # inf and nan overflow or pass comparisons of optimizer
+    if not math.isfinite(number):
+        raise ValueError(
+            f'{key} must be finite number, but actually {value!r}'
+        )
+    return number
+
+
+def _bool(spec: Mapping[str, object], key: str) -> bool:
+    value = spec.get(key)
+    if value is None or isinstance(value, bool):
+        return bool(value)
+    if str(value).lower() in _TRUE:
+        return True
+    if str(value).lower() in _FALSE:
+        return False
+    raise ValueError(f'{key} must be boolean, but actually {value!r}')
@@ -0,0 +1,329 @@
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Union
+
+from scopt.__version__ import __version__
+from scopt.instances import Instance, dump_catalog
+from scopt.instances.aws import AwsInstanceMap
+from scopt.optimizer import DeployMode, SparkConfOptimizer
+
+DEFAULT_PATH = Path(__file__).parent / 'data' / 'recommendations.bin'
+MAX_NODES = 1000
+
+_MAGIC = b'SCOPTTB1'
+# magic, checksum, number of instance types, max nodes, size of names
+_HEADER = struct.Struct('<8s32sIII')
+# driver cores, memory and overhead, executor cores, memory and overhead,
+# executor instances, default parallelism and shuffle partitions.
+# Rows of invalid arguments have 0 executor instances.
+_ROW = struct.Struct('<BHHBHHIII')
+_MODES = (DeployMode.CLIENT, DeployMode.CLUSTER)
+
+
+def catalog_checksum(instances: Mapping[str, Instance]) -> bytes:
+    """Return checksum tying a table to catalog and scopt version
+
+    Args:
+        instances (Mapping[str, Instance]): Catalog.
+
+    Returns:
+        bytes: SHA-256 digest
+    """
+
+    digest = hashlib.sha256(__version__.encode())
+    digest.update(dump_catalog(instances).encode())
+    return digest.digest()
+
+
+def build_table(
+    path: Union[str, Path] = DEFAULT_PATH,
+    instances: Optional[Mapping[str, Instance]] = None,
+    max_nodes: int = MAX_NODES,
+) -> None:
+    """Precompute SparkConfOptimizer outputs into a fixed-width table file
+
+    A row is written for every instance type of catalog, 1 to max_nodes
+    nodes, and client and cluster mode. Dynamic allocation only drops some
+    properties of a row, so it does not need rows. File is replaced
+    atomically.
+
+    Args:
+        path (Union[str, Path], optional): Table file.
+            Defaults to DEFAULT_PATH.
+        instances (Optional[Mapping[str, Instance]], optional): Catalog.
+            Defaults to None, which means AwsInstanceMap.
+        max_nodes (int, optional): Maximum number of nodes.
+            Defaults to MAX_NODES.
+
+    Raises:
+        ValueError: When a value does not fit in a column.
+    """
+
+    instances = AwsInstanceMap() if instances is None else instances
+    names = '\n'.join(instances).encode()
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f'.{path.name}.{os.getpid()}')
+    with temporary.open('wb') as f:
+        f.write(
+            _HEADER.pack(
+                _MAGIC,
+                catalog_checksum(instances),
+                len(instances),
+                max_nodes,
+                len(names),
+            )
+        )
+        f.write(names)
+        for instance in instances.values():
+            for mode in _MODES:
+                f.write(
+                    b''.join(
+                        _pack(instance, num_nodes, mode)
+                        for num_nodes in range(1, max_nodes + 1)
+                    )
+                )
+    temporary.replace(path)
+
+
+def _pack(instance: Instance, num_nodes: int, mode: DeployMode) -> bytes:
+    try:
+        resolved = SparkConfOptimizer(instance, num_nodes, mode.value).resolved
+    except ValueError:
+        return bytes(_ROW.size)
+    try:
+        return _ROW.pack(
+            resolved.driver_cores,
+            resolved.driver_memory,
+            resolved.driver_memory_overhead,
+            resolved.executor_cores,
+            resolved.executor_memory,
+            resolved.executor_memory_overhead,
+            resolved.executor_instances,
+            resolved.default_parallelism,
+            resolved.sql_shuffle_partitions,
+        )
+    except struct.error as e:
+        raise ValueError(f'{instance} can not be stored in table: {e}')
+
+
+class RecommendationTable:
+    """Memory-mapped table of precomputed SparkConfOptimizer outputs
+
+    Table is built by `build_table`, and a lookup reads one fixed-width
+    row at an offset computed from instance type index, deploy mode and
+    number of nodes, without creating optimizer objects.
+
+    Args:
+        path (Union[str, Path], optional): Table file.
+            Defaults to DEFAULT_PATH.
+        instances (Optional[Mapping[str, Instance]], optional): Catalog
+            the table must be built from. Defaults to None, which means
+            AwsInstanceMap.
+
+    Raises:
+        ValueError: When file is not a table, or built from another catalog
+            or scopt version.
+
+    ```python
+    from scopt.table import RecommendationTable, build_table
+
+
+    >>> build_table('recommendations.bin')
+    >>> with RecommendationTable('recommendations.bin') as table:
+    ...     table.get('r5.4xlarge', 10)
+    {'spark.driver.cores': 5, 'spark.driver.memory': '35g', ...}
+    ```
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = DEFAULT_PATH,
+        instances: Optional[Mapping[str, Instance]] = None,
+    ) -> None:
+        instances = AwsInstanceMap() if instances is None else instances
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._index = self._read_header(instances)
+        except ValueError:
+            self._mmap.close()
+            raise
+
+    def _read_header(
+        self, instances: Mapping[str, Instance]
+    ) -> Dict[str, int]:
+        if len(self._mmap) < _HEADER.size:
+            raise ValueError('File is too small for recommendation table')
+        magic, checksum, count, max_nodes, names_size = _HEADER.unpack_from(
+            self._mmap
+        )
+        if magic != _MAGIC:
+            raise ValueError('File is not recommendation table')
+        if checksum != catalog_checksum(instances):
+            raise ValueError(
+                'Recommendation table is built from another catalog or scopt '
+                'version, rebuild it'
+            )
+        self.max_nodes = max_nodes
+        self._offset = _HEADER.size + names_size
+        expected = self._offset + count * len(_MODES) * max_nodes * _ROW.size
+        if len(self._mmap) != expected:
+            raise ValueError('Recommendation table is truncated')
+        names = self._mmap[_HEADER.size : self._offset].decode().split('\n')
+        return {name: i for i, name in enumerate(names)}
+
+    def __enter__(self) -> 'RecommendationTable':
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def get(
+        self,
+        instance_type: str,
+        num_nodes: Optional[int] = None,
+        deploy_mode: str = 'client',
+        dynamic_allocation: bool = False,
+    ) -> Optional[Dict[str, Union[int, str]]]:
+        """Return SparkConfOptimizer(...).as_dict() from table
+
+        Args:
+            instance_type (str): Instance type name in catalog.
+            num_nodes (Optional[int], optional): Number of nodes.
+                Defaults to None.
+            deploy_mode (str, optional): 'client' or 'cluster'.
+                Defaults to 'client'.
+            dynamic_allocation (bool, optional): Dynamic allocation is
+                enabled or not. Defaults to False.
+
+        Returns:
+            Optional[Dict[str, Union[int, str]]]: Spark properties, or None
+                when arguments are not covered by table or invalid
+        """
+
+        index = self._index.get(instance_type)
+        mode = deploy_mode.lower()
+        specified_num_nodes = num_nodes is not None
+        if num_nodes is None and dynamic_allocation:
+            # same as SparkConfOptimizer
+            num_nodes = 2
+        if (
+            index is None
+            or num_nodes is None
+            or not 1 <= num_nodes <= self.max_nodes
+            or mode not in ('client', 'cluster')
+        ):
+            return None
+        row = (index * len(_MODES) + (mode == 'cluster')) * self.max_nodes
+        row += num_nodes - 1
+        (
+            driver_cores,
+            driver_memory,
+            driver_memory_overhead,
+            executor_cores,
+            executor_memory,
+            executor_memory_overhead,
+            executor_instances,
+            default_parallelism,
+            sql_shuffle_partitions,
+        ) = _ROW.unpack_from(self._mmap, self._offset + row * _ROW.size)
+        if executor_instances == 0:
+            return None
+        conf: Dict[str, Union[int, str]] = {
+            'spark.driver.cores': driver_cores,
+            'spark.driver.memory': f'{driver_memory}g',
+            'spark.driver.memoryOverhead': f'{driver_memory_overhead}g',
+            'spark.executor.cores': executor_cores,
+            'spark.executor.memory': f'{executor_memory}g',
+            'spark.executor.memoryOverhead': f'{executor_memory_overhead}g',
+        }
+        if not dynamic_allocation:
+            conf['spark.executor.instances'] = executor_instances
+        if specified_num_nodes:
+            conf['spark.default.parallelism'] = default_parallelism
+            conf['spark.sql.shuffle.partitions'] = sql_shuffle_partitions
+        return conf
+
+
+@lru_cache(maxsize=None)
+def _default_table() -> Optional[RecommendationTable]:
+    try:
+        return RecommendationTable(DEFAULT_PATH)
+    except (OSError, ValueError):
+        # not built or stale, every lookup is computed
+        return None
+
+
+def recommend(
+    instance_type: str,
+    num_nodes: Optional[int] = None,
+    deploy_mode: str = 'client',
+    dynamic_allocation: bool = False,
+) -> Dict[str, Union[int, str]]:
+    """Return Spark properties of an AWS instance type
+
+    Properties are read from the table at DEFAULT_PATH when it is built
+    for the current catalog and covers the arguments, and computed by
+    SparkConfOptimizer otherwise. Both are the same.
+
+    Args:
+        instance_type (str): AWS instance type like 'r5.4xlarge'.
+        num_nodes (Optional[int], optional): Number of nodes.
+            Defaults to None.
+        deploy_mode (str, optional): 'client' or 'cluster'.
+            Defaults to 'client'.
+        dynamic_allocation (bool, optional): Dynamic allocation is enabled
+            or not. Defaults to False.
+
+    Raises:
+        KeyError: When instance type is not in catalog.
+        ValueError: When arguments are invalid.
+
+    Returns:
+        Dict[str, Union[int, str]]: Spark properties
+    """
+
+    table = _default_table()
+    if table is not None:
+        conf = table.get(
+            instance_type, num_nodes, deploy_mode, dynamic_allocation
+        )
+        if conf is not None:
+            return conf
+    return SparkConfOptimizer(
+        AwsInstanceMap()[instance_type],
+        num_nodes,
+        deploy_mode,
+        dynamic_allocation=dynamic_allocation,
+    ).as_dict()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m scopt.table',
+        description='Build recommendation table of AWS instance types',
+    )
+    parser.add_argument(
+        'path',
+        nargs='?',
+        default=str(DEFAULT_PATH),
+        help='Table file. Defaults to the package data',
+    )
+    parser.add_argument('--max-nodes', type=int, default=MAX_NODES)
+    args = parser.parse_args(argv)
+    build_table(args.path, max_nodes=args.max_nodes)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
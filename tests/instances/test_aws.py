@@ -1,3 +1,5 @@
+from collections.abc import Mapping
+
 import pytest
 
 from scopt.instances import Instance
@@ -7,8 +9,51 @@ from scopt.instances.aws import AwsInstanceMap
 class TestAwsInstanceMap:
     def test_getitem(self) -> None:
         mapping = AwsInstanceMap()
-        key, value = tuple(mapping._instance_dict.items())[0]
-        assert mapping[key] == value
+        assert mapping['r5.4xlarge'] == Instance(16, 120)
+        assert mapping['r5.8xlarge'] == Instance(32, 248, 0, 0, 10)
+        assert mapping['c4.large'] == Instance(2, 1)
+
+    def test_burst_network(self) -> None:
+        # "Up to" burst bandwidth of 4xlarge or smaller sizes is not known
+        mapping = AwsInstanceMap()
+        assert mapping['r5.xlarge'].network_bandwidth == 0.0
+        assert mapping['m5zn.3xlarge'].network_bandwidth == 0.0
+        assert mapping['m5zn.6xlarge'].network_bandwidth == 50
+        assert all(
+            i.network_bandwidth == 0.0
+            for name, i in mapping.items()
+            if i.num_cores <= 16 and name != 'd3en.4xlarge'
+        )
+
+    @pytest.mark.parametrize(
+        'name, num_cores, num_gpus, gpu_memory',
+        [
+            # num_cores are vCPUs, not GPUs
+            ('g3s.xlarge', 4, 1, 8),
+            ('g3.16xlarge', 64, 4, 8),
+            ('g4dn.xlarge', 4, 1, 16),
+            ('g4dn.12xlarge', 48, 4, 16),
+            ('g4dn.16xlarge', 64, 1, 16),
+            ('p2.16xlarge', 64, 16, 12),
+            ('p3.2xlarge', 8, 1, 16),
+            ('p3.8xlarge', 32, 4, 16),
+        ],
+    )
+    def test_gpu_instances(
+        self, name: str, num_cores: int, num_gpus: int, gpu_memory: float
+    ) -> None:
+        instance = AwsInstanceMap()[name]
+        assert (
+            instance.num_cores,
+            instance.num_gpus,
+            instance.gpu_memory,
+        ) == (num_cores, num_gpus, gpu_memory)
+
+    def test_gpu_families(self) -> None:
+        mapping = AwsInstanceMap()
+        families = {n.split('.')[0] for n, i in mapping.items() if i.num_gpus}
+        assert families == {'g3', 'g3s', 'g4dn', 'p2', 'p3'}
+        assert mapping['p3.8xlarge'] == Instance(32, 236, 4, 16, 10)
 
     def test_invalid_item_key(self) -> None:
         mapping = AwsInstanceMap()
@@ -18,8 +63,30 @@ class TestAwsInstanceMap:
     def test_immutability(self) -> None:
         mapping = AwsInstanceMap()
         with pytest.raises(TypeError):
-            mapping['dummy'] = Instance(1, 1)
+            mapping['dummy'] = Instance(1, 1)  # type: ignore[index]
 
     def test_num_support_instances(self) -> None:
         mapping = AwsInstanceMap()
-        assert len(mapping._instance_dict) == 196
+        assert len(mapping) == 196
+
+    def test_mapping_protocol(self) -> None:
+        mapping = AwsInstanceMap()
+        assert isinstance(mapping, Mapping)
+        assert 'r5.4xlarge' in mapping
+        assert 'not_exist' not in mapping
+        assert mapping.get('not_exist') is None
+        assert len(list(mapping.keys())) == len(mapping)
+        assert dict(mapping.items()) == dict(zip(mapping, mapping.values()))
+
+    def test_lazy_catalog(self) -> None:
+        from scopt.instances import aws
+
+        assert aws.AWS_INSTANCES is AwsInstanceMap()._instances
+        with pytest.raises(AttributeError):
+            aws.NOT_EXIST
+
+    def test_catalog_is_shared(self) -> None:
+        assert AwsInstanceMap()['r5.4xlarge'] is AwsInstanceMap()['r5.4xlarge']
+        # same resources share one Instance object
+        mapping = AwsInstanceMap()
+        assert mapping['r5.4xlarge'] is mapping['r5d.4xlarge']
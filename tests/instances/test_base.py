@@ -21,3 +21,37 @@ class TestInstance:
     def test_insufficient_memory(self) -> None:
         with pytest.raises(ValueError):
             Instance(4, 0)
+
+    @pytest.mark.parametrize(
+        'memory_size', [float('inf'), float('nan'), 1e308]
+    )
+    def test_infinite_memory(self, memory_size: float) -> None:
+        with pytest.raises(ValueError):
+            Instance(4, memory_size)
+
+    def test_gpu_instance(self) -> None:
+        instance = Instance(32, 236, 4, 16)
+        assert instance.num_gpus == 4
+        assert instance.gpu_memory == 16
+        assert instance != Instance(32, 236)
+        assert repr(instance) == (
+            'Instance(num_cores=32, memory_size=236, num_gpus=4, '
+            'gpu_memory=16)'
+        )
+        assert repr(Instance(4, 32)) == 'Instance(num_cores=4, memory_size=32)'
+
+    def test_invalid_gpu(self) -> None:
+        with pytest.raises(ValueError):
+            Instance(4, 32, -1)
+        with pytest.raises(ValueError):
+            Instance(4, 32, 1, -16)
+
+    def test_network_bandwidth(self) -> None:
+        instance = Instance(16, 120, network_bandwidth=25)
+        assert instance.network_bandwidth == 25
+        assert instance != Instance(16, 120)
+        assert repr(instance) == (
+            'Instance(num_cores=16, memory_size=120, network_bandwidth=25)'
+        )
+        with pytest.raises(ValueError):
+            Instance(16, 120, network_bandwidth=-1)
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import pytest
+
+from scopt.instances import Instance, dump_catalog, load_catalog, parse_catalog
+from scopt.instances.aws import AwsInstanceMap
+
+
+class TestCatalog:
+    def test_parse(self) -> None:
+        text = (
+            '# comment\n'
+            'name,num_cores,memory_size\n'
+            'r5.4xlarge,16,120\n'
+            '\n'
+            'r5d.4xlarge,16,120\n'
+            'custom,8,30.5\n'
+        )
+        instances = parse_catalog(text)
+        assert instances == {
+            'r5.4xlarge': Instance(16, 120),
+            'r5d.4xlarge': Instance(16, 120),
+            'custom': Instance(8, 30.5),
+        }
+        assert instances['r5.4xlarge'] is instances['r5d.4xlarge']
+        assert isinstance(instances['r5.4xlarge'].memory_size, int)
+
+    def test_parse_gpu(self) -> None:
+        text = (
+            'name,num_cores,memory_size,num_gpus,gpu_memory\n'
+            'r5.4xlarge,16,120\n'
+            'p3.8xlarge,32,236,4,16\n'
+            'custom,8,30,,\n'
+        )
+        assert parse_catalog(text) == {
+            'r5.4xlarge': Instance(16, 120),
+            'p3.8xlarge': Instance(32, 236, 4, 16),
+            'custom': Instance(8, 30),
+        }
+
+    def test_parse_network_bandwidth(self) -> None:
+        text = (
+            'name,num_cores,memory_size,num_gpus,gpu_memory,'
+            'network_bandwidth\n'
+            'c4.large,2,1\n'
+            'r5.4xlarge,16,120,,,10\n'
+            'p3.8xlarge,32,236,4,16,10\n'
+            'custom,8,30,,,0.75\n'
+        )
+        assert parse_catalog(text) == {
+            'c4.large': Instance(2, 1),
+            'r5.4xlarge': Instance(16, 120, network_bandwidth=10),
+            'p3.8xlarge': Instance(32, 236, 4, 16, 10),
+            'custom': Instance(8, 30, network_bandwidth=0.75),
+        }
+
+    @pytest.mark.parametrize(
+        'text',
+        [
+            '',
+            'name,num_cores,memory_size,network_bandwidth\n'
+            'r5.4xlarge,16,120,10\n',
+            'name,num_cores,memory_size,num_gpus,gpu_memory,'
+            'network_bandwidth\nr5.4xlarge,16,120,,,-1\n',
+            'name,num_cores,memory_size,num_gpus,gpu_memory\n'
+            'p3.8xlarge,32,236,four,16\n',
+            'r5.4xlarge,16,120\n',
+            'name,num_cores,memory_size\nr5.4xlarge,16\n',
+            'name,num_cores,memory_size\nr5.4xlarge,many,120\n',
+            'name,num_cores,memory_size\nr5.4xlarge,16,0\n',
+        ],
+    )
+    def test_parse_invalid(self, text: str) -> None:
+        with pytest.raises(ValueError):
+            parse_catalog(text)
+
+    def test_dump_and_load(self, tmp_path: Path) -> None:
+        instances = dict(AwsInstanceMap().items())
+        path = tmp_path / 'catalog.csv'
+        path.write_text(dump_catalog(instances))
+        assert load_catalog(path) == instances
+        assert load_catalog(str(path)) == instances
@@ -0,0 +1,100 @@
+from scopt.instances import Instance, InstanceIndex
+from scopt.instances.aws import AwsInstanceMap
+
+CATALOG = {
+    'small': Instance(4, 16),
+    'medium': Instance(8, 32),
+    'large': Instance(16, 128),
+    'compute': Instance(16, 32),
+    'memory': Instance(8, 256),
+}
+
+
+class TestInstanceIndex:
+    def test_query_cores(self) -> None:
+        index = InstanceIndex(CATALOG)
+        assert index.query(min_cores=8, max_cores=8) == [
+            ('medium', Instance(8, 32)),
+            ('memory', Instance(8, 256)),
+        ]
+
+    def test_query_memory(self) -> None:
+        index = InstanceIndex(CATALOG)
+        assert [n for n, _ in index.query(min_memory=32, max_memory=128)] == [
+            'medium',
+            'compute',
+            'large',
+        ]
+
+    def test_query_memory_per_core(self) -> None:
+        index = InstanceIndex(CATALOG)
+        assert [n for n, _ in index.query(min_memory_per_core=8)] == [
+            'memory',
+            'large',
+        ]
+
+    def test_query_combination(self) -> None:
+        index = InstanceIndex(CATALOG)
+        assert index.query(min_cores=16, min_memory_per_core=4) == [
+            ('large', Instance(16, 128))
+        ]
+        assert index.query(min_cores=32) == []
+        assert len(index.query()) == len(CATALOG) == len(index)
+
+    def test_smallest(self) -> None:
+        index = InstanceIndex(CATALOG)
+        assert index.smallest() == ('small', Instance(4, 16))
+        assert index.smallest(min_cores=5) == ('medium', Instance(8, 32))
+        assert index.smallest(min_memory_per_core=8) == (
+            'memory',
+            Instance(8, 256),
+        )
+        assert index.smallest(min_cores=16, min_memory=64) == (
+            'large',
+            Instance(16, 128),
+        )
+        assert index.smallest(min_memory=512) is None
+
+    def test_same_as_linear_scan(self) -> None:
+        mapping = AwsInstanceMap()
+        index = InstanceIndex(mapping)
+        expected = sorted(
+            (
+                (name, instance)
+                for name, instance in mapping.items()
+                if 16 <= instance.num_cores
+                and 100 <= instance.memory_size <= 250
+            ),
+            key=lambda i: (i[1].num_cores, i[1].memory_size, i[0]),
+        )
+        actual = index.query(min_cores=16, min_memory=100, max_memory=250)
+        assert actual == expected
+
+    def test_smallest_same_as_linear_scan(self) -> None:
+        mapping = AwsInstanceMap()
+        index = InstanceIndex(mapping)
+        ordered = sorted(
+            mapping.items(),
+            key=lambda i: (i[1].num_cores, i[1].memory_size, i[0]),
+        )
+        for min_cores in (None, 1, 5, 16, 48, 128):
+            for min_memory in (None, 8, 100, 500):
+                # 7.5 and 8 are exact memory per core of several types
+                for min_memory_per_core in (None, 2, 7.5, 8, 16, 32):
+                    expected = next(
+                        (
+                            (name, instance)
+                            for name, instance in ordered
+                            if instance.num_cores >= (min_cores or 0)
+                            and instance.memory_size >= (min_memory or 0)
+                            and instance.memory_size / instance.num_cores
+                            >= (min_memory_per_core or 0)
+                        ),
+                        None,
+                    )
+                    assert (
+                        index.smallest(
+                            min_cores, min_memory, min_memory_per_core
+                        )
+                        == expected
+                    )
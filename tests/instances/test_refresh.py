@@ -0,0 +1,229 @@
+import io
+from email.message import Message
+from pathlib import Path
+from typing import Any, List
+from urllib.error import HTTPError
+from urllib.request import Request
+
+import pytest
+
+from scopt.instances import Instance, parse_catalog
+from scopt.instances import refresh as refresh_module
+from scopt.instances.refresh import (
+    CatalogDiff,
+    InstanceSpec,
+    build_catalog,
+    diff_catalog,
+    fetch_pages,
+    main,
+    parse_ec2_page,
+    parse_emr_page,
+)
+
+EMR_PAGE = '''
+<html><body>
+<div class="table-container">
+  <div class="title">r5.4xlarge</div>
+  <table>
+    <tr><th>Configuration option</th><th>Default value</th></tr>
+    <tr><td>mapreduce.map.java.opts</td><td>-Xmx4096m</td></tr>
+    <tr><td><code>yarn.nodemanager.resource.memory-mb</code></td>
+        <td>122880</td></tr>
+  </table>
+</div>
+<div class="table-container">
+  <div class="title"><b>p3.8xlarge</b></div>
+  <table>
+    <tr><td>yarn.nodemanager.resource.memory-mb</td><td>241664</td></tr>
+  </table>
+</div>
+<div class="table-container">
+  <div class="title">x9.large</div>
+  <table>
+    <tr><td>yarn.nodemanager.resource.memory-mb</td><td>4096</td></tr>
+  </table>
+</div>
+<div class="title">Other</div>
+<table><tr><td>yarn.nodemanager.resource.memory-mb</td><td>1</td></tr></table>
+</body></html>
+'''
+
+EC2_PAGE = '''
+<table>
+  <tr><th>Instance Size</th><th>vCPU*</th><th>Memory (GiB)</th>
+      <th>Network Bandwidth (Gbps)***</th></tr>
+  <tr><td>r5.2xlarge</td><td>8</td><td>64</td><td>Up to 10</td></tr>
+  <tr><td>r5.4xlarge</td><td>16</td><td>128</td><td>Up to 10</td></tr>
+</table>
+<table>
+  <tr><th>Instance</th><th>GPUs</th><th>vCPU</th><th>Mem (GiB)</th>
+      <th>GPU Mem (GiB)</th><th>Network Performance</th></tr>
+  <tr><td>p3.8xlarge</td><td>4</td><td>32</td><td>244</td><td>64</td>
+      <td>10 Gigabit</td></tr>
+  <tr><td>p3.16xlarge</td><td>8</td><td>64</td><td>488</td><td>128</td>
+      <td>25 Gigabit</td></tr>
+</table>
+<table><tr><td>Price</td></tr><tr><td>r5.4xlarge</td></tr></table>
+'''
+
+
+class TestParse:
+    def test_emr_page(self) -> None:
+        assert parse_emr_page(EMR_PAGE) == {
+            'r5.4xlarge': 120,
+            'p3.8xlarge': 236,
+            'x9.large': 4,
+        }
+
+    def test_emr_page_not_rounded(self) -> None:
+        page = (
+            '<div class="title">c4.large</div><table><tr>'
+            '<td>yarn.nodemanager.resource.memory-mb</td><td>1536</td>'
+            '</tr></table>'
+        )
+        assert parse_emr_page(page) == {'c4.large': 1.5}
+
+    def test_ec2_page(self) -> None:
+        assert parse_ec2_page(EC2_PAGE) == {
+            'r5.2xlarge': InstanceSpec(8, network_burst=True),
+            'r5.4xlarge': InstanceSpec(16, network_burst=True),
+            'p3.8xlarge': InstanceSpec(32, 10, 4, 16),
+            'p3.16xlarge': InstanceSpec(64, 25, 8, 16),
+        }
+
+    def test_moderate_network(self) -> None:
+        page = (
+            '<table><tr><th>Model</th><th>vCPU</th><th>Network</th></tr>'
+            '<tr><td>c4.large</td><td>2</td><td>Moderate</td></tr></table>'
+        )
+        assert parse_ec2_page(page) == {'c4.large': InstanceSpec(2)}
+
+
+class TestBuildCatalog:
+    def test_build(self) -> None:
+        current = {
+            'r5.4xlarge': Instance(16, 120),
+            'r5.xlarge': Instance(4, 24, network_bandwidth=10),
+            'p3.8xlarge': Instance(32, 236, 4, 16, 10),
+            'x9.large': Instance(2, 4, network_bandwidth=5),
+        }
+        catalog, unknown = build_catalog(
+            {
+                'x9.large': 4,
+                'r5.4xlarge': 120,
+                'r5.12xlarge': 376,
+                'r5.2xlarge': 56,
+                'r5.xlarge': 24,
+                'p3.8xlarge': 236,
+            },
+            {
+                'r5.2xlarge': InstanceSpec(8, 10),
+                'r5.4xlarge': InstanceSpec(16, 10),
+                # burst bandwidth in current catalog is not kept
+                'r5.xlarge': InstanceSpec(4, network_burst=True),
+                'p3.8xlarge': InstanceSpec(32),
+            },
+            current,
+        )
+        # ordered by family and size
+        assert list(catalog.items()) == [
+            ('p3.8xlarge', Instance(32, 236, 4, 16, 10)),
+            ('r5.xlarge', Instance(4, 24)),
+            ('r5.2xlarge', Instance(8, 56, network_bandwidth=10)),
+            ('r5.4xlarge', Instance(16, 120, network_bandwidth=10)),
+            ('x9.large', Instance(2, 4, network_bandwidth=5)),
+        ]
+        assert unknown == ['r5.12xlarge']
+
+    def test_diff(self) -> None:
+        current = {'a.large': Instance(2, 4), 'b.large': Instance(2, 8)}
+        new = {'b.large': Instance(2, 16), 'c.large': Instance(4, 8)}
+        diff = diff_catalog(current, new)
+        assert diff == CatalogDiff(
+            {'c.large': Instance(4, 8)},
+            {'a.large': Instance(2, 4)},
+            {'b.large': (Instance(2, 8), Instance(2, 16))},
+        )
+        assert str(diff).splitlines() == [
+            '+ c.large Instance(num_cores=4, memory_size=8)',
+            '- a.large Instance(num_cores=2, memory_size=4)',
+            '~ b.large Instance(num_cores=2, memory_size=8) -> '
+            'Instance(num_cores=2, memory_size=16)',
+        ]
+        assert not diff_catalog(current, current)
+
+
+class _Response(io.BytesIO):
+    def __init__(self, body: bytes, etag: str) -> None:
+        super().__init__(body)
+        self.headers = Message()
+        self.headers['Content-Type'] = 'text/html; charset=utf-8'
+        self.headers['ETag'] = etag
+
+
+class TestFetchPages:
+    def test_etag_cache(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        requests: List[Request] = []
+
+        def urlopen(request: Request, timeout: float) -> Any:
+            requests.append(request)
+            if request.get_header('If-none-match') == '"v1"':
+                raise HTTPError(
+                    request.full_url, 304, 'Not Modified', Message(), None
+                )
+            return _Response(b'<html>page</html>', '"v1"')
+
+        monkeypatch.setattr(refresh_module, 'urlopen', urlopen)
+        sources = {'a': 'https://example.com/a', 'b': 'https://example.com/b'}
+        expected = {'a': '<html>page</html>', 'b': '<html>page</html>'}
+        assert fetch_pages(sources, tmp_path) == expected
+        assert (tmp_path / 'a.etag').read_text() == '"v1"'
+        # not modified pages are read from cache
+        assert fetch_pages(sources, tmp_path) == expected
+        assert len(requests) == 4
+        assert fetch_pages(sources, tmp_path, offline=True) == expected
+        assert len(requests) == 4
+
+    def test_offline_not_cached(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError):
+            fetch_pages({'a': 'https://example.com/a'}, tmp_path, True)
+        with pytest.raises(ValueError):
+            fetch_pages({'a': 'https://example.com/a'}, None, True)
+
+
+class TestMain:
+    def test_offline(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        (tmp_path / 'emr.html').write_text(EMR_PAGE)
+        (tmp_path / 'ec2.html').write_text(EC2_PAGE)
+        catalog = tmp_path / 'catalog.csv'
+        catalog.write_text(
+            '# comment\n'
+            'name,num_cores,memory_size\n'
+            'r5.4xlarge,16,120\n'
+            'r5.xlarge,4,24\n'
+        )
+        output = tmp_path / 'output.csv'
+        argv = ['--catalog', str(catalog), '--cache-dir', str(tmp_path)]
+        assert main(argv + ['--offline', '-o', str(output)]) == 0
+        text = output.read_text()
+        assert text.startswith('# comment\nname,num_cores,memory_size,')
+        assert parse_catalog(text) == {
+            'p3.8xlarge': Instance(32, 236, 4, 16, 10),
+            'r5.4xlarge': Instance(16, 120),
+        }
+        err = capsys.readouterr().err.splitlines()
+        assert 'scopt: cores of x9.large are unknown' in err
+        assert '- r5.xlarge Instance(num_cores=4, memory_size=24)' in err
+
+    def test_offline_not_cached(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        catalog = tmp_path / 'catalog.csv'
+        catalog.write_text('name,num_cores,memory_size\n')
+        argv = ['--catalog', str(catalog), '--cache-dir', str(tmp_path)]
+        assert main(argv + ['--offline']) == 1
+        assert 'is not cached' in capsys.readouterr().err
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from scopt import batch
+from scopt.instances import Instance
+from scopt.instances.aws import AwsInstanceMap
+from scopt.optimizer import SparkConfOptimizer
+
+
+class TestOptimize:
+    def test_same_as_scalar(self) -> None:
+        instances = list(AwsInstanceMap().values())
+        nodes = np.arange(2, 12)
+        for deploy_mode in ('client', 'cluster'):
+            result = batch.optimize(
+                cores=[i.num_cores for i in instances],
+                memory=[i.memory_size for i in instances],
+                num_nodes=nodes[:, np.newaxis],
+                deploy_mode=deploy_mode,
+            )
+            assert len(result) == len(nodes) * len(instances)
+            columns = result.as_dict()
+            row = 0
+            for num_nodes in nodes:
+                for instance in instances:
+                    conf = SparkConfOptimizer(
+                        instance, int(num_nodes), deploy_mode
+                    ).as_dict()
+                    actual = {
+                        k: _format(k, int(v[row])) for k, v in columns.items()
+                    }
+                    assert actual == conf
+                    row += 1
+
+    def test_specify_driver(self) -> None:
+        result = batch.optimize(
+            [32, 4], [248, 16], 10, driver_cores=[4, 32], driver_memory=16
+        )
+        for row, (executor, driver) in enumerate(
+            [
+                (Instance(32, 248), Instance(4, 16)),
+                (Instance(4, 16), Instance(32, 16)),
+            ]
+        ):
+            expected = SparkConfOptimizer(
+                executor, 10, 'client', driver
+            ).optimizer
+            assert result.driver_cores[row] == expected.driver_cores
+            assert result.driver_memory[row] == expected.driver_memory
+            assert (
+                result.driver_memory_overhead[row]
+                == expected.driver_memory_overhead
+            )
+
+    def test_mixed_deploy_mode(self) -> None:
+        result = batch.optimize(32, 248, 10, ['client', 'CLUSTER'])
+        assert result.executor_instances.tolist() == [60, 59]
+
+    def test_insufficient_resource_raise(self) -> None:
+        with pytest.raises(ValueError):
+            batch.optimize([4, 4], 16, [10, 1], 'cluster')
+
+    def test_insufficient_resource_mask(self) -> None:
+        result = batch.optimize([4, 4], 16, [10, 1], 'cluster', errors='mask')
+        assert result.valid.tolist() == [True, False]
+        assert result.executor_instances.tolist() == [9, 0]
+        assert result.default_parallelism.tolist() == [54, 0]
+
+    def test_dynamic_allocation(self) -> None:
+        result = batch.optimize(32, 248, 10, dynamic_allocation=True)
+        assert 'spark.executor.instances' not in result.as_dict()
+
+    def test_invalid_arguments(self) -> None:
+        with pytest.raises(ValueError):
+            batch.optimize(32, 248, 10, 'local')
+        with pytest.raises(ValueError):
+            # pod packing is not vectorized
+            batch.optimize(32, 248, 10, 'kubernetes')
+        with pytest.raises(ValueError):
+            batch.optimize(32, 248, 10, 'cluster', driver_cores=4)
+        with pytest.raises(ValueError):
+            batch.optimize([32, 0], 248, 10)
+        with pytest.raises(ValueError):
+            batch.optimize(32, [248, 0], 10)
+        with pytest.raises(ValueError):
+            batch.optimize(32, 248, 10, errors='ignore')
+
+
+def _format(key: str, value: int) -> object:
+    return f'{value}g' if 'memory' in key.lower() else value
@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List
+
+import pytest
+
+from scopt.cache import CacheInfo, OptimizerCache
+from scopt.instances import Instance
+
+
+class TestOptimizerCache:
+    def test_hit(self) -> None:
+        cache = OptimizerCache()
+        sco = cache(Instance(32, 248), 10, 'client')
+        assert cache(Instance(32, 248), 10, 'CLIENT') is sco
+        assert cache(Instance(32, 248), 10, 'cluster') is not sco
+        assert cache.cache_info() == CacheInfo(1, 2, 0, 128, 2)
+
+    def test_result(self) -> None:
+        cache = OptimizerCache()
+        sco = cache(
+            Instance(32, 248), deploy_mode='client', dynamic_allocation=True
+        )
+        assert sco.dynamic_allocation
+        assert not sco.specified_num_nodes
+        assert sco.as_dict()['spark.executor.cores'] == 5
+
+    def test_frozen(self) -> None:
+        cache = OptimizerCache()
+        sco = cache(Instance(32, 248), 10)
+        with pytest.raises(AttributeError, match='frozen'):
+            sco.num_nodes = 20
+        with pytest.raises(AttributeError, match='frozen'):
+            del sco.resolved
+        with pytest.raises(AttributeError, match='frozen'):
+            setattr(sco.optimizer, 'num_nodes', 20)
+        assert cache(Instance(32, 248), 10).num_nodes == 10
+
+    def test_options(self) -> None:
+        cache = OptimizerCache()
+        sco = cache(Instance(32, 248), 10, shuffle_size=2000)
+        assert cache(Instance(32, 248), 10, shuffle_size=2000) is sco
+        assert cache(Instance(32, 248), 10) is not sco
+        assert sco.as_dict()['spark.sql.shuffle.partitions'] == 16200
+
+    def test_fleet(self) -> None:
+        cache = OptimizerCache()
+        sco = cache([(Instance(16, 120), 10), (Instance(32, 248), 4)])
+        # lists of a pair as from JSON are the same key as tuples
+        pairs: List[Any] = [[Instance(16, 120), 10], (Instance(32, 248), 4)]
+        assert cache(pairs) is sco
+
+    def test_eviction(self) -> None:
+        cache = OptimizerCache(maxsize=2)
+        first = cache(Instance(32, 248), 1)
+        cache(Instance(32, 248), 2)
+        # first becomes most recently used
+        assert cache(Instance(32, 248), 1) is first
+        cache(Instance(32, 248), 3)
+        assert cache(Instance(32, 248), 1) is first
+        assert cache.cache_info() == CacheInfo(2, 3, 1, 2, 2)
+
+    def test_cache_invalid_arguments(self) -> None:
+        cache = OptimizerCache()
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                cache(Instance(4, 16), 1, 'cluster')
+        assert cache.cache_info() == CacheInfo(1, 1, 0, 128, 1)
+
+    def test_cache_clear(self) -> None:
+        cache = OptimizerCache()
+        cache(Instance(32, 248), 10)
+        cache.cache_clear()
+        assert cache.cache_info() == CacheInfo(0, 0, 0, 128, 0)
+
+    def test_invalid_maxsize(self) -> None:
+        with pytest.raises(ValueError):
+            OptimizerCache(maxsize=0)
+
+    def test_threads(self) -> None:
+        cache = OptimizerCache(maxsize=8)
+        args = [(Instance(32, 248), n % 16 + 1) for n in range(1000)]
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(lambda a: cache(*a), args))
+        for (instance, num_nodes), sco in zip(args, results):
+            assert sco.num_nodes == num_nodes
+        info = cache.cache_info()
+        assert info.hits + info.misses == len(args)
+        assert info.currsize == 8
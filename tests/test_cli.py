@@ -0,0 +1,140 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from scopt.cli import analyze, generate, main
+
+
+class TestGenerate:
+    def test_jsonl(self, tmp_path: Path) -> None:
+        path = tmp_path / 'specs.jsonl'
+        path.write_text(
+            '{"instance_type": "r5.4xlarge", "num_nodes": 10}\n'
+            '\n'
+            '{"cores": 32, "memory": 248, "num_nodes": 10}\n'
+        )
+        output = tmp_path / 'output.jsonl'
+        assert main(['generate', str(path), '-o', str(output)]) == 0
+        lines = output.read_text().splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[0])['spark.executor.instances'] == 30
+        assert json.loads(lines[1])['spark.executor.instances'] == 60
+
+    def test_csv(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        path = tmp_path / 'specs.csv'
+        path.write_text(
+            'name,cores,memory,num_nodes,deploy_mode,dynamic_allocation\n'
+            'a,32,248,10,cluster,false\n'
+            'b,32,248,10,,true\n'
+        )
+        assert main(['generate', str(path)]) == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert json.loads(lines[0])['spark.executor.instances'] == 59
+        assert 'spark.executor.instances' not in json.loads(lines[1])
+
+    def test_spark_submit(self) -> None:
+        output = io.StringIO()
+        items = ['{"cores": 32, "memory": 248, "num_nodes": 10}']
+        assert generate(items, output, 'spark-submit') == 0
+        assert output.getvalue().startswith(
+            '--conf spark.driver.cores=5 --conf spark.driver.memory=36g '
+        )
+        assert output.getvalue().endswith(
+            '--conf spark.sql.shuffle.partitions=600\n'
+        )
+
+    def test_spark_defaults(self) -> None:
+        output = io.StringIO()
+        items = [
+            {'name': 'job', 'cores': '32', 'memory': '248', 'num_nodes': '10'}
+        ]
+        assert generate(items, output, 'spark-defaults') == 0
+        lines = output.getvalue().split('\n')
+        assert lines[:3] == [
+            '# job',
+            'spark.driver.cores 5',
+            'spark.driver.memory 36g',
+        ]
+        assert lines[-3:] == ['spark.sql.shuffle.partitions 600', '', '']
+
+    def test_invalid_spec(self, capsys: pytest.CaptureFixture[str]) -> None:
+        output = io.StringIO()
+        items = [
+            '{',
+            '{"num_nodes": 10}',
+            '{"cores": 4, "memory": 16, "num_nodes": 2}',
+        ]
+        assert generate(items, output) == 1
+        lines = output.getvalue().splitlines()
+        assert len(lines) == 3
+        assert 'error' in json.loads(lines[0])
+        assert json.loads(lines[1]) == {
+            'error': 'instance_type, cores and memory or fleet is required'
+        }
+        assert 'error' not in json.loads(lines[2])
+        assert 'spec 2: instance_type' in capsys.readouterr().err
+
+    @pytest.mark.parametrize('processes', [1, 2])
+    def test_malformed_row(
+        self, processes: int, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        valid = '{"cores": 4, "memory": 16, "num_nodes": 2}'
+        items = [
+            valid,
+            '{"cores": 4, "memory": "inf", "num_nodes": 2}',
+            # overflows in MB
+            '{"cores": 4, "memory": 1e308, "num_nodes": 2, "memory_mb": 1}',
+            valid,
+        ]
+        output = io.StringIO()
+        assert generate(items, output, processes=processes) == 1
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert len(lines) == 4
+        assert lines[0] == lines[3]
+        assert 'error' not in lines[0]
+        assert 'finite' in lines[1]['error']
+        assert 'finite in MB' in lines[2]['error']
+        assert 'spec 3:' in capsys.readouterr().err
+
+    def test_processes(self) -> None:
+        items = [
+            json.dumps({'cores': 32, 'memory': 248, 'num_nodes': n})
+            for n in range(1, 50)
+        ]
+        single = io.StringIO()
+        multi = io.StringIO()
+        generate(items, single)
+        generate(iter(items), multi, processes=2, chunk_size=7)
+        assert single.getvalue() == multi.getvalue()
+
+
+class TestAnalyze:
+    def test_analyze(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        path = tmp_path / 'eventlog'
+        path.write_text(
+            '{"Event":"SparkListenerExecutorRemoved","Executor ID":"3",'
+            '"Removed Reason":"Container killed by YARN"}\n'
+        )
+        spec = '{"cores": 32, "memory": 248, "num_nodes": 10}'
+        assert main(['analyze', str(path), spec]) == 0
+        result = json.loads(capsys.readouterr().out)
+        assert result['changes'][0].startswith('executor 3 was lost')
+        assert result['conf']['spark.executor.memoryOverhead'] == '9g'
+
+    def test_invalid(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        output = io.StringIO()
+        spec = '{"cores": 32, "memory": 248, "num_nodes": 10}'
+        assert analyze(str(tmp_path / 'not_exist'), spec, output) == 1
+        path = tmp_path / 'eventlog'
+        path.write_text('')
+        assert analyze(str(path), '[]', output) == 1
+        assert output.getvalue() == ''
+        assert 'Spec must be JSON object' in capsys.readouterr().err
@@ -0,0 +1,234 @@
+import gzip
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from scopt.eventlog import (
+    EventLogSummary,
+    StageMetrics,
+    analyze_event_log,
+    recommend,
+)
+from scopt.instances import Instance
+from scopt.optimizer import KubernetesOptimizer
+from scopt.profile import WorkloadProfile
+
+
+def _task(
+    stage_id: int,
+    duration: int = 1000,
+    gc_time: int = 0,
+    spilled: int = 0,
+    shuffle_read: int = 0,
+    **info: Any,
+) -> Dict[str, Any]:
+    return {
+        'Event': 'SparkListenerTaskEnd',
+        'Stage ID': stage_id,
+        'Stage Attempt ID': 0,
+        'Task End Reason': {'Reason': 'Success'},
+        'Task Info': {
+            'Executor ID': '1',
+            'Launch Time': 1000,
+            'Finish Time': 1000 + duration,
+            'Failed': False,
+            'Killed': False,
+            **info,
+        },
+        'Task Metrics': {
+            'Executor Run Time': duration,
+            'JVM GC Time': gc_time,
+            'Peak Execution Memory': 256 * 1024**2,
+            'Memory Bytes Spilled': spilled * 4,
+            'Disk Bytes Spilled': spilled,
+            'Shuffle Read Metrics': {
+                'Remote Bytes Read': shuffle_read,
+                'Local Bytes Read': shuffle_read,
+            },
+            'Input Metrics': {'Bytes Read': 1024**2},
+        },
+    }
+
+
+def _lines(events: List[Dict[str, Any]]) -> List[str]:
+    return [json.dumps(e) + '\n' for e in events]
+
+
+_EVENTS: List[Dict[str, Any]] = [
+    {'Event': 'SparkListenerLogStart', 'Spark Version': '3.1.1'},
+    {
+        'Event': 'SparkListenerEnvironmentUpdate',
+        'Spark Properties': {'spark.executor.cores': '5'},
+    },
+    {
+        'Event': 'SparkListenerStageSubmitted',
+        'Stage Info': {'Stage ID': 0, 'Stage Name': 'count at App.scala:10'},
+    },
+    _task(0, 1000, gc_time=100),
+    _task(0, 3000, gc_time=200),
+    _task(0, 9000, Failed=True),
+    {
+        'Event': 'SparkListenerExecutorRemoved',
+        'Executor ID': '2',
+        'Removed Reason': 'Executor killed by driver.',
+    },
+]
+
+
+class TestAnalyzeEventLog:
+    def test_lines(self) -> None:
+        summary = analyze_event_log(_lines(_EVENTS))
+        assert summary.stages == [
+            StageMetrics(
+                0,
+                'count at App.scala:10',
+                num_tasks=2,
+                run_time=4000,
+                gc_time=300,
+                peak_execution_memory=256 * 1024**2,
+                input_bytes=2 * 1024**2,
+                total_duration=4000,
+                max_duration=3000,
+            )
+        ]
+        assert summary.stages[0].skew == 1.5
+        assert summary.gc_ratio == 0.075
+        assert summary.lost_executors == {}
+        assert summary.properties == {'spark.executor.cores': '5'}
+
+    @pytest.mark.parametrize('compress', [False, True])
+    def test_file(self, tmp_path: Path, compress: bool) -> None:
+        path = tmp_path / 'eventlog'
+        data = ''.join(_lines(_EVENTS)).encode()
+        path.write_bytes(gzip.compress(data) if compress else data)
+        assert analyze_event_log(path) == analyze_event_log(_lines(_EVENTS))
+        assert analyze_event_log(str(path)).stages[0].num_tasks == 2
+
+    def test_lost_executors(self) -> None:
+        lost = _task(1, Failed=True)
+        lost['Task End Reason'] = {
+            'Reason': 'ExecutorLostFailure',
+            'Executor ID': '3',
+            'Loss Reason': 'Container killed by YARN for exceeding limits',
+        }
+        removed = {
+            'Event': 'SparkListenerExecutorRemoved',
+            'Executor ID': '4',
+            'Removed Reason': 'Container from a bad node',
+        }
+        summary = analyze_event_log(_lines([lost, removed]))
+        assert summary.lost_executors == {
+            '3': 'Container killed by YARN for exceeding limits',
+            '4': 'Container from a bad node',
+        }
+
+    def test_invalid_line(self) -> None:
+        with pytest.raises(ValueError, match='line 2'):
+            analyze_event_log(
+                [
+                    '{"Event":"SparkListenerLogStart"}',
+                    '{"Event":"SparkListenerTaskEnd",',
+                ]
+            )
+
+
+class TestRecommend:
+    def test_no_change(self) -> None:
+        recommendation = recommend(
+            analyze_event_log(_lines(_EVENTS)), Instance(32, 248), 10
+        )
+        assert recommendation.changes == []
+        assert recommendation.optimizer is recommendation.baseline
+        assert str(recommendation).startswith('# no change\n')
+
+    def test_lost_executors(self) -> None:
+        summary = EventLogSummary(lost_executors={'3': 'OOM'})
+        recommendation = recommend(summary, Instance(32, 248), 10)
+        assert recommendation.changes == [
+            'executor 3 was lost (OOM), heap fraction is lowered from 0.9 '
+            'to 0.8 for overhead'
+        ]
+        conf = recommendation.optimizer.as_dict()
+        assert conf['spark.executor.memory'] == '32g'
+        assert conf['spark.executor.memoryOverhead'] == '9g'
+
+        low = recommend(
+            summary,
+            Instance(32, 248),
+            10,
+            profile=WorkloadProfile(heap_fraction=0.55),
+        )
+        assert low.changes[0].endswith('heap fraction is already 0.55')
+        assert low.optimizer is low.baseline
+
+    def test_lost_executors_memory_mb(self) -> None:
+        summary = EventLogSummary(lost_executors={'3': 'OOM'})
+        recommendation = recommend(
+            summary, Instance(32, 248), 10, memory_mb=True
+        )
+        assert recommendation.changes[0].endswith(
+            'from 0.9 to 0.8 for overhead'
+        )
+        baseline = recommendation.baseline.as_dict()
+        assert baseline['spark.executor.memory'] == '38312m'
+        assert baseline['spark.executor.memoryOverhead'] == '3832m'
+        conf = recommendation.optimizer.as_dict()
+        assert conf['spark.executor.memory'] == '33715m'
+        assert conf['spark.executor.memoryOverhead'] == '8429m'
+
+    def test_gc(self) -> None:
+        summary = EventLogSummary([StageMetrics(0, run_time=100, gc_time=20)])
+        recommendation = recommend(summary, Instance(32, 248), 10)
+        assert recommendation.changes == [
+            'GC took 20% of task run time, executor cores are searched up '
+            'to 4 for smaller heaps'
+        ]
+        assert recommendation.optimizer.resolved.executor_cores < 5
+
+        kubernetes = recommend(summary, Instance(32, 248), 10, 'kubernetes')
+        assert kubernetes.changes[0].endswith('can not be lowered')
+        assert isinstance(kubernetes.optimizer.optimizer, KubernetesOptimizer)
+
+    def test_spill(self) -> None:
+        summary = analyze_event_log(
+            _lines(
+                [
+                    _task(1, spilled=1024**3, shuffle_read=50 * 1024**3),
+                    _task(1, shuffle_read=50 * 1024**3),
+                ]
+            )
+        )
+        recommendation = recommend(summary, Instance(32, 248), 10)
+        assert recommendation.changes == [
+            '1.0GB was spilled to disk, most by stage 1 with 256MB peak '
+            'execution memory of a task, parallelism is sized for 64MB '
+            'partitions'
+        ]
+        optimizer = recommendation.optimizer
+        assert optimizer.partition_size == 0.0625
+        assert optimizer.shuffle_size == 200
+        assert optimizer.as_dict()['spark.sql.shuffle.partitions'] == 3300
+
+    def test_skew(self) -> None:
+        tasks = [_task(2, 1000) for _ in range(10)] + [_task(2, 20000)]
+        summary = analyze_event_log(_lines(tasks))
+        recommendation = recommend(summary, Instance(32, 248), 10)
+        assert recommendation.changes == [
+            'longest task of stage 2 took 7.3 times of the mean, adaptive '
+            'query execution is enabled for skew join'
+        ]
+        assert recommendation.optimizer.adaptive
+        assert (
+            recommend(summary, Instance(32, 248), 10, adaptive=True)
+            .changes[0]
+            .endswith('already enabled')
+        )
+        # too few tasks to judge
+        few = analyze_event_log(_lines(tasks[-5:]))
+        assert recommend(few, Instance(32, 248), 10).changes == []
+
+    def test_invalid_arguments(self) -> None:
+        with pytest.raises(ValueError):
+            recommend(EventLogSummary(), Instance(32, 248))
@@ -0,0 +1,337 @@
+import ast
+import json
+import math
+from typing import Any, Dict, Tuple
+
+import pytest
+
+from scopt.explain import Explanation, Step, explain
+from scopt.instances import Instance
+from scopt.optimizer import MemoryMb, ResolvedConf, SparkConfOptimizer
+
+FLEET = [(Instance(16, 128), 10), (Instance(32, 128), 5)]
+# property to the name of explained value which it formats
+VALUES = {
+    'spark.driver.cores': 'driver_cores',
+    'spark.driver.memory': 'driver_memory',
+    'spark.driver.memoryOverhead': 'driver_memory_overhead',
+    'spark.executor.cores': 'executor_cores',
+    'spark.executor.memory': 'executor_memory',
+    'spark.executor.memoryOverhead': 'executor_memory_overhead',
+    'spark.executor.instances': 'executor_instances',
+    'spark.default.parallelism': 'default_parallelism',
+    'spark.sql.shuffle.partitions': 'sql_shuffle_partitions',
+    'spark.memory.offHeap.size': 'executor_off_heap_memory',
+    'spark.executor.pyspark.memory': 'executor_pyspark_memory',
+    'spark.kubernetes.driver.request.cores': 'request_cores',
+    'spark.kubernetes.driver.limit.cores': 'limit_cores',
+    'spark.kubernetes.executor.request.cores': 'request_cores',
+    'spark.kubernetes.executor.limit.cores': 'limit_cores',
+    'spark.task.resource.gpu.amount': 'task_gpu_amount',
+    'spark.rapids.sql.concurrentGpuTasks': 'concurrent_gpu_tasks',
+}
+# properties of fixed or given values
+FIXED = {
+    'spark.dynamicAllocation.enabled',
+    'spark.dynamicAllocation.executorAllocationRatio',
+    'spark.dynamicAllocation.shuffleTracking.enabled',
+    'spark.dynamicAllocation.shuffleTracking.timeout',
+    'spark.dynamicAllocation.executorIdleTimeout',
+    'spark.dynamicAllocation.cachedExecutorIdleTimeout',
+    'spark.sql.adaptive.enabled',
+    'spark.memory.offHeap.enabled',
+    'spark.memory.fraction',
+    'spark.memory.storageFraction',
+    'spark.kubernetes.memoryOverheadFactor',
+    'spark.executor.resource.gpu.amount',
+    'spark.task.cpus',
+}
+OPTIMIZERS = [
+    ((Instance(32, 250), 10, 'cluster'), {'adaptive': True}),
+    (
+        (Instance(16, 120, network_bandwidth=25), 10),
+        {'network': True, 'pyspark': True},
+    ),
+    ((Instance(16, 120, network_bandwidth=1), 100), {'network': True}),
+    (
+        (Instance(32, 248), 10, 'cluster'),
+        {'dynamic_allocation': True, 'min_nodes': 2, 'adaptive': True},
+    ),
+    (
+        (Instance(32, 248),),
+        {'dynamic_allocation': True, 'min_nodes': 1, 'max_nodes': 10},
+    ),
+    (
+        (Instance(4, 16, network_bandwidth=10), 2),
+        {'profile': 'etl', 'memory_mb': True, 'network': True},
+    ),
+    (
+        (Instance(16, 120, network_bandwidth=25), 10),
+        {
+            'pyspark': True,
+            'memory_mb': True,
+            'adaptive': True,
+            'network': True,
+        },
+    ),
+    (
+        (Instance(32, 250), 10, 'kubernetes'),
+        {'adaptive': True, 'shuffle_size': 2000},
+    ),
+    ((Instance(32, 236, 4, 16), 10, 'cluster'), {'gpu': True}),
+    (
+        (
+            [
+                (Instance(16, 128, network_bandwidth=10), 5),
+                (Instance(32, 128, network_bandwidth=25), 10),
+            ],
+        ),
+        {'network': True, 'adaptive': True},
+    ),
+]
+# functions of formulas
+FUNCTIONS = {
+    'floor': math.floor,
+    'ceil': math.ceil,
+    'min': min,
+    'max': max,
+    'log2': math.log2,
+}
+
+
+class TestExplain:
+    @pytest.mark.parametrize(
+        'args, kwargs',
+        [
+            ((Instance(32, 250), 10, 'client'), {}),
+            ((Instance(32, 250), 10, 'cluster'), {}),
+            ((Instance(4, 16), 1, 'client'), {}),
+            (
+                (Instance(32, 250), 10, 'client'),
+                {'driver_instance': Instance(4, 16)},
+            ),
+            (
+                (Instance(32, 250), 10, 'cluster'),
+                {'executor_cores_range': (3, 8)},
+            ),
+            ((Instance(32, 250), 10, 'kubernetes'), {}),
+            ((Instance(32, 236, 4, 16), 10, 'client'), {'gpu': True}),
+            ((Instance(32, 236, 4, 16), 10, 'cluster'), {'gpu': True}),
+            ((FLEET,), {}),
+            ((FLEET, None, 'cluster'), {}),
+            (
+                (Instance(32, 250), 10),
+                {
+                    'profile': 'ml-cache',
+                    'pyspark': True,
+                    'input_size': 100,
+                    'shuffle_size': 2000,
+                },
+            ),
+            ((Instance(32, 250), 10, 'kubernetes'), {'memory_mb': True}),
+            ((FLEET, None, 'cluster'), {'memory_mb': True}),
+            (
+                (Instance(32, 250), 10),
+                {'profile': 'etl', 'memory_mb': True},
+            ),
+            ((Instance(2, 2), 1), {'profile': 'ml-cache', 'memory_mb': True}),
+            (
+                (Instance(32, 250), 10),
+                {'profile': 'etl', 'pyspark': True, 'memory_mb': True},
+            ),
+        ],
+    )
+    def test_same_as_optimizer(
+        self, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> None:
+        sco = SparkConfOptimizer(*args, **kwargs)
+        explanation = explain(sco)
+        # the last step of a name is the value of the optimizer
+        values: Dict[str, Any] = {s.name: s.value for s in explanation.steps}
+        resolved = ResolvedConf(
+            **{n: values.get(n, 0) for n in ResolvedConf._fields}
+        )
+        assert resolved == sco.resolved
+        if sco.memory_mb is not None:
+            memory = [values.get(f'{n}_mb', 0) for n in MemoryMb._fields]
+            assert MemoryMb(*memory) == sco.memory_mb
+        for step in explanation.steps:
+            assert step.rule
+            assert step.formula
+            assert step.elapsed >= 0.0
+
+    @pytest.mark.parametrize('args, kwargs', OPTIMIZERS)
+    def test_same_as_dict(
+        self, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> None:
+        sco = SparkConfOptimizer(*args, **kwargs)
+        explanation = explain(sco)
+        names = {s.name for s in explanation.steps}
+        for key, value in sco.as_dict().items():
+            if key in FIXED:
+                continue
+            if key in names:
+                assert explanation[key].value == value
+                continue
+            name = VALUES[key]
+            if sco.memory_mb is not None and f'{name}_mb' in names:
+                name = f'{name}_mb'
+            explained = explanation[name].value
+            assert str(value) in (
+                f'{explained}',
+                f'{explained}g',
+                f'{explained}m',
+            )
+
+    @pytest.mark.parametrize('args, kwargs', OPTIMIZERS)
+    def test_formulas(
+        self, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> None:
+        # arithmetic formulas give the explained values
+        evaluated = 0
+        for step in explain(SparkConfOptimizer(*args, **kwargs)).steps:
+            try:
+                tree = ast.parse(step.formula, mode='eval')
+            except SyntaxError:
+                continue
+            called = {n.id for n in ast.walk(tree) if isinstance(n, ast.Name)}
+            if not called <= set(FUNCTIONS):
+                continue
+            value = step.value
+            if isinstance(value, str):
+                value = float(value.rstrip('gmks'))
+            result = eval(compile(tree, '<formula>', 'eval'), {**FUNCTIONS})
+            assert result == value, step
+            evaluated += 1
+        assert evaluated >= 10
+
+    def test_properties(self) -> None:
+        explanation = explain(
+            SparkConfOptimizer(
+                Instance(16, 120, network_bandwidth=25),
+                10,
+                network=True,
+                adaptive=True,
+            )
+        )
+        bandwidth = explanation['executor_bandwidth']
+        assert (bandwidth.value, bandwidth.formula) == (25 / 3, '25 / 3')
+        in_flight = explanation['spark.reducer.maxSizeInFlight']
+        assert in_flight.value == '104m'
+        assert in_flight.binding == 'network'
+        advisory = explanation[
+            'spark.sql.adaptive.advisoryPartitionSizeInBytes'
+        ]
+        assert (
+            advisory.formula
+            == 'min(max(floor(35840 * 0.6 / 5 / 16), 64), 1024)'
+        )
+        assert advisory.binding == 'task memory'
+
+    def test_group_elapsed(self) -> None:
+        explanation = explain(
+            SparkConfOptimizer(Instance(16, 120), 10, adaptive=True)
+        )
+        steps = [
+            s
+            for s in explanation.steps
+            if s.name.startswith('spark.sql.adaptive.')
+        ]
+        assert len(steps) > 1
+        assert all(s.elapsed == 0.0 for s in steps[1:])
+
+    def test_steps(self) -> None:
+        explanation = SparkConfOptimizer(
+            Instance(32, 250), 10, 'cluster'
+        ).explain()
+        assert explanation['executor_cores'] == Step(
+            'executor_cores',
+            5,
+            '5-core cap',
+            '5 if 32 > 5 else max(32 - 1, 1)',
+            'cap',
+            explanation['executor_cores'].elapsed,
+        )
+        per_node = explanation['executor_per_node']
+        assert (per_node.value, per_node.binding) == (6, 'cores')
+        assert per_node.formula == 'max(floor((32 - 1) / 5), 1)'
+        instances = explanation['executor_instances']
+        assert (instances.value, instances.rule) == (59, 'driver slot')
+        assert instances.formula == '6 * 10 - 1'
+        with pytest.raises(KeyError):
+            explanation['request_cores']
+
+    def test_binding(self) -> None:
+        small = explain(
+            SparkConfOptimizer(
+                Instance(32, 250), 10, driver_instance=Instance(4, 16)
+            )
+        )
+        assert small['driver_cores'].binding == 'driver instance'
+        assert small['driver_memory'].value == 13
+        large = explain(
+            SparkConfOptimizer(
+                Instance(32, 250), 10, driver_instance=Instance(64, 512)
+            )
+        )
+        assert large['driver_memory'].binding == 'executor'
+        assert large['driver_memory'].formula == (
+            'min(floor(floor(512 - 1) * 0.9), 36)'
+        )
+        few_cores = explain(SparkConfOptimizer(Instance(4, 16), 1))
+        assert few_cores['executor_cores'].binding == 'cores'
+        fleet = explain(SparkConfOptimizer(FLEET))
+        assert fleet['executor_per_node'].formula == 'min(3, 3)'
+
+    def test_adjusted_values(self) -> None:
+        explanation = explain(
+            SparkConfOptimizer(
+                Instance(32, 250), 10, profile='etl', input_size=100
+            )
+        )
+        heaps = [s for s in explanation.steps if s.name == 'executor_memory']
+        assert [(s.value, s.rule) for s in heaps] == [
+            (36, '90% heap'),
+            (28, 'profile heap'),
+        ]
+        parallelism = explanation['default_parallelism']
+        assert parallelism.value == 900
+        assert parallelism.rule == 'partition size'
+
+    def test_memory_mb(self) -> None:
+        explanation = explain(
+            SparkConfOptimizer(
+                Instance(16, 120), 10, 'cluster', memory_mb=True
+            )
+        )
+        total = explanation['total_executor_memory_mb']
+        assert total.value == 40608
+        assert total.formula == 'floor((120 - 1) * 1024 / 3) in 32MB units'
+        heap = explanation['executor_memory_mb']
+        assert (heap.value, heap.binding) == (36916, 'overhead factor')
+        assert explanation['driver_memory_overhead_mb'].value == 3692
+        small = explain(SparkConfOptimizer(Instance(2, 2), 1, memory_mb=True))
+        assert small['executor_memory_mb'].binding == 'minimum overhead'
+        assert small['executor_memory_overhead_mb'].value == 384
+
+    def test_output(self) -> None:
+        sco = SparkConfOptimizer(Instance(32, 250), 10)
+        explanation = explain(sco)
+        assert isinstance(explanation, Explanation)
+        text = str(explanation)
+        assert text.startswith('executor_cores = 5 [cap] (')
+        assert '\n    daemon reserve: floor((250 - 1) / 6)\n' in text
+        assert text.endswith(str(sco))
+        data = json.loads(json.dumps(explanation.as_dict()))
+        assert data['conf'] == sco.as_dict()
+        assert data['steps'][1]['name'] == 'executor_per_node'
+        assert data['steps'][1]['binding'] == 'cores'
+        html = explanation._repr_html_()
+        assert '<td style="text-align:left">daemon reserve</td>' in html
+        assert 'spark.executor.instances' in html
+
+    def test_not_evaluated_on_optimizer(self) -> None:
+        sco = SparkConfOptimizer(Instance(32, 250), 10)
+        cached = dict(vars(sco.optimizer))
+        explain(sco)
+        assert vars(sco.optimizer) == cached
@@ -1,11 +1,29 @@
+import pickle
+from typing import Any, Dict, List, Tuple
+
 import pytest
 
 from scopt.instances import Instance
+from scopt.instances.aws import AwsInstanceMap
 from scopt.optimizer import (
     ClientModeOptimizer,
     ClusterModeOptimizer,
+    DeployMode,
+    ExecutorShape,
+    FleetOptimizer,
+    FleetUsage,
+    GpuOptimizer,
+    KubernetesConf,
+    KubernetesOptimizer,
+    MemoryMb,
+    ResolvedConf,
     SparkConfOptimizer,
+    executor_shape,
+    partitions_for_size,
+    search_executor_shape,
+    split_memory_mb,
 )
+from scopt.profile import WorkloadProfile
 
 
 class TestClusterModeOptimizer:
@@ -86,6 +104,236 @@ class TestClientModeOptimizer:
         assert optimizer.sql_shuffle_partitions == 60
 
 
+class TestExecutorShape:
+    def test_executor_shape(self) -> None:
+        shape = executor_shape(64, 512, 5)
+        assert shape == ExecutorShape(5, 12, 42, 60 / 63, 12 * 42 / 511)
+
+    def test_memory_over_max_executor_memory(self) -> None:
+        shape = executor_shape(8, 512, 5)
+        # 459GB heap is counted as 64GB
+        assert shape.total_executor_memory == 511
+        assert shape.memory_utilization == (64 + 52) / 511
+
+    def test_no_memory_for_executor(self) -> None:
+        # 1GB node has only the hadoop daemon memory
+        with pytest.raises(ValueError):
+            executor_shape(4, 1, 3)
+        with pytest.raises(ValueError):
+            SparkConfOptimizer(Instance(4, 1), 2, executor_cores_range=(1, 3))
+        with pytest.raises(ValueError):
+            SparkConfOptimizer(
+                AwsInstanceMap()['c4.large'], 2, executor_cores_range=(1, 3)
+            )
+
+    def test_search(self) -> None:
+        shape = search_executor_shape(64, 512, (3, 8))
+        assert shape.executor_cores == 7
+        assert shape.executor_per_node == 9
+        assert shape.core_utilization == 1.0
+        assert shape.utilization > executor_shape(64, 512, 5).utilization
+
+    def test_search_prefer_5_cores(self) -> None:
+        assert search_executor_shape(16, 128, (3, 8)).executor_cores == 5
+        assert search_executor_shape(16, 128, (1, 3)).executor_cores == 3
+
+    def test_search_empty_range(self) -> None:
+        with pytest.raises(ValueError):
+            search_executor_shape(4, 32, (5, 8))
+        with pytest.raises(ValueError):
+            search_executor_shape(64, 512, (8, 3))
+
+
+class TestGpuOptimizer:
+    def test_properties(self) -> None:
+        optimizer = GpuOptimizer(Instance(32, 236, 4, 16), 4)
+        assert optimizer.executor_per_node == 4
+        assert optimizer.executor_cores == 7
+        assert optimizer.total_executor_memory == 58
+        assert optimizer.executor_memory == 52
+        assert optimizer.executor_memory_overhead == 6
+        assert optimizer.executor_instances == 16
+        assert optimizer.task_gpu_amount == '0.1428'
+        assert optimizer.concurrent_gpu_tasks == 2
+        assert optimizer.default_parallelism == 224
+
+    def test_cluster_mode(self) -> None:
+        optimizer = GpuOptimizer(Instance(8, 53, 1, 16), 2, DeployMode.CLUSTER)
+        assert optimizer.executor_instances == 1
+        assert optimizer.driver_cores == optimizer.executor_cores == 7
+        assert optimizer.task_gpu_amount == '0.1428'
+        with pytest.raises(ValueError, match='GPU'):
+            GpuOptimizer(Instance(8, 53, 1, 16), 1, DeployMode.CLUSTER)
+
+    def test_no_gpu(self) -> None:
+        with pytest.raises(ValueError, match='GPU'):
+            GpuOptimizer(Instance(16, 120), 4)
+
+
+class TestKubernetesOptimizer:
+    def test_properties(self) -> None:
+        optimizer = KubernetesOptimizer(Instance(16, 128), 10)
+        assert optimizer.executor_cores == 5
+        assert optimizer.executor_per_node == 3
+        assert optimizer.request_cores == '5166m'
+        assert optimizer.limit_cores == 6
+        assert optimizer.total_executor_memory == 42
+        assert optimizer.executor_memory == 38
+        assert optimizer.executor_memory_overhead == 4
+        assert optimizer.driver_cores == 5
+        assert optimizer.driver_memory == 38
+        assert optimizer.driver_memory_overhead == 4
+        assert optimizer.executor_instances == 29
+        assert optimizer.default_parallelism == 290
+        assert optimizer.sql_shuffle_partitions == 290
+
+    def test_reservation(self) -> None:
+        conf = KubernetesConf(reserved_cores=0.1, reserved_memory=1)
+        optimizer = KubernetesOptimizer(Instance(4, 32), 2, conf)
+        assert optimizer.executor_cores == 3
+        assert optimizer.executor_per_node == 1
+        assert optimizer.request_cores == '3900m'
+        assert optimizer.limit_cores == 4
+        assert optimizer.total_executor_memory == 31
+        optimizer = KubernetesOptimizer(Instance(64, 512), 2, conf)
+        assert optimizer.executor_per_node == 12
+        assert optimizer.request_cores == '5325m'
+        assert optimizer.total_executor_memory == 42
+
+    def test_memory_overhead_factor(self) -> None:
+        conf = KubernetesConf(memory_overhead_factor=0.4)
+        optimizer = KubernetesOptimizer(Instance(16, 128), 10, conf)
+        assert optimizer.executor_memory == 30
+        assert optimizer.executor_memory_overhead == 12
+        assert (
+            optimizer.as_dict()['spark.kubernetes.memoryOverheadFactor']
+            == '0.4'
+        )
+
+    def test_insufficient_resource(self) -> None:
+        with pytest.raises(ValueError, match='cpu cores'):
+            KubernetesOptimizer(Instance(1, 128), 10)
+        with pytest.raises(ValueError, match='memory'):
+            KubernetesOptimizer(Instance(16, 4), 10)
+        with pytest.raises(ValueError, match='number of nodes'):
+            KubernetesOptimizer(Instance(4, 16), 1)
+
+    @pytest.mark.parametrize(
+        'kwargs',
+        [
+            {'reserved_cores': -1},
+            {'reserved_memory': -1},
+            {'memory_overhead_factor': 0},
+        ],
+    )
+    def test_invalid_conf(self, kwargs: Dict[str, float]) -> None:
+        with pytest.raises(ValueError):
+            KubernetesConf(**kwargs)
+
+
+class TestFleetOptimizer:
+    def test_single_type_same_as_client_mode(self) -> None:
+        fleet = FleetOptimizer([(Instance(32, 248), 10)])
+        client = ClientModeOptimizer(Instance(32, 248), 10)
+        assert ResolvedConf.from_optimizer(
+            fleet
+        ) == ResolvedConf.from_optimizer(client)
+
+    def test_mixed_types(self) -> None:
+        optimizer = FleetOptimizer(
+            [(Instance(16, 128), 5), (Instance(32, 128), 10)]
+        )
+        # executors sized for 16 cores node leave half cores of 32 cores
+        # nodes unused, 21GB executors use cores of both types
+        assert optimizer.executor_cores == 5
+        assert optimizer.total_executor_memory == 21
+        assert optimizer.executor_memory == 18
+        assert optimizer.executor_memory_overhead == 3
+        assert optimizer.executor_instances == 75
+        assert optimizer.executor_per_node == 3
+        assert optimizer.default_parallelism == 750
+        assert optimizer.usage == (
+            FleetUsage(Instance(16, 128), 5, 3, 0, 320),
+            FleetUsage(Instance(32, 128), 10, 6, 10, 10),
+        )
+
+    def test_cluster_mode(self) -> None:
+        optimizer = FleetOptimizer(
+            [(Instance(16, 120), 2), (Instance(32, 248), 1)],
+            DeployMode.CLUSTER,
+        )
+        assert optimizer.executor_instances == 11
+        assert optimizer.driver_cores == optimizer.executor_cores
+        assert optimizer.driver_memory == optimizer.executor_memory
+
+    @pytest.mark.parametrize(
+        'fleet',
+        [
+            [],
+            [(Instance(16, 120), 0)],
+            [(Instance(16, 120), 1), (Instance(4, 1), 1)],
+        ],
+    )
+    def test_invalid_fleet(self, fleet: List[Tuple[Instance, int]]) -> None:
+        with pytest.raises(ValueError):
+            FleetOptimizer(fleet)
+
+
+class TestResolvedConf:
+    def test_from_optimizer(self) -> None:
+        optimizer = ClusterModeOptimizer(Instance(32, 248), 10)
+        resolved = ResolvedConf.from_optimizer(optimizer)
+        assert resolved == ResolvedConf(
+            5, 6, 41, 36, 5, 5, 36, 5, 59, 590, 590
+        )
+
+    def test_evaluate_once(self) -> None:
+        optimizer = ClientModeOptimizer(Instance(32, 248), 10)
+        ResolvedConf.from_optimizer(optimizer)
+        optimizer.core_per_node = 4
+        # values are not recomputed from changed attribute
+        assert optimizer.executor_cores == 5
+        assert optimizer.default_parallelism == 600
+
+    def test_immutability(self) -> None:
+        resolved = SparkConfOptimizer(Instance(32, 248), 10).resolved
+        with pytest.raises(AttributeError):
+            resolved.executor_cores = 1  # type: ignore[misc]
+        with pytest.raises(AttributeError):
+            resolved.__dict__
+
+    def test_pickle(self) -> None:
+        resolved = SparkConfOptimizer(Instance(32, 248), 10).resolved
+        assert pickle.loads(pickle.dumps(resolved)) == resolved
+
+
+class TestPartitionsForSize:
+    def test_round_up_to_multiple_of_cores(self) -> None:
+        assert partitions_for_size(2000, 0.125, 300) == 16200
+        assert partitions_for_size(100, 0.125, 300) == 900
+        assert partitions_for_size(0.01, 0.125, 300) == 300
+        assert partitions_for_size(37.5, 0.125, 300) == 300
+
+    @pytest.mark.parametrize('size', [0, -1])
+    def test_invalid_size(self, size: float) -> None:
+        with pytest.raises(ValueError, match='shuffle_size'):
+            partitions_for_size(size, 0.125, 300, 'shuffle_size')
+
+
+class TestSplitMemoryMb:
+    def test_overhead_factor(self) -> None:
+        assert split_memory_mb(40608) == (36916, 3692)
+        assert split_memory_mb(40608, 0.2) == (33840, 6768)
+
+    def test_minimum_overhead(self) -> None:
+        assert split_memory_mb(2048) == (1664, 384)
+        assert split_memory_mb(385) == (1, 384)
+
+    def test_invalid(self) -> None:
+        with pytest.raises(ValueError, match='384m'):
+            split_memory_mb(384)
+
+
 class TestSparkConfOptimizer:
     def test_cluster_mode(self) -> None:
         optimizer = SparkConfOptimizer(Instance(32, 248), 10, 'cluster')
@@ -202,3 +450,536 @@ class TestSparkConfOptimizer:
             ('spark.sql.shuffle.partitions', 600),
         ]
         assert optimizer.as_list() == expected
+
+    def test_as_dict_data_size(self) -> None:
+        optimizer = SparkConfOptimizer(
+            Instance(32, 248),
+            10,
+            'client',
+            input_size=100,
+            shuffle_size=2000,
+        )
+        conf = optimizer.as_dict()
+        assert conf['spark.default.parallelism'] == 900
+        assert conf['spark.sql.shuffle.partitions'] == 16200
+
+        optimizer = SparkConfOptimizer(
+            Instance(32, 248), 10, 'client', shuffle_size=10, partition_size=1
+        )
+        conf = optimizer.as_dict()
+        # fallback to core count without input_size
+        assert conf['spark.default.parallelism'] == 600
+        assert conf['spark.sql.shuffle.partitions'] == 300
+
+    @pytest.mark.parametrize(
+        'kwargs',
+        [{'partition_size': 0}, {'input_size': 0}, {'shuffle_size': -1}],
+    )
+    def test_invalid_data_size(self, kwargs: Dict[str, Any]) -> None:
+        with pytest.raises(ValueError):
+            SparkConfOptimizer(Instance(32, 248), 10, 'client', **kwargs)
+
+    def test_as_dict_adaptive(self) -> None:
+        optimizer = SparkConfOptimizer(
+            Instance(32, 248), 10, 'client', adaptive=True
+        )
+        conf = optimizer.as_dict()
+        assert conf['spark.sql.shuffle.partitions'] == 600
+        assert {k: v for k, v in conf.items() if 'adaptive' in k} == {
+            'spark.sql.adaptive.enabled': 'true',
+            'spark.sql.adaptive.advisoryPartitionSizeInBytes': '276m',
+            'spark.sql.adaptive.coalescePartitions.minPartitionSize': '34m',
+            'spark.sql.adaptive.coalescePartitions.initialPartitionNum': 1200,
+            'spark.sql.adaptive.skewJoin.skewedPartitionThresholdInBytes': (
+                '1104m'
+            ),
+        }
+
+    def test_as_dict_adaptive_bounds(self) -> None:
+        key = 'spark.sql.adaptive.advisoryPartitionSizeInBytes'
+        small = SparkConfOptimizer(Instance(8, 8), 2, adaptive=True)
+        assert small.as_dict()[key] == '64m'
+        large = SparkConfOptimizer(Instance(2, 248), 2, adaptive=True)
+        assert large.as_dict()[key] == '1024m'
+        # little task memory of a 2.5GB node does not go below advisory
+        tiny = SparkConfOptimizer(Instance(2, 2.5), 2, adaptive=True)
+        assert tiny.as_dict()[key] == '64m'
+        assert (
+            tiny.as_dict()[
+                'spark.sql.adaptive.skewJoin.skewedPartitionThresholdInBytes'
+            ]
+            == '64m'
+        )
+        dynamic = SparkConfOptimizer(
+            Instance(32, 248), dynamic_allocation=True, adaptive=True
+        )
+        assert (
+            'spark.sql.adaptive.coalescePartitions.initialPartitionNum'
+            not in dynamic.as_dict()
+        )
+
+    def test_as_dict_network(self) -> None:
+        optimizer = SparkConfOptimizer(
+            Instance(16, 120, network_bandwidth=25), 10, network=True
+        )
+        assert optimizer.executor_bandwidth == 25 / 3
+        conf = optimizer.as_dict()
+        assert {
+            k: v
+            for k, v in conf.items()
+            if k.startswith(('spark.reducer', 'spark.shuffle', 'spark.net'))
+        } == {
+            'spark.reducer.maxSizeInFlight': '104m',
+            'spark.reducer.maxReqsInFlight': 29,
+            'spark.shuffle.io.numConnectionsPerPeer': 1,
+            'spark.shuffle.file.buffer': '256k',
+            'spark.network.timeout': '120s',
+        }
+        default = SparkConfOptimizer(
+            Instance(16, 120, network_bandwidth=25), 10
+        )
+        assert 'spark.reducer.maxSizeInFlight' not in default.as_dict()
+
+    def test_as_dict_network_bounds(self) -> None:
+        # few peers on a fast link use more connections per peer
+        fast = SparkConfOptimizer(
+            Instance(16, 120, network_bandwidth=100), 2, network=True
+        ).as_dict()
+        assert fast['spark.reducer.maxSizeInFlight'] == '256m'
+        assert fast['spark.reducer.maxReqsInFlight'] == 5
+        assert fast['spark.shuffle.io.numConnectionsPerPeer'] == 2
+        assert fast['spark.shuffle.file.buffer'] == '1024k'
+        # slow link on a large cluster waits longer
+        slow = SparkConfOptimizer(
+            Instance(16, 120, network_bandwidth=1), 100, network=True
+        ).as_dict()
+        assert slow['spark.reducer.maxSizeInFlight'] == '48m'
+        assert slow['spark.shuffle.file.buffer'] == '32k'
+        assert slow['spark.network.timeout'] == '600s'
+
+    def test_network_fleet(self) -> None:
+        optimizer = SparkConfOptimizer(
+            [
+                (Instance(16, 128, network_bandwidth=10), 5),
+                (Instance(32, 128, network_bandwidth=25), 10),
+            ],
+            network=True,
+        )
+        # 10Gbps shared by 3 executors is slower than 25Gbps by 6
+        assert optimizer.executor_bandwidth == 10 / 3
+
+    def test_network_unknown_bandwidth(self) -> None:
+        with pytest.raises(ValueError, match='network_bandwidth'):
+            SparkConfOptimizer(Instance(16, 120), 10, network=True)
+        with pytest.raises(ValueError, match='network_bandwidth'):
+            SparkConfOptimizer(
+                [
+                    (Instance(16, 128, network_bandwidth=10), 5),
+                    (Instance(32, 128), 10),
+                ],
+                network=True,
+            )
+
+    def test_as_dict_memory_mb(self) -> None:
+        optimizer = SparkConfOptimizer(Instance(16, 120), 200, memory_mb=True)
+        # 3 executors share (120 - 1) * 1024MB in 32MB units, and driver
+        # is capped by executor
+        assert optimizer.memory_mb == MemoryMb(
+            40608, 36916, 3692, 121856, 36916, 3692
+        )
+        assert optimizer.resolved.executor_memory == 35
+        conf = optimizer.as_dict()
+        assert (
+            list(conf)[:6]
+            == list(SparkConfOptimizer(Instance(16, 120), 200).as_dict())[:6]
+        )
+        assert conf['spark.driver.memory'] == '36916m'
+        assert conf['spark.driver.memoryOverhead'] == '3692m'
+        assert conf['spark.executor.memory'] == '36916m'
+        assert conf['spark.executor.memoryOverhead'] == '3692m'
+        assert conf['spark.executor.instances'] == 600
+
+    def test_memory_mb_client_driver(self) -> None:
+        small = SparkConfOptimizer(
+            Instance(16, 120),
+            10,
+            driver_instance=Instance(4, 16),
+            memory_mb=True,
+        )
+        assert small.memory_mb is not None
+        assert small.memory_mb[3:6] == (15360, 13963, 1397)
+        large = SparkConfOptimizer(
+            Instance(16, 120),
+            10,
+            driver_instance=Instance(64, 512),
+            memory_mb=True,
+        )
+        assert large.memory_mb is not None
+        assert large.memory_mb[4:6] == (36916, 3692)
+
+    @pytest.mark.parametrize(
+        'executor_instance, deploy_mode, kwargs, expected',
+        [
+            (Instance(32, 250), 'kubernetes', {}, 42325),
+            (Instance(32, 236, 4, 16), 'cluster', {'gpu': True}, 60160),
+            (
+                [(Instance(16, 128), 10), (Instance(32, 128), 5)],
+                'client',
+                {},
+                43328,
+            ),
+        ],
+    )
+    def test_memory_mb_optimizers(
+        self,
+        executor_instance: Any,
+        deploy_mode: str,
+        kwargs: Dict[str, Any],
+        expected: int,
+    ) -> None:
+        num_nodes = 10 if isinstance(executor_instance, Instance) else None
+        optimizer = SparkConfOptimizer(
+            executor_instance,
+            num_nodes,
+            deploy_mode,
+            memory_mb=True,
+            **kwargs,
+        )
+        assert optimizer.memory_mb is not None
+        assert optimizer.memory_mb.total_executor_memory == expected
+        # more memory than whole GB sizing
+        assert expected >= optimizer.resolved.total_executor_memory * 1024
+
+    def test_memory_mb_profile(self) -> None:
+        optimizer = SparkConfOptimizer(
+            Instance(16, 120), 10, profile='etl', memory_mb=True
+        )
+        # executor container is split by the profile, and driver is capped
+        # by the executor
+        assert optimizer.memory_mb == MemoryMb(
+            40608, 28425, 4062, 121856, 28425, 4062, 8121
+        )
+        conf = optimizer.as_dict()
+        assert conf['spark.executor.memory'] == '28425m'
+        assert conf['spark.memory.offHeap.size'] == '8121m'
+        assert conf['spark.memory.fraction'] == '0.8'
+        # overhead is not lower than Spark's minimum
+        small = SparkConfOptimizer(
+            Instance(2, 2),
+            1,
+            profile=WorkloadProfile(heap_fraction=0.9),
+            memory_mb=True,
+        )
+        assert small.memory_mb is not None
+        assert small.memory_mb.executor_memory_overhead == 384
+        assert 'spark.memory.offHeap.size' not in small.as_dict()
+
+    def test_memory_mb_fits_yarn(self) -> None:
+        for instance in AwsInstanceMap().values():
+            for deploy_mode in ('client', 'cluster'):
+                try:
+                    optimizer = SparkConfOptimizer(
+                        instance, 2, deploy_mode, memory_mb=True
+                    )
+                except ValueError:
+                    continue
+                memory = optimizer.memory_mb
+                assert memory is not None
+                container = (
+                    memory.executor_memory + memory.executor_memory_overhead
+                )
+                assert container % 32 == 0
+                assert memory.executor_memory_overhead >= max(
+                    384, memory.executor_memory * 0.1
+                )
+                assert (
+                    container * optimizer.resolved.executor_per_node + 1024
+                    <= instance.memory_size * 1024
+                )
+
+    def test_memory_mb_pyspark(self) -> None:
+        optimizer = SparkConfOptimizer(
+            Instance(16, 120), 10, pyspark=True, memory_mb=True
+        )
+        assert optimizer.resolved.executor_pyspark_memory == 5
+        # python workers are reserved from MB heap, and driver is capped by
+        # executor heap before the reserve same as GB sizing
+        assert optimizer.memory_mb == MemoryMb(
+            40608, 36916 - 5 * 1024, 3692, 121856, 36916, 3692
+        )
+        conf = optimizer.as_dict()
+        assert conf['spark.executor.memory'] == '31796m'
+        assert conf['spark.executor.pyspark.memory'] == '5g'
+
+    def test_memory_mb_adaptive_network(self) -> None:
+        instance = Instance(4, 16, network_bandwidth=25)
+        gb = SparkConfOptimizer(instance, 10, adaptive=True, network=True)
+        mb = SparkConfOptimizer(
+            instance, 10, adaptive=True, network=True, memory_mb=True
+        )
+        # sized from 13963m heap and 1397m overhead instead of 13g and 2g
+        key = 'spark.sql.adaptive.advisoryPartitionSizeInBytes'
+        assert gb.as_dict()[key] == '166m'
+        assert mb.as_dict()[key] == '174m'
+        assert gb.as_dict()['spark.reducer.maxSizeInFlight'] == '256m'
+        assert mb.as_dict()['spark.reducer.maxSizeInFlight'] == '232m'
+
+    def test_memory_mb_invalid(self) -> None:
+        with pytest.raises(ValueError, match='384m'):
+            SparkConfOptimizer(Instance(2, 1.25), 1, memory_mb=True)
+        with pytest.raises(ValueError, match='384m overhead, 0m off-heap'):
+            SparkConfOptimizer(
+                Instance(2, 1.25),
+                1,
+                profile=WorkloadProfile(heap_fraction=0.9),
+                memory_mb=True,
+            )
+
+    def test_freeze(self) -> None:
+        optimizer = SparkConfOptimizer(Instance(32, 248), 10)
+        optimizer.num_nodes = 20
+        assert optimizer.freeze() is optimizer
+        with pytest.raises(AttributeError, match='Can not set num_nodes'):
+            optimizer.num_nodes = 30
+        with pytest.raises(AttributeError, match='Can not delete profile'):
+            del optimizer.profile
+        loaded = pickle.loads(pickle.dumps(optimizer))
+        assert loaded.as_dict() == optimizer.as_dict()
+        with pytest.raises(AttributeError, match='frozen'):
+            loaded.num_nodes = 30
+        with pytest.raises(AttributeError, match='frozen'):
+            loaded.optimizer.num_nodes = 30
+
+    def test_freeze_optimizer(self) -> None:
+        sco = SparkConfOptimizer(
+            [(Instance(16, 128), 5), (Instance(32, 128), 10)]
+        ).freeze()
+        optimizer = sco.optimizer
+        assert isinstance(optimizer, FleetOptimizer)
+        conf = sco.as_dict()
+        with pytest.raises(AttributeError, match='Can not set num_nodes'):
+            optimizer.num_nodes = 1
+        with pytest.raises(AttributeError, match='Can not delete usage'):
+            del optimizer.usage
+        assert isinstance(optimizer.usage, tuple)
+        assert sco.as_dict() == conf
+
+    def test_as_dict_dynamic_allocation_node_range(self) -> None:
+        optimizer = SparkConfOptimizer(
+            Instance(32, 248),
+            deploy_mode='cluster',
+            dynamic_allocation=True,
+            min_nodes=1,
+            max_nodes=10,
+        )
+        expected = {
+            'spark.driver.cores': 5,
+            'spark.driver.memory': '36g',
+            'spark.driver.memoryOverhead': '5g',
+            'spark.executor.cores': 5,
+            'spark.executor.memory': '36g',
+            'spark.executor.memoryOverhead': '5g',
+            'spark.default.parallelism': 590,
+            'spark.sql.shuffle.partitions': 590,
+            'spark.dynamicAllocation.enabled': 'true',
+            'spark.dynamicAllocation.minExecutors': 5,
+            'spark.dynamicAllocation.initialExecutors': 35,
+            'spark.dynamicAllocation.maxExecutors': 59,
+            'spark.dynamicAllocation.executorAllocationRatio': '1.0',
+            'spark.dynamicAllocation.shuffleTracking.enabled': 'true',
+            'spark.dynamicAllocation.shuffleTracking.timeout': '600s',
+            'spark.dynamicAllocation.executorIdleTimeout': '60s',
+            'spark.dynamicAllocation.cachedExecutorIdleTimeout': '600s',
+        }
+        assert optimizer.as_dict() == expected
+        assert optimizer.num_nodes == 10
+
+    def test_as_dict_dynamic_allocation_min_nodes_only(self) -> None:
+        optimizer = SparkConfOptimizer(
+            Instance(32, 248), dynamic_allocation=True, min_nodes=0
+        )
+        conf = optimizer.as_dict()
+        assert conf['spark.dynamicAllocation.minExecutors'] == 0
+        assert conf['spark.dynamicAllocation.initialExecutors'] == 0
+        assert 'spark.dynamicAllocation.maxExecutors' not in conf
+        assert 'spark.default.parallelism' not in conf
+
+        # num_nodes is used as max_nodes
+        optimizer = SparkConfOptimizer(
+            Instance(32, 248), 10, dynamic_allocation=True, min_nodes=2
+        )
+        conf = optimizer.as_dict()
+        assert conf['spark.dynamicAllocation.minExecutors'] == 12
+        assert conf['spark.dynamicAllocation.initialExecutors'] == 36
+        assert conf['spark.dynamicAllocation.maxExecutors'] == 60
+
+    @pytest.mark.parametrize(
+        'kwargs',
+        [
+            {'dynamic_allocation': False, 'num_nodes': 10, 'min_nodes': 1},
+            {'dynamic_allocation': True, 'num_nodes': 10, 'max_nodes': 5},
+            {'dynamic_allocation': True, 'min_nodes': -1},
+            {'dynamic_allocation': True, 'min_nodes': 5, 'max_nodes': 2},
+            {'dynamic_allocation': True, 'max_nodes': 0},
+        ],
+    )
+    def test_invalid_node_range(self, kwargs: Dict[str, Any]) -> None:
+        with pytest.raises(ValueError):
+            SparkConfOptimizer(Instance(32, 248), **kwargs)
+
+    @pytest.mark.parametrize('profile', ['etl', 'ml-cache', 'interactive'])
+    def test_profile_keeps_total_memory(self, profile: str) -> None:
+        optimizer = SparkConfOptimizer(Instance(32, 248), 10, profile=profile)
+        resolved = optimizer.resolved
+        assert (
+            resolved.executor_memory
+            + resolved.executor_off_heap_memory
+            + resolved.executor_memory_overhead
+            == resolved.total_executor_memory
+            == 41
+        )
+
+    def test_as_dict_profile(self) -> None:
+        optimizer = SparkConfOptimizer(Instance(32, 248), 10, profile='etl')
+        conf = optimizer.as_dict()
+        assert conf['spark.executor.memory'] == '28g'
+        assert conf['spark.executor.memoryOverhead'] == '5g'
+        assert conf['spark.memory.fraction'] == '0.8'
+        assert conf['spark.memory.storageFraction'] == '0.2'
+        assert conf['spark.memory.offHeap.enabled'] == 'true'
+        assert conf['spark.memory.offHeap.size'] == '8g'
+
+        optimizer = SparkConfOptimizer(
+            Instance(32, 248),
+            10,
+            profile=WorkloadProfile(memory_fraction=0.7),
+        )
+        conf = optimizer.as_dict()
+        assert conf['spark.executor.memory'] == '36g'
+        assert conf['spark.executor.memoryOverhead'] == '5g'
+        assert conf['spark.memory.fraction'] == '0.7'
+        assert 'spark.memory.offHeap.enabled' not in conf
+
+    def test_as_dict_pyspark(self) -> None:
+        optimizer = SparkConfOptimizer(Instance(32, 248), 10, pyspark=True)
+        conf = optimizer.as_dict()
+        assert conf['spark.executor.memory'] == '26g'
+        assert conf['spark.executor.memoryOverhead'] == '5g'
+        assert conf['spark.executor.pyspark.memory'] == '10g'
+        assert conf['spark.sql.execution.arrow.maxRecordsPerBatch'] == 131000
+
+        optimizer = SparkConfOptimizer(
+            Instance(32, 248), 10, profile='etl', pyspark=True
+        )
+        resolved = optimizer.resolved
+        assert resolved.executor_memory == 18
+        assert (
+            resolved.executor_memory
+            + resolved.executor_off_heap_memory
+            + resolved.executor_pyspark_memory
+            + resolved.executor_memory_overhead
+            == resolved.total_executor_memory
+        )
+
+    def test_pyspark_insufficient_memory(self) -> None:
+        with pytest.raises(ValueError, match='python workers'):
+            SparkConfOptimizer(Instance(8, 3), 2, pyspark=True)
+
+    def test_as_dict_fleet(self) -> None:
+        optimizer = SparkConfOptimizer(
+            [(Instance(16, 128), 5), (Instance(32, 128), 10)]
+        )
+        assert optimizer.num_nodes == 15
+        conf = optimizer.as_dict()
+        assert conf['spark.executor.memory'] == '18g'
+        assert conf['spark.executor.instances'] == 75
+        assert conf['spark.sql.shuffle.partitions'] == 750
+
+    def test_fleet_with_num_nodes(self) -> None:
+        with pytest.raises(ValueError, match='fleet'):
+            SparkConfOptimizer([(Instance(16, 128), 10)], 10)
+
+    def test_as_dict_kubernetes(self) -> None:
+        optimizer = SparkConfOptimizer(Instance(16, 128), 10, 'kubernetes')
+        expected = {
+            'spark.driver.cores': 5,
+            'spark.driver.memory': '38g',
+            'spark.driver.memoryOverhead': '4g',
+            'spark.executor.cores': 5,
+            'spark.executor.memory': '38g',
+            'spark.executor.memoryOverhead': '4g',
+            'spark.executor.instances': 29,
+            'spark.kubernetes.driver.request.cores': '5166m',
+            'spark.kubernetes.driver.limit.cores': 6,
+            'spark.kubernetes.executor.request.cores': '5166m',
+            'spark.kubernetes.executor.limit.cores': 6,
+            'spark.kubernetes.memoryOverheadFactor': '0.1',
+            'spark.default.parallelism': 290,
+            'spark.sql.shuffle.partitions': 290,
+        }
+        assert optimizer.as_dict() == expected
+
+    @pytest.mark.parametrize(
+        'kwargs',
+        [
+            {'deploy_mode': 'kubernetes', 'driver_instance': Instance(4, 16)},
+            {'deploy_mode': 'client', 'kubernetes': KubernetesConf()},
+        ],
+    )
+    def test_invalid_kubernetes(self, kwargs: Dict[str, Any]) -> None:
+        with pytest.raises(ValueError):
+            SparkConfOptimizer(Instance(16, 128), 10, **kwargs)
+        with pytest.raises(ValueError, match='fleet'):
+            SparkConfOptimizer(
+                [(Instance(16, 128), 10)], deploy_mode='kubernetes'
+            )
+
+    def test_executor_cores_range(self) -> None:
+        optimizer = SparkConfOptimizer(
+            Instance(64, 512), 10, executor_cores_range=(3, 8)
+        )
+        conf = optimizer.as_dict()
+        assert conf['spark.executor.cores'] == 7
+        assert conf['spark.executor.memory'] == '50g'
+        assert conf['spark.executor.instances'] == 90
+        assert isinstance(optimizer.optimizer, ClientModeOptimizer)
+        assert optimizer.optimizer.shape.core_utilization == 1.0
+        assert optimizer.optimizer.default_shape.executor_cores == 5
+
+        optimizer = SparkConfOptimizer(
+            Instance(64, 512), 10, 'cluster', executor_cores_range=(3, 8)
+        )
+        assert optimizer.as_dict()['spark.executor.instances'] == 89
+
+        with pytest.raises(ValueError):
+            SparkConfOptimizer(
+                Instance(64, 512),
+                10,
+                'kubernetes',
+                executor_cores_range=(3, 8),
+            )
+
+    def test_as_dict_gpu(self) -> None:
+        optimizer = SparkConfOptimizer(
+            Instance(16, 56, 1, 16), 4, 'cluster', gpu=True
+        )
+        expected = {
+            'spark.driver.cores': 15,
+            'spark.driver.memory': '49g',
+            'spark.driver.memoryOverhead': '6g',
+            'spark.executor.cores': 15,
+            'spark.executor.memory': '49g',
+            'spark.executor.memoryOverhead': '6g',
+            'spark.executor.instances': 3,
+            'spark.executor.resource.gpu.amount': 1,
+            'spark.task.resource.gpu.amount': '0.0666',
+            'spark.task.cpus': 1,
+            'spark.rapids.sql.concurrentGpuTasks': 2,
+            'spark.default.parallelism': 90,
+            'spark.sql.shuffle.partitions': 90,
+        }
+        assert optimizer.as_dict() == expected
+        with pytest.raises(ValueError):
+            SparkConfOptimizer(
+                Instance(16, 56, 1, 16), 4, 'kubernetes', gpu=True
+            )
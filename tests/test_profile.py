@@ -0,0 +1,43 @@
+from typing import Dict
+
+import pytest
+
+from scopt.profile import PROFILES, WorkloadProfile, get_profile
+
+
+class TestWorkloadProfile:
+    def test_default(self) -> None:
+        profile = WorkloadProfile()
+        assert profile.heap_fraction == 0.9
+        assert profile.off_heap_fraction == 0.0
+        assert profile.memory_fraction == 0.6
+        assert profile.storage_fraction == 0.5
+
+    @pytest.mark.parametrize(
+        'kwargs',
+        [
+            {'heap_fraction': 0},
+            {'heap_fraction': 1},
+            {'off_heap_fraction': -0.1},
+            {'heap_fraction': 0.8, 'off_heap_fraction': 0.2},
+            {'memory_fraction': 1.5},
+            {'storage_fraction': 0},
+        ],
+    )
+    def test_invalid_fraction(self, kwargs: Dict[str, float]) -> None:
+        with pytest.raises(ValueError):
+            WorkloadProfile(**kwargs)
+
+
+class TestGetProfile:
+    def test_name(self) -> None:
+        assert get_profile('etl') is PROFILES['etl']
+        assert get_profile('ML-Cache') is PROFILES['ml-cache']
+
+    def test_profile(self) -> None:
+        profile = WorkloadProfile(heap_fraction=0.5)
+        assert get_profile(profile) is profile
+
+    def test_unknown_name(self) -> None:
+        with pytest.raises(ValueError, match='interactive'):
+            get_profile('streaming')
@@ -0,0 +1,106 @@
+from pathlib import Path
+from typing import Any, Optional
+
+import pytest
+
+import scopt.search
+from scopt.instances import Instance
+from scopt.search import (
+    Candidate,
+    ClusterTarget,
+    _evaluate,
+    load_prices,
+    search,
+)
+
+INSTANCES = {
+    'small': Instance(4, 32),
+    'large': Instance(32, 248),
+    'compute': Instance(36, 64),
+}
+
+
+class TestSearch:
+    def test_fewest_nodes(self) -> None:
+        target = ClusterTarget(min_total_cores=600, min_executor_memory=36)
+        candidates = search(target, {'large': INSTANCES['large']})
+        assert len(candidates) == 1
+        candidate = candidates[0]
+        assert candidate.num_nodes == 20
+        assert candidate.executor_instances == 120
+        assert candidate.default_parallelism == 1200
+        assert candidate.cost is None
+        optimizer = candidate.to_optimizer().optimizer
+        assert optimizer.executor_instances == candidate.executor_instances
+
+    def test_cluster_mode(self) -> None:
+        target = ClusterTarget(min_executor_instances=60)
+        candidates = search(
+            target, {'large': INSTANCES['large']}, deploy_mode='cluster'
+        )
+        assert candidates[0].num_nodes == 11
+        assert candidates[0].executor_instances == 65
+
+    def test_prune_insufficient_memory(self) -> None:
+        target = ClusterTarget(min_total_cores=100, min_executor_memory=20)
+        names = [c.instance_type for c in search(target, INSTANCES)]
+        assert 'compute' not in names
+        assert 'small' in names
+
+    def test_unreachable_target(self) -> None:
+        target = ClusterTarget(min_executor_instances=100)
+        assert search(target, INSTANCES, max_nodes=10) == []
+
+    def test_pareto_front(self) -> None:
+        target = ClusterTarget(min_total_cores=60)
+        instances = {**INSTANCES, 'expensive': Instance(32, 248)}
+        prices = {'small': 0.5, 'large': 2.0, 'compute': 10.0, 'expensive': 3}
+        candidates = search(target, instances, prices)
+        # expensive has same resources as large but costs more
+        assert [c.instance_type for c in candidates] == [
+            'large',
+            'small',
+            'compute',
+        ]
+        assert candidates[0].cost == 4.0
+        for c in candidates:
+            assert not any(o.dominates(c) for o in candidates)
+
+    def test_prune_running_front(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        evaluated = []
+
+        def evaluate(*args: Any) -> Optional[Candidate]:
+            evaluated.append(args[-1][0])
+            return _evaluate(*args)
+
+        monkeypatch.setattr(scopt.search, '_evaluate', evaluate)
+        target = ClusterTarget(min_total_cores=60)
+        instances = {'expensive': Instance(32, 248), **INSTANCES}
+        prices = {'small': 0.5, 'large': 2.0, 'compute': 10.0, 'expensive': 3}
+        names = [c.instance_type for c in search(target, instances, prices)]
+        assert 'expensive' not in names
+        # the cheaper large of the same Instance was on the front already
+        assert evaluated == ['small', 'large', 'compute']
+
+    def test_prices_limit_instance_types(self) -> None:
+        target = ClusterTarget(min_total_cores=60)
+        candidates = search(target, INSTANCES, {'small': 0.5})
+        assert [c.instance_type for c in candidates] == ['small']
+
+    def test_processes(self) -> None:
+        target = ClusterTarget(min_total_cores=600, min_executor_memory=8)
+        assert search(target, processes=2) == search(target)
+
+
+class TestLoadPrices:
+    def test_csv(self, tmp_path: Path) -> None:
+        path = tmp_path / 'prices.csv'
+        path.write_text('instance_type,price\nr5.4xlarge,1.008\n')
+        assert load_prices(path) == {'r5.4xlarge': 1.008}
+
+    def test_json(self, tmp_path: Path) -> None:
+        path = tmp_path / 'prices.json'
+        path.write_text('{"r5.4xlarge": 1.008}')
+        assert load_prices(str(path)) == {'r5.4xlarge': 1.008}
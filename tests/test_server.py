@@ -0,0 +1,183 @@
+import asyncio
+import json
+from http import HTTPStatus
+from typing import Any, Dict, Tuple
+
+import pytest
+
+from scopt.server import ConfServer, HttpError
+from scopt.spec import optimizer_from_spec as from_spec
+
+
+class TestConfServer:
+    def test_get_optimize(self) -> None:
+        server = ConfServer()
+        status, response, configs = server.dispatch(
+            'GET', '/optimize?cores=32&memory=248&num_nodes=10'
+        )
+        assert status == HTTPStatus.OK
+        assert isinstance(response, dict)
+        assert response['spark.executor.instances'] == 60
+        assert configs == 1
+
+    def test_post_optimize(self) -> None:
+        server = ConfServer()
+        body = {'instance_type': 'r5.4xlarge', 'num_nodes': 10}
+        _, response, _ = server.dispatch(
+            'POST', '/optimize', json.dumps(body).encode()
+        )
+        assert isinstance(response, dict)
+        assert response['spark.executor.instances'] == 30
+
+    def test_post_batch(self) -> None:
+        server = ConfServer()
+        body = [
+            {'cores': 32, 'memory': 248, 'num_nodes': 10},
+            {'cores': 32, 'memory': 248, 'num_nodes': 10},
+            {'instance_type': 'not_exist', 'num_nodes': 10},
+            'invalid',
+        ]
+        _, response, configs = server.dispatch(
+            'POST', '/optimize', json.dumps(body).encode()
+        )
+        assert isinstance(response, list)
+        assert response[0] == response[1]
+        assert response[2] == {'error': 'Unknown instance type: not_exist'}
+        assert response[3] == {'error': 'Spec must be JSON object'}
+        assert configs == 4
+        assert server.cache.cache_info().hits == 1
+
+    def test_post_batch_internal_error(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        def optimizer_from_spec(spec: Dict[str, Any], cache: Any) -> Any:
+            if spec['num_nodes'] == 0:
+                raise ZeroDivisionError('division by zero')
+            return from_spec(spec, cache)
+
+        monkeypatch.setattr(
+            'scopt.server.optimizer_from_spec', optimizer_from_spec
+        )
+        body = [
+            {'cores': 32, 'memory': 248, 'num_nodes': 0},
+            {'cores': 32, 'memory': 248, 'num_nodes': 10},
+        ]
+        status, response, configs = ConfServer().dispatch(
+            'POST', '/optimize', json.dumps(body).encode()
+        )
+        assert status == HTTPStatus.OK
+        assert isinstance(response, list)
+        assert response[0] == {'error': 'Internal server error'}
+        assert isinstance(response[1], dict)
+        assert response[1]['spark.executor.instances'] == 60
+        assert configs == 2
+
+    def test_stats(self) -> None:
+        server = ConfServer()
+        server.stats.record(0.002, 3, False)
+        _, response, _ = server.dispatch('GET', '/stats')
+        assert isinstance(response, dict)
+        assert response['requests'] == 1
+        assert response['configs'] == 3
+        assert response['max_latency_ms'] == pytest.approx(2)
+        assert response['cache'] == {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'maxsize': 1024,
+            'currsize': 0,
+        }
+
+    @pytest.mark.parametrize(
+        'method, target, body, status',
+        [
+            ('GET', '/optimize?num_nodes=10', b'', HTTPStatus.BAD_REQUEST),
+            (
+                'GET',
+                '/optimize?cores=4&memory=inf&num_nodes=2',
+                b'',
+                HTTPStatus.BAD_REQUEST,
+            ),
+            (
+                'GET',
+                '/optimize?cores=4&memory=1&num_nodes=2'
+                '&executor_cores_range=1-3',
+                b'',
+                HTTPStatus.BAD_REQUEST,
+            ),
+            (
+                'GET',
+                '/optimize?cores=4&memory=16&num_nodes=-3',
+                b'',
+                HTTPStatus.BAD_REQUEST,
+            ),
+            ('POST', '/optimize', b'{', HTTPStatus.BAD_REQUEST),
+            ('POST', '/optimize', b'1', HTTPStatus.BAD_REQUEST),
+            ('GET', '/not_exist', b'', HTTPStatus.NOT_FOUND),
+            ('DELETE', '/optimize', b'', HTTPStatus.METHOD_NOT_ALLOWED),
+        ],
+    )
+    def test_error(
+        self, method: str, target: str, body: bytes, status: HTTPStatus
+    ) -> None:
+        with pytest.raises(HttpError) as e:
+            ConfServer().dispatch(method, target, body)
+        assert e.value.status == status
+
+    def test_http(self) -> None:
+        async def run() -> Tuple[bytes, bytes]:
+            conf_server = ConfServer()
+            server = await conf_server.start('127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                reader, writer = await asyncio.open_connection(
+                    '127.0.0.1', port
+                )
+                body = b'{"cores": 32, "memory": 248, "num_nodes": 10}'
+                writer.write(
+                    b'POST /optimize HTTP/1.1\r\n'
+                    + f'Content-Length: {len(body)}\r\n\r\n'.encode()
+                    + body
+                    + b'GET /health HTTP/1.1\r\nConnection: close\r\n\r\n'
+                )
+                await writer.drain()
+                response = await reader.read()
+                writer.close()
+            return (
+                response,
+                json.dumps(conf_server.stats.as_dict()['requests']).encode(),
+            )
+
+        response, requests = asyncio.run(run())
+        assert response.startswith(b'HTTP/1.1 200 OK\r\n')
+        assert b'"spark.executor.instances": 60' in response
+        assert response.endswith(b'{"status": "ok"}')
+        assert requests == b'2'
+
+    def test_http_internal_error(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        def dispatch(*args: object) -> None:
+            raise OverflowError('overflow')
+
+        async def run() -> Tuple[bytes, int]:
+            conf_server = ConfServer()
+            monkeypatch.setattr(conf_server, 'dispatch', dispatch)
+            server = await conf_server.start('127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                reader, writer = await asyncio.open_connection(
+                    '127.0.0.1', port
+                )
+                writer.write(
+                    b'GET /optimize HTTP/1.1\r\nConnection: close\r\n\r\n'
+                )
+                await writer.drain()
+                response = await reader.read()
+                writer.close()
+            return response, conf_server.stats.errors
+
+        response, errors = asyncio.run(run())
+        assert response.startswith(b'HTTP/1.1 500 Internal Server Error\r\n')
+        assert response.endswith(b'{"error": "Internal server error"}')
+        assert errors == 1
@@ -0,0 +1,241 @@
+from typing import Dict
+
+import pytest
+
+from scopt.instances import Instance
+from scopt.optimizer import KubernetesConf, KubernetesOptimizer
+from scopt.profile import PROFILES
+from scopt.spec import optimizer_from_spec
+
+
+class TestOptimizerFromSpec:
+    def test_instance_type(self) -> None:
+        sco = optimizer_from_spec(
+            {'instance_type': 'r5.4xlarge', 'num_nodes': 10}
+        )
+        assert sco.executor_instance == Instance(16, 120)
+        assert sco.num_nodes == 10
+        assert sco.deploy_mode.value == 'client'
+
+    def test_cores_and_memory(self) -> None:
+        sco = optimizer_from_spec(
+            {
+                'cores': '32',
+                'memory': '248',
+                'num_nodes': '10',
+                'deploy_mode': 'cluster',
+            }
+        )
+        assert sco.executor_instance == Instance(32, 248)
+        assert sco.as_dict()['spark.executor.instances'] == 59
+
+    def test_driver_instance(self) -> None:
+        sco = optimizer_from_spec(
+            {
+                'cores': 32,
+                'memory': 248,
+                'num_nodes': 10,
+                'driver_instance_type': 'r5.xlarge',
+            }
+        )
+        assert sco.driver_instance == Instance(4, 24)
+        sco = optimizer_from_spec(
+            {
+                'cores': 32,
+                'memory': 248,
+                'num_nodes': 10,
+                'driver_cores': 4,
+                'driver_memory': 16,
+            }
+        )
+        assert sco.driver_instance == Instance(4, 16)
+
+    def test_dynamic_allocation(self) -> None:
+        sco = optimizer_from_spec(
+            {'instance_type': 'r5.4xlarge', 'dynamic_allocation': 'true'}
+        )
+        assert sco.dynamic_allocation
+        assert not sco.specified_num_nodes
+        sco = optimizer_from_spec(
+            {
+                'instance_type': 'r5.4xlarge',
+                'num_nodes': 2,
+                'dynamic_allocation': '',
+            }
+        )
+        assert not sco.dynamic_allocation
+
+    def test_data_size(self) -> None:
+        sco = optimizer_from_spec(
+            {
+                'instance_type': 'r5.4xlarge',
+                'num_nodes': 10,
+                'input_size': '',
+                'shuffle_size': '100',
+                'partition_size': 0.25,
+            }
+        )
+        assert sco.input_size is None
+        assert sco.shuffle_size == 100
+        assert sco.partition_size == 0.25
+
+    @pytest.mark.parametrize(
+        'fleet',
+        [
+            'r5.4xlarge:10, r5d.8xlarge:4',
+            {'r5.4xlarge': 10, 'r5d.8xlarge': '4'},
+            [['r5.4xlarge', 10], ['r5d.8xlarge', 4]],
+        ],
+    )
+    def test_fleet(self, fleet: object) -> None:
+        sco = optimizer_from_spec({'fleet': fleet})
+        assert sco.executor_instance == (
+            (Instance(16, 120), 10),
+            (Instance(32, 248, 0, 0, 10), 4),
+        )
+        assert sco.num_nodes == 14
+
+    def test_node_range(self) -> None:
+        sco = optimizer_from_spec(
+            {
+                'instance_type': 'r5.4xlarge',
+                'dynamic_allocation': 'true',
+                'min_nodes': '2',
+                'max_nodes': 10,
+            }
+        )
+        assert (sco.min_nodes, sco.max_nodes, sco.num_nodes) == (2, 10, 10)
+
+    @pytest.mark.parametrize('cores_range', ['3-8', [3, '8']])
+    def test_executor_cores_range(self, cores_range: object) -> None:
+        sco = optimizer_from_spec(
+            {
+                'instance_type': 'r5.4xlarge',
+                'num_nodes': 10,
+                'executor_cores_range': cores_range,
+            }
+        )
+        assert sco.optimizer.executor_cores == 5
+        assert getattr(sco.optimizer, 'executor_cores_range') == (3, 8)
+
+    def test_kubernetes(self) -> None:
+        sco = optimizer_from_spec(
+            {
+                'instance_type': 'r5.4xlarge',
+                'num_nodes': 10,
+                'deploy_mode': 'kubernetes',
+                'reserved_cores': '1',
+                'reserved_memory': 4,
+            }
+        )
+        assert isinstance(sco.optimizer, KubernetesOptimizer)
+        assert sco.optimizer.conf == KubernetesConf(1, 4)
+
+    def test_profile(self) -> None:
+        spec = {'instance_type': 'r5.4xlarge', 'num_nodes': 10}
+        assert optimizer_from_spec({**spec, 'profile': ''}).profile is None
+        sco = optimizer_from_spec({**spec, 'profile': 'etl'})
+        assert sco.profile == PROFILES['etl']
+
+    def test_adaptive(self) -> None:
+        spec = {'instance_type': 'r5.4xlarge', 'num_nodes': 10}
+        assert not optimizer_from_spec(spec).adaptive
+        assert optimizer_from_spec({**spec, 'adaptive': 'true'}).adaptive
+
+    def test_network(self) -> None:
+        sco = optimizer_from_spec(
+            {
+                'cores': 16,
+                'memory': 120,
+                'network_bandwidth': '25',
+                'num_nodes': 10,
+                'network': 'true',
+            }
+        )
+        assert sco.executor_instance == Instance(16, 120, 0, 0, 25)
+        assert sco.as_dict()['spark.reducer.maxSizeInFlight'] == '104m'
+
+    def test_memory_mb(self) -> None:
+        spec = {'instance_type': 'r5.4xlarge', 'num_nodes': 10}
+        assert optimizer_from_spec(spec).memory_mb is None
+        sco = optimizer_from_spec({**spec, 'memory_mb': 'true'})
+        assert sco.as_dict()['spark.executor.memory'] == '36916m'
+
+    def test_gpu(self) -> None:
+        sco = optimizer_from_spec(
+            {'instance_type': 'p3.8xlarge', 'num_nodes': 4, 'gpu': 'true'}
+        )
+        assert sco.as_dict()['spark.executor.resource.gpu.amount'] == 1
+
+    def test_pyspark(self) -> None:
+        spec = {'instance_type': 'r5.4xlarge', 'num_nodes': 10}
+        assert not optimizer_from_spec(spec).pyspark
+        assert optimizer_from_spec({**spec, 'pyspark': 'yes'}).pyspark
+
+    def test_factory(self) -> None:
+        calls = []
+
+        def factory(*args: object) -> object:
+            calls.append(args)
+            return 'optimizer'
+
+        optimizer_from_spec(
+            {'instance_type': 'r5.4xlarge', 'num_nodes': 10},
+            factory,  # type: ignore[arg-type]
+        )
+        assert calls == [(Instance(16, 120), 10, 'client', None, False)]
+
+    @pytest.mark.parametrize(
+        'spec',
+        [
+            {'num_nodes': 10},
+            {'instance_type': 'not_exist', 'num_nodes': 10},
+            {'cores': 32, 'num_nodes': 10},
+            {'cores': 'many', 'memory': 248, 'num_nodes': 10},
+            {'cores': 32, 'memory': 'much', 'num_nodes': 10},
+            {'instance_type': 'r5.4xlarge', 'num_nodes': 1.5},
+            {'instance_type': 'r5.4xlarge', 'num_nodes': -3},
+            {'instance_type': 'r5.4xlarge', 'num_nodes': '0'},
+            {
+                'instance_type': 'r5.4xlarge',
+                'num_nodes': 10,
+                'deploy_mode': 'local',
+            },
+            {'instance_type': 'r5.4xlarge', 'dynamic_allocation': 'maybe'},
+            {'instance_type': 'r5.4xlarge', 'num_nodes': 10, 'profile': 'x'},
+            {'fleet': 'r5.4xlarge'},
+            {
+                'instance_type': 'r5.4xlarge',
+                'num_nodes': 10,
+                'executor_cores_range': '3',
+            },
+            {
+                'instance_type': 'r5.4xlarge',
+                'num_nodes': 10,
+                'reserved_cores': 1,
+            },
+            {'fleet': {'not_exist': 1}},
+            {'fleet': [['r5.4xlarge', 'many']]},
+            {'fleet': 'r5.4xlarge:10', 'num_nodes': 10},
+            {
+                'instance_type': 'r5.4xlarge',
+                'num_nodes': 10,
+                'shuffle_size': 'large',
+            },
+            {'instance_type': 'r5.4xlarge'},
+            {'cores': 4, 'memory': 'inf', 'num_nodes': 2},
+            {
+                'instance_type': 'r5.4xlarge',
+                'num_nodes': 10,
+                'partition_size': 'nan',
+            },
+            {
+                'instance_type': 'r5.4xlarge',
+                'num_nodes': 10,
+                'shuffle_size': float('inf'),
+            },
+        ],
+    )
+    def test_invalid_spec(self, spec: Dict[str, object]) -> None:
+        with pytest.raises(ValueError):
+            optimizer_from_spec(spec)
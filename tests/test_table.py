@@ -0,0 +1,118 @@
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+import pytest
+
+from scopt import table
+from scopt.instances import Instance
+from scopt.optimizer import SparkConfOptimizer
+from scopt.table import RecommendationTable, build_table, recommend
+
+INSTANCES = {
+    'r5.4xlarge': Instance(16, 120),
+    'm5.xlarge': Instance(4, 12),
+    'c5.24xlarge': Instance(96, 184),
+    'tiny': Instance(1, 2),
+}
+
+
+@pytest.fixture
+def path(tmp_path: Path) -> Path:
+    path = tmp_path / 'recommendations.bin'
+    build_table(path, INSTANCES, max_nodes=20)
+    return path
+
+
+class TestRecommendationTable:
+    @pytest.mark.parametrize('deploy_mode', ['client', 'cluster', 'CLUSTER'])
+    @pytest.mark.parametrize('dynamic_allocation', [False, True])
+    def test_same_as_optimizer(
+        self, path: Path, deploy_mode: str, dynamic_allocation: bool
+    ) -> None:
+        with RecommendationTable(path, INSTANCES) as t:
+            for name, instance in INSTANCES.items():
+                for num_nodes in range(1, 21):
+                    try:
+                        expected: Optional[Dict[str, Union[int, str]]] = (
+                            SparkConfOptimizer(
+                                instance,
+                                num_nodes,
+                                deploy_mode,
+                                dynamic_allocation=dynamic_allocation,
+                            ).as_dict()
+                        )
+                    except ValueError:
+                        expected = None
+                    actual = t.get(
+                        name, num_nodes, deploy_mode, dynamic_allocation
+                    )
+                    assert actual == expected
+
+    def test_dynamic_allocation_without_num_nodes(self, path: Path) -> None:
+        with RecommendationTable(path, INSTANCES) as t:
+            assert (
+                t.get('r5.4xlarge', dynamic_allocation=True)
+                == SparkConfOptimizer(
+                    INSTANCES['r5.4xlarge'], dynamic_allocation=True
+                ).as_dict()
+            )
+
+    @pytest.mark.parametrize(
+        'args',
+        [
+            ('r5.8xlarge', 10),
+            ('r5.4xlarge', 0),
+            ('r5.4xlarge', 21),
+            ('r5.4xlarge', None),
+            ('r5.4xlarge', 10, 'kubernetes'),
+            # cluster mode can not reserve an executor
+            ('tiny', 1, 'cluster'),
+        ],
+    )
+    def test_not_covered(self, path: Path, args: Tuple[Any, ...]) -> None:
+        with RecommendationTable(path, INSTANCES) as t:
+            assert t.get(*args) is None
+
+    def test_stale(self, path: Path) -> None:
+        with pytest.raises(ValueError, match='another catalog'):
+            RecommendationTable(path, {**INSTANCES, 'new': Instance(8, 64)})
+
+    def test_invalid_file(self, path: Path, tmp_path: Path) -> None:
+        truncated = tmp_path / 'truncated.bin'
+        truncated.write_bytes(path.read_bytes()[:-1])
+        with pytest.raises(ValueError, match='truncated'):
+            RecommendationTable(truncated, INSTANCES)
+        other = tmp_path / 'other.bin'
+        other.write_bytes(b'0' * 100)
+        with pytest.raises(ValueError):
+            RecommendationTable(other, INSTANCES)
+
+
+class TestRecommend:
+    def test_fallback(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(table, 'DEFAULT_PATH', Path('not_exist'))
+        table._default_table.cache_clear()
+        try:
+            assert recommend('r5.4xlarge', 10, 'cluster') == (
+                SparkConfOptimizer(Instance(16, 120), 10, 'cluster').as_dict()
+            )
+            with pytest.raises(KeyError):
+                recommend('not_exist', 10)
+        finally:
+            table._default_table.cache_clear()
+
+    def test_table(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        path = tmp_path / 'recommendations.bin'
+        build_table(path, max_nodes=2)
+        monkeypatch.setattr(table, 'DEFAULT_PATH', path)
+        table._default_table.cache_clear()
+        try:
+            assert table._default_table() is not None
+            expected = SparkConfOptimizer(Instance(16, 120), 2).as_dict()
+            assert recommend('r5.4xlarge', 2) == expected
+            # not covered by table
+            assert recommend('r5.4xlarge', 3)['spark.executor.instances'] == 9
+        finally:
+            table._default_table.cache_clear()
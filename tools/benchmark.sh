@@ -0,0 +1,35 @@
+#!/usr/bin/env bash
+
+# Usage:
+#   bash tools/benchmark.sh save   # store baseline results
+#   bash tools/benchmark.sh check  # fail if slower than baseline
+#
+# THRESHOLD is allowed slowdown of mean time from baseline (default 10%).
+
+set -e
+REPO_ROOT="$(cd "$(dirname "$0")/.."; pwd)"
+BASELINE="${REPO_ROOT}/.benchmarks/baseline.json"
+THRESHOLD="${THRESHOLD:-10%}"
+
+cd "${REPO_ROOT}"
+
+case "$1" in
+    save)
+        mkdir -p "$(dirname "${BASELINE}")"
+        pytest benchmarks --benchmark-only --benchmark-json="${BASELINE}"
+        ;;
+    check)
+        if [ ! -e "${BASELINE}" ]; then
+            echo "Baseline does not exist: ${BASELINE}"
+            echo "Run 'bash tools/benchmark.sh save' first"
+            exit 1
+        fi
+        pytest benchmarks --benchmark-only \
+            --benchmark-compare="${BASELINE}" \
+            --benchmark-compare-fail="mean:${THRESHOLD}"
+        ;;
+    *)
+        echo "Usage: $0 save|check"
+        exit 1
+        ;;
+esac
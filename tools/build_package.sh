@@ -18,4 +18,5 @@ elif [ -e ${DIST_DIR} ]; then
 fi
 
 # build package
+PYTHONPATH=src python -m scopt.table
 python setup.py sdist bdist_wheel